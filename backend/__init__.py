@@ -3,4 +3,10 @@ Entrust RE Kanban Backend
 A FastAPI-based backend for multiuser Kanban board management
 """
 
-__version__ = "1.0.0"
\ No newline at end of file
+__version__ = "1.0.0"
+
+from .startup_profile import profiling_requested, startup_profiler
+
+# Time every import from here on when STARTUP_PROFILE is set
+if profiling_requested():
+    startup_profiler.install()
@@ -0,0 +1,229 @@
+"""
+Background writer for task audit history
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .audit_log import SegmentLog
+from .config import settings
+from .database import engine
+from .models import AuditLogEntry, TaskHistory
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _history_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop keys that only the archive stores"""
+    return {key: value for key, value in row.items() if key != "custom_id"}
+
+
+class AuditWriter:
+    """
+    Buffers TaskHistory rows and writes them with multi-row inserts
+
+    Rows are flushed when `batch_size` rows are waiting or `flush_interval`
+    seconds after the first row of a batch arrived, whichever comes first.
+    When the bounded queue is full the caller writes its row synchronously
+    instead, so audit entries are never dropped for lack of buffer space.
+
+    In durable mode every row is written and committed on the caller's
+    session before `record` returns, which keeps tests deterministic.
+
+    Besides task_history, rows are archived to an append-only segment log
+    and optionally mirrored to the audit_log table. The archive is what
+    remains once task_history months pass the retention window.
+    """
+
+    def __init__(
+        self,
+        durable: bool = False,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        segment_log: Optional[SegmentLog] = None,
+        mirror_table: bool = False
+    ):
+        self.durable = durable
+        self.segment_log = segment_log
+        self.mirror_table = mirror_table
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Metrics
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.overflow_writes = 0
+
+    def record(self, db: Session, row: Dict[str, Any]) -> None:
+        """
+        Record one history row
+
+        Args:
+            db: Caller's database session (used only in durable mode)
+            row: TaskHistory column values, plus the task's custom_id
+        """
+        self.record_many(db, [row])
+
+    def record_many(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Record several history rows; in durable mode they are written with
+        one insert and one commit rather than one of each per row
+
+        Args:
+            db: Caller's database session (used only in durable mode)
+            rows: TaskHistory column values, plus each task's custom_id
+        """
+        if not rows:
+            return
+
+        if self.durable:
+            self._archive(rows)
+            db.execute(insert(TaskHistory), [_history_columns(row) for row in rows])
+            db.commit()
+            self.written += len(rows)
+            return
+
+        self._ensure_started()
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self.overflow_writes += 1
+                self._write([row])
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+
+            batch: List[Dict[str, Any]] = [first]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        self._archive(batch)
+        self._insert_history(batch)
+
+    def _archive(self, batch: List[Dict[str, Any]]) -> None:
+        if self.segment_log is not None:
+            try:
+                self.segment_log.append(batch)
+            except OSError as e:
+                logger.error(f"Failed to append {len(batch)} entries to the audit segment log: {e}")
+
+        if self.mirror_table:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(AuditLogEntry), batch)
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to mirror {len(batch)} entries to audit_log: {e}")
+
+    def _insert_history(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with engine.begin() as connection:
+                connection.execute(insert(TaskHistory), [_history_columns(row) for row in batch])
+            self.written += len(batch)
+            self.batches += 1
+            return
+        except SQLAlchemyError as e:
+            if len(batch) == 1:
+                # The archive still keeps the entry
+                self.failed += 1
+                logger.warning(f"Failed to write history entry for task {batch[0].get('task_id')}: {e}")
+                return
+            logger.warning(f"History batch of {len(batch)} failed, retrying rows individually: {e}")
+
+        # Isolate the bad row(s) so one failure does not lose the whole batch
+        for row in batch:
+            self._insert_history([row])
+
+    def flush(self) -> None:
+        """Block until every queued row has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Flush outstanding rows and stop the writer thread"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+            self._thread = None
+        if self.segment_log is not None:
+            self.segment_log.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of writer metrics"""
+        return {
+            "durable": self.durable,
+            "queue_depth": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "overflow_writes": self.overflow_writes,
+        }
+
+
+# Global append-only audit archive (None when disabled)
+segment_log = SegmentLog(
+    settings.audit_log_dir,
+    segment_bytes=settings.audit_log_segment_bytes,
+    block_records=settings.audit_log_block_records,
+) if settings.audit_log_dir else None
+
+# Global audit writer instance
+audit_writer = AuditWriter(
+    durable=settings.audit_durable,
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    segment_log=segment_log,
+    mirror_table=settings.audit_mirror_table,
+)
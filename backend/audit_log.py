@@ -0,0 +1,222 @@
+"""
+Append-only audit segment log that survives task deletion
+
+Layout of the log directory:
+
+    audit-000001.log.gz   sealed segment: concatenated gzip members, one per block
+    audit-000001.idx      sparse index for the sealed segment (JSON)
+    audit-000002.log      active segment: plain JSON lines, appended to
+
+Every audit record is appended to the active segment. Once it grows past
+`segment_bytes` it is sealed: records are compressed in blocks of
+`block_records`, and the index stores each block's byte range, time range
+and task ids. Lookups by time or task only decompress the blocks whose
+index entry matches.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_PREFIX = "audit-"
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SegmentLog:
+    """Rotating, compressed, append-only log of audit records"""
+
+    def __init__(self, directory: str, segment_bytes: int = 8 * 1024 * 1024, block_records: int = 256):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.block_records = max(block_records, 1)
+        self._lock = threading.Lock()
+        self._indexes: Dict[int, List[Dict[str, Any]]] = {}  # sealed segment -> blocks
+        self._active_seq: Optional[int] = None
+        self._active_file = None
+
+    # ----- Writing -----
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        sealed, active = [], []
+        for path in self.directory.glob(f"{_SEGMENT_PREFIX}*"):
+            seq = int(path.name[len(_SEGMENT_PREFIX):].split(".")[0])
+            if path.name.endswith(".idx"):
+                sealed.append(seq)
+                self._indexes[seq] = json.loads(path.read_text())["blocks"]
+            elif path.name.endswith(".log"):
+                active.append(seq)
+
+        # A crash between sealing and removing the plain file leaves both
+        for seq in active:
+            if seq in self._indexes:
+                (self.directory / f"{_SEGMENT_PREFIX}{seq:06d}.log").unlink()
+        active = [seq for seq in active if seq not in self._indexes]
+
+        self._active_seq = max(active) if active else max(sealed, default=0) + 1
+        self._active_file = open(self._active_path(), "a", encoding="utf-8")
+
+    def _active_path(self) -> Path:
+        return self.directory / f"{_SEGMENT_PREFIX}{self._active_seq:06d}.log"
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append records to the active segment, rotating it when full"""
+        lines = "".join(json.dumps(jsonable_encoder(record), separators=(",", ":")) + "\n" for record in records)
+        if not lines:
+            return
+
+        with self._lock:
+            if self._active_file is None:
+                self._open()
+            self._active_file.write(lines)
+            self._active_file.flush()
+
+            if self._active_file.tell() >= self.segment_bytes:
+                self._seal()
+
+    def _seal(self) -> None:
+        self._active_file.close()
+        plain_path = self._active_path()
+        seq = self._active_seq
+
+        with open(plain_path, encoding="utf-8") as source:
+            records = [line for line in source if line.strip()]
+
+        blocks = []
+        data_path = self.directory / f"{_SEGMENT_PREFIX}{seq:06d}.log.gz"
+        with open(data_path, "wb") as target:
+            for start in range(0, len(records), self.block_records):
+                chunk = records[start:start + self.block_records]
+                parsed = [json.loads(line) for line in chunk]
+                offset = target.tell()
+                target.write(gzip.compress("".join(chunk).encode("utf-8")))
+                timestamps = [_epoch(record["timestamp"]) for record in parsed]
+                blocks.append({
+                    "offset": offset,
+                    "length": target.tell() - offset,
+                    "min_ts": min(timestamps),
+                    "max_ts": max(timestamps),
+                    "task_ids": sorted({record["task_id"] for record in parsed}),
+                    "custom_ids": sorted({record["custom_id"] for record in parsed if record.get("custom_id")}),
+                })
+            target.flush()
+            os.fsync(target.fileno())
+
+        index_path = self.directory / f"{_SEGMENT_PREFIX}{seq:06d}.idx"
+        index_path.write_text(json.dumps({"blocks": blocks}))
+        plain_path.unlink()
+
+        self._indexes[seq] = blocks
+        self._active_seq = seq + 1
+        self._active_file = open(self._active_path(), "a", encoding="utf-8")
+        logger.info(f"Sealed audit segment {seq} with {len(records)} records in {len(blocks)} blocks")
+
+    def close(self) -> None:
+        """Close the active segment file"""
+        with self._lock:
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
+
+    # ----- Reading -----
+
+    def query(
+        self,
+        task_id: Optional[int] = None,
+        custom_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        newest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield records matching all given filters, oldest first unless
+        `newest_first` is set
+
+        Sealed segments are narrowed through their sparse index; only the
+        active segment is scanned in full. With `newest_first` segments,
+        blocks and records are walked backwards, so a caller that stops
+        after N records only decompresses the blocks holding them.
+        """
+        since_ts = _epoch(since) if since else None
+        until_ts = _epoch(until) if until else None
+
+        def matches(record: Dict[str, Any]) -> bool:
+            if task_id is not None and record.get("task_id") != task_id:
+                return False
+            if custom_id is not None and record.get("custom_id") != custom_id:
+                return False
+            ts = _epoch(record["timestamp"])
+            if since_ts is not None and ts < since_ts:
+                return False
+            if until_ts is not None and ts >= until_ts:
+                return False
+            return True
+
+        def block_matches(block: Dict[str, Any]) -> bool:
+            if since_ts is not None and block["max_ts"] < since_ts:
+                return False
+            if until_ts is not None and block["min_ts"] >= until_ts:
+                return False
+            if task_id is not None and task_id not in block["task_ids"]:
+                return False
+            if custom_id is not None and custom_id not in block["custom_ids"]:
+                return False
+            return True
+
+        def ordered(items: List[Any]) -> Iterable[Any]:
+            return reversed(items) if newest_first else items
+
+        def sealed_records(seq: int, blocks: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            data_path = self.directory / f"{_SEGMENT_PREFIX}{seq:06d}.log.gz"
+            with open(data_path, "rb") as source:
+                for block in ordered(blocks):
+                    if not block_matches(block):
+                        continue
+                    source.seek(block["offset"])
+                    data = gzip.decompress(source.read(block["length"])).decode("utf-8")
+                    for line in ordered(data.splitlines()):
+                        record = json.loads(line)
+                        if matches(record):
+                            yield record
+
+        def active_records() -> Iterator[Dict[str, Any]]:
+            if not active_path.exists():
+                return
+            with open(active_path, encoding="utf-8") as source:
+                # Bounded by segment_bytes; a partially written last record is skipped
+                lines = [line for line in source if line.endswith("\n")]
+            for line in ordered(lines):
+                record = json.loads(line)
+                if matches(record):
+                    yield record
+
+        with self._lock:
+            if self._active_file is None:
+                self._open()
+            self._active_file.flush()
+            sealed = sorted(self._indexes.items())
+            active_path = self._active_path()
+
+        if newest_first:
+            yield from active_records()
+        for seq, blocks in ordered(sealed):
+            yield from sealed_records(seq, blocks)
+        if not newest_first:
+            yield from active_records()
@@ -4,9 +4,8 @@ Authentication and authorization utilities
 
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from anyio import from_thread
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -14,23 +13,47 @@ from .config import settings
 from .database import get_db
 from .models import User, UserSession
 from .schemas import TokenData
+from .password_hasher import get_pwd_context, password_hasher, PasswordHasherBusy
+from .session_store import revoked_tokens, new_token_id, stage_revocation
+from .token_cache import token_cache
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token scheme
 security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def _password_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def hash_password(password: str) -> str:
+    """
+    Generate password hash on the dedicated hashing pool
+    
+    Call from a sync endpoint: the request's threadpool thread waits for
+    the pool while the event loop stays free.
+    
+    Raises:
+        HTTPException: 429 if the hashing pool is saturated
+    """
+    try:
+        return from_thread.run(password_hasher.hash, password)
+    except PasswordHasherBusy:
+        raise _password_busy_exception()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -44,6 +67,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         JWT token string
     """
+    # python-jose loads its crypto backend on import; defer it to first use
+    from jose import jwt
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -52,6 +78,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", new_token_id())
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     
     return encoded_jwt
@@ -65,27 +92,47 @@ def verify_token(token: str) -> Optional[TokenData]:
         token: JWT token string
     
     Returns:
-        TokenData if valid, None if invalid
+        TokenData if valid, None if invalid or revoked
     """
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    # Tokens verified earlier skip the signature check until they expire
+    token_data = token_cache.get(token)
+    
+    if token_data is None:
+        from jose import JWTError, jwt
+        
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except JWTError:
+            return None
+        
         username: str = payload.get("sub")
         user_id: int = payload.get("user_id")
+        token_id: Optional[str] = payload.get("jti")
+        expires_at = payload.get("exp")
         
         if username is None or user_id is None:
             return None
-            
-        token_data = TokenData(username=username, user_id=user_id)
-        return token_data
         
-    except JWTError:
+        token_data = TokenData(username=username, user_id=user_id, token_id=token_id)
+        if expires_at is not None:
+            token_cache.put(token, token_data, float(expires_at), token_id)
+    
+    # Logged-out and superseded sessions are rejected without a DB lookup
+    if token_data.token_id is not None and token_data.token_id in revoked_tokens:
         return None
+    
+    return token_data
 
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     """
     Authenticate user with username and password
     
+    Call from a sync endpoint, so the user lookup and any rehash commit run
+    on the request's threadpool thread; verification runs on the dedicated
+    hashing pool. Hashes created with outdated cost parameters are
+    transparently replaced on success.
+    
     Args:
         db: Database session
         username: Username or email
@@ -93,6 +140,9 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     
     Returns:
         User object if authenticated, None if not
+    
+    Raises:
+        HTTPException: 429 if the hashing pool is saturated
     """
     # Try to find user by username or email
     user = db.query(User).filter(
@@ -102,14 +152,47 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     if not user:
         return None
         
-    if not verify_password(password, user.hashed_password):
+    try:
+        valid, new_hash = from_thread.run(password_hasher.verify_and_update, password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _password_busy_exception()
+    
+    if not valid:
         return None
+    
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
         
     # Allow both active and inactive users to authenticate
     # Inactive users can login but can't perform actions
     return user
 
 
+async def get_token_data(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenData:
+    """
+    Dependency that authenticates the bearer token without loading the user
+
+    For high-frequency read endpoints that must not touch the database;
+    use get_current_user when the user record is needed.
+
+    Raises:
+        HTTPException: If the token is invalid or revoked
+    """
+    token_data = verify_token(credentials.credentials)
+
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return token_data
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -133,13 +216,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = credentials.credentials
-    token_data = verify_token(token)
-    
-    if token_data is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = user_for_token(credentials.credentials, db)
     
     if user is None:
         raise credentials_exception
@@ -149,6 +226,25 @@ async def get_current_user(
     return user
 
 
+def user_for_token(token: str, db: Session) -> Optional[User]:
+    """
+    Load the user a bearer token was issued to
+    
+    Args:
+        token: JWT access token
+        db: Database session to load the user with
+    
+    Returns:
+        The user, or None if the token is invalid or revoked or the user is gone
+    """
+    token_data = verify_token(token)
+    
+    if token_data is None:
+        return None
+    
+    return db.query(User).filter(User.id == token_data.user_id).first()
+
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency to get current active user
@@ -196,7 +292,7 @@ async def get_admin_user(current_user: User = Depends(get_current_active_user))
 def create_user_session(
     db: Session,
     user_id: int,
-    session_token: str,
+    token_id: str,
     expires_at: datetime,
     user_agent: Optional[str] = None,
     ip_address: Optional[str] = None
@@ -207,7 +303,7 @@ def create_user_session(
     Args:
         db: Database session
         user_id: User ID
-        session_token: Session token
+        token_id: JWT id (jti claim) of the session's access token
         expires_at: Session expiration time
         user_agent: User agent string
         ip_address: Client IP address
@@ -217,10 +313,11 @@ def create_user_session(
     """
     session = UserSession(
         user_id=user_id,
-        session_token=session_token,
+        token_id=token_id,
         expires_at=expires_at,
         user_agent=user_agent,
-        ip_address=ip_address
+        ip_address=ip_address,
+        is_active=True
     )
     
     db.add(session)
@@ -230,6 +327,38 @@ def create_user_session(
     return session
 
 
+def revoke_sessions(db: Session, *criteria) -> int:
+    """
+    Deactivate active sessions matching `criteria` and revoke their tokens
+    
+    Does not commit; the caller owns the transaction. Token ids reach the
+    in-memory revocation set when the transaction commits.
+    
+    Args:
+        db: Database session
+        criteria: SQLAlchemy filter expressions on UserSession
+    
+    Returns:
+        Number of sessions deactivated
+    """
+    sessions = db.query(UserSession.id, UserSession.token_id, UserSession.expires_at).filter(
+        UserSession.is_active == True,
+        *criteria
+    ).all()
+    
+    if not sessions:
+        return 0
+    
+    db.query(UserSession).filter(
+        UserSession.id.in_([session.id for session in sessions])
+    ).update({"is_active": False}, synchronize_session=False)
+    
+    for session in sessions:
+        stage_revocation(db, session.token_id, session.expires_at)
+    
+    return len(sessions)
+
+
 def invalidate_user_sessions(db: Session, user_id: int) -> None:
     """
     Invalidate all active sessions for a user
@@ -238,29 +367,89 @@ def invalidate_user_sessions(db: Session, user_id: int) -> None:
         db: Database session
         user_id: User ID
     """
-    db.query(UserSession).filter(
-        UserSession.user_id == user_id,
-        UserSession.is_active == True
-    ).update({"is_active": False})
-    
+    revoke_sessions(db, UserSession.user_id == user_id)
     db.commit()
 
 
-def cleanup_expired_sessions(db: Session) -> int:
+def issue_session_token(db: Session, user: User, request: Optional[Request] = None) -> str:
     """
-    Clean up expired sessions from the database
+    Create an access token for `user` and record it as the user's only active session
     
     Args:
         db: Database session
+        user: Authenticated user
+        request: Incoming request, used for client info
     
     Returns:
-        Number of sessions cleaned up
+        JWT access token string
     """
-    expired_sessions = db.query(UserSession).filter(
-        UserSession.expires_at < datetime.utcnow(),
-        UserSession.is_active == True
-    ).update({"is_active": False})
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    token_id = new_token_id()
+    access_token = create_access_token(
+        data={"sub": user.username, "user_id": user.id, "jti": token_id},
+        expires_delta=access_token_expires
+    )
     
-    db.commit()
+    # Get client info from request
+    user_agent = request.headers.get("User-Agent") if request else None
+    client_host = request.client.host if request and request.client else None
+    
+    # Deactivate any existing sessions for this user
+    revoke_sessions(db, UserSession.user_id == user.id)
+    
+    create_user_session(
+        db,
+        user_id=user.id,
+        token_id=token_id,
+        expires_at=datetime.utcnow() + access_token_expires,
+        user_agent=user_agent[:500] if user_agent else None,
+        ip_address=client_host
+    )
+    
+    return access_token
+
+
+def cleanup_expired_sessions(db: Session, batch_size: int = 500, max_batches: int = 100) -> int:
+    """
+    Delete expired sessions from the database in small batches
+    
+    Each batch is its own short transaction so the table is never locked
+    for long. Lookups use the (is_active, expires_at) index.
+    
+    Args:
+        db: Database session
+        batch_size: Rows deleted per transaction
+        max_batches: Upper bound on batches per call
+    
+    Returns:
+        Number of sessions deleted
+    """
+    cutoff = datetime.utcnow()
+    deleted = 0
+    batches = 0
+    
+    for is_active in (True, False):
+        while batches < max_batches:
+            ids = [row.id for row in db.query(UserSession.id).filter(
+                UserSession.is_active == is_active,
+                UserSession.expires_at < cutoff
+            ).limit(batch_size)]
+            
+            if not ids:
+                break
+            
+            db.query(UserSession).filter(
+                UserSession.id.in_(ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+            
+            deleted += len(ids)
+            batches += 1
+            
+            if len(ids) < batch_size:
+                break
+    
+    # Expired tokens no longer need to be tracked as revoked
+    revoked_tokens.purge_expired()
     
-    return expired_sessions
\ No newline at end of file
+    return deleted
@@ -0,0 +1,206 @@
+"""
+Point-in-time board reconstruction and single-task undo from task history
+
+The board at time T is rebuilt from the newest snapshot taken at or before T
+plus the history entries recorded between the snapshot and T, so a lookup
+costs O(snapshot + delta) rather than a replay of the whole history.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .history_partitions import history_sources, naive_utc
+from .models import BoardSnapshot, Task
+
+logger = logging.getLogger(__name__)
+
+# Task fields that make up the board state
+BOARD_FIELDS = (
+    "custom_id", "client_name", "task_type", "address", "processing",
+    "status", "description", "owner_id", "priority_order",
+)
+
+DELETE_ACTIONS = ("deleted", "deleted_via_clear")
+UNDO_ACTION = "undone"
+
+BoardState = Dict[int, Dict[str, Any]]
+
+
+def board_fields(task: Task) -> Dict[str, Any]:
+    """Board state of a single task, as stored in history and snapshots"""
+    return {field: getattr(task, field) for field in BOARD_FIELDS}
+
+
+def undo_values(task: Task) -> Dict[str, Any]:
+    """Board state plus completion time, recorded as old values so undo can restore both"""
+    return {**board_fields(task), "completed_at": task.completed_at}
+
+
+def recorded_completed_at(values: Dict[str, Any]) -> Optional[datetime]:
+    """Completion time stored by `undo_values` (history keeps it as an ISO string)"""
+    value = values.get("completed_at")
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def apply_entry(
+    state: BoardState,
+    task_id: int,
+    action: str,
+    old_values: Optional[Dict[str, Any]],
+    new_values: Optional[Dict[str, Any]]
+) -> None:
+    """
+    Apply one history entry to a board state in place
+
+    "created" entries and undone deletions carry the full task; updates and
+    moves carry only the changed fields. An entry for a task missing from
+    the state (e.g. older history was archived) starts from its old values.
+    """
+    if action in DELETE_ACTIONS or (action == UNDO_ACTION and new_values is None):
+        state.pop(task_id, None)
+        return
+
+    changes = {key: value for key, value in (new_values or {}).items() if key in BOARD_FIELDS}
+    if action == "created" or task_id not in state:
+        base = dict.fromkeys(BOARD_FIELDS)
+        if action != "created":
+            base.update({key: value for key, value in (old_values or {}).items() if key in BOARD_FIELDS})
+        base.update(changes)
+        state[task_id] = base
+    else:
+        state[task_id].update(changes)
+
+
+# ===== Snapshots =====
+
+def take_board_snapshot(db: Session) -> int:
+    """
+    Store a compact snapshot of every task and prune expired snapshots
+
+    The snapshot time is taken before the read, so any change that lands in
+    between is also replayed afterwards; replaying it again is idempotent.
+
+    Returns:
+        Number of tasks captured
+    """
+    taken_at = datetime.utcnow()
+    columns = [Task.id] + [getattr(Task, field) for field in BOARD_FIELDS]
+    rows = db.execute(select(*columns).order_by(Task.id)).all()
+
+    db.add(BoardSnapshot(
+        taken_at=taken_at,
+        task_count=len(rows),
+        data={"fields": list(BOARD_FIELDS), "tasks": [list(row) for row in rows]},
+    ))
+
+    if settings.board_snapshot_retention_days > 0:
+        cutoff = taken_at - timedelta(days=settings.board_snapshot_retention_days)
+        db.query(BoardSnapshot).filter(BoardSnapshot.taken_at < cutoff).delete(synchronize_session=False)
+
+    db.commit()
+    return len(rows)
+
+
+def _load_snapshot(snapshot: BoardSnapshot) -> BoardState:
+    fields = snapshot.data["fields"]
+    state: BoardState = {}
+    for row in snapshot.data["tasks"]:
+        task = dict.fromkeys(BOARD_FIELDS)
+        task.update(zip(fields, row[1:]))
+        state[row[0]] = task
+    return state
+
+
+# ===== Replay =====
+
+def _entries(
+    db: Session,
+    after: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    task_id: Optional[int] = None,
+    newest_first: bool = False
+) -> Iterable[Any]:
+    """History entries with after < timestamp <= until across all month tables"""
+    upper = until + timedelta(microseconds=1) if until else None
+    sources = history_sources(db, since=after, until=upper)
+    if not newest_first:
+        sources = list(reversed(sources))
+
+    for source in sources:
+        query = select(source)
+        if after is not None:
+            query = query.where(source.c.timestamp > after)
+        if until is not None:
+            query = query.where(source.c.timestamp <= until)
+        if task_id is not None:
+            query = query.where(source.c.task_id == task_id)
+
+        if newest_first:
+            query = query.order_by(source.c.timestamp.desc(), source.c.id.desc())
+        else:
+            query = query.order_by(source.c.timestamp.asc(), source.c.id.asc())
+        yield from db.execute(query)
+
+
+def board_as_of(db: Session, as_of: datetime) -> Tuple[Optional[datetime], int, BoardState]:
+    """
+    Reconstruct the board as it was at `as_of`
+
+    Returns:
+        (snapshot time used or None, number of entries replayed, board state)
+    """
+    as_of = naive_utc(as_of)
+
+    snapshot = db.query(BoardSnapshot).filter(
+        BoardSnapshot.taken_at <= as_of
+    ).order_by(BoardSnapshot.taken_at.desc()).first()
+
+    state = _load_snapshot(snapshot) if snapshot else {}
+    after = naive_utc(snapshot.taken_at) if snapshot else None
+
+    replayed = 0
+    for entry in _entries(db, after=after, until=as_of):
+        apply_entry(state, entry.task_id, entry.action, entry.old_values, entry.new_values)
+        replayed += 1
+
+    return (snapshot.taken_at if snapshot else None), replayed, state
+
+
+# ===== Undo =====
+
+def task_entries(db: Session, task_id: int) -> List[Any]:
+    """All history entries of one task, newest first"""
+    return list(_entries(db, task_id=task_id, newest_first=True))
+
+
+def undo_target(entries: List[Any]) -> Optional[Any]:
+    """
+    The newest entry that has not been undone yet
+
+    Each "undone" entry cancels the next older regular entry, so repeated
+    undos step further back through the task's history.
+    """
+    pending = 0
+    for entry in entries:
+        if entry.action == UNDO_ACTION:
+            pending += 1
+        elif pending:
+            pending -= 1
+        else:
+            return entry
+    return None
+
+
+def state_before(entries: List[Any], target: Any) -> Optional[Dict[str, Any]]:
+    """Task state just before `target`, folded from its older entries"""
+    state: BoardState = {}
+    for entry in reversed(entries):
+        if entry.id == target.id:
+            break
+        apply_entry(state, entry.task_id, entry.action, entry.old_values, entry.new_values)
+    return state.get(target.task_id)
@@ -0,0 +1,167 @@
+"""
+In-memory typeahead index of distinct task client names
+"""
+
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, object_session
+
+from .database import SessionLocal
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive key for a client name"""
+    return " ".join(name.split()).casefold()
+
+
+class ClientNameIndex:
+    """
+    Sorted array of normalized client names with per-name task counts
+
+    Prefix lookups bisect to the first candidate and scan forward while the
+    prefix matches, then keep the most frequent names. Counts are kept in
+    step with the tasks table by ORM events, so suggestions never query the
+    database once the index is loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._entries: Dict[str, List] = {}  # key -> [count, display name]
+        self.loaded = False
+
+    def load(self, db: Session) -> int:
+        """
+        Rebuild the index from the tasks table
+
+        Returns:
+            Number of distinct client names loaded
+        """
+        rows = db.query(Task.client_name, func.count(Task.id)).group_by(Task.client_name).all()
+
+        entries: Dict[str, List] = {}
+        for name, count in rows:
+            if not name:
+                continue
+            entry = entries.setdefault(normalize_name(name), [0, name])
+            # Show the most common spelling of each name
+            if count > entry[0]:
+                entry[1] = name
+            entry[0] += count
+
+        with self._lock:
+            self._entries = entries
+            self._keys = sorted(entries)
+            self.loaded = True
+
+        logger.info(f"Loaded {len(entries)} client names into the typeahead index")
+        return len(entries)
+
+    def add(self, name: Optional[str]) -> None:
+        if not name:
+            return
+        key = normalize_name(name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [1, name]
+                insort(self._keys, key)
+            else:
+                entry[0] += 1
+
+    def remove(self, name: Optional[str]) -> None:
+        if not name:
+            return
+        key = normalize_name(name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[0] -= 1
+            if entry[0] <= 0:
+                del self._entries[key]
+                index = bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Most frequent client names starting with `prefix`
+
+        Returns:
+            (display name, task count) pairs, most frequent first
+        """
+        key = normalize_name(prefix)
+        with self._lock:
+            start = bisect_left(self._keys, key)
+            matches = []
+            for index in range(start, len(self._keys)):
+                candidate = self._keys[index]
+                if not candidate.startswith(key):
+                    break
+                count, display = self._entries[candidate]
+                matches.append((count, display))
+
+        best = heapq.nsmallest(limit, matches, key=lambda match: (-match[0], match[1]))
+        return [(display, count) for count, display in best]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# Global client name index instance
+client_names = ClientNameIndex()
+
+
+_PENDING_CHANGES = "pending_client_names"
+
+
+def stage_client_name_change(db: Session, old: Optional[str], new: Optional[str]) -> None:
+    """
+    Queue a client name change to apply once `db` commits
+
+    Called by the Task mapper events below; bulk deletes that bypass the
+    ORM must call it themselves.
+    """
+    db.info.setdefault(_PENDING_CHANGES, []).append((old, new))
+
+
+@event.listens_for(Task, "after_insert")
+def _task_inserted(mapper, connection, target: Task) -> None:
+    stage_client_name_change(object_session(target), None, target.client_name)
+
+
+@event.listens_for(Task, "after_update")
+def _task_updated(mapper, connection, target: Task) -> None:
+    history = inspect(target).attrs.client_name.history
+    if history.has_changes():
+        old = history.deleted[0] if history.deleted else None
+        stage_client_name_change(object_session(target), old, target.client_name)
+
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target: Task) -> None:
+    stage_client_name_change(object_session(target), target.client_name, None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_client_name_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_CHANGES, ())
+    if not client_names.loaded:
+        return
+    for old, new in changes:
+        client_names.remove(old)
+        client_names.add(new)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_client_name_changes(session: Session) -> None:
+    session.info.pop(_PENDING_CHANGES, None)
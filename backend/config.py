@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    token_cache_size: int = 1024  # Verified tokens kept in memory; 0 disables the cache
     
     # CORS - Allow all origins in production, specific ones for local dev
     allowed_origins: Union[List[str], str] = [
@@ -33,6 +34,99 @@ class Settings(BaseSettings):
     app_name: str = "TEG Task Management System API"
     debug: bool = False
     
+    # Rate limiting - token buckets keyed by client IP and route
+    rate_limit_enabled: bool = True
+    guest_rate_limit_per_minute: int = 30
+    guest_rate_limit_burst: int = 10
+    login_rate_limit_per_minute: int = 10
+    login_rate_limit_burst: int = 5
+    rate_limit_max_buckets: int = 10000  # Idle buckets beyond this are evicted (LRU)
+    trusted_proxy_ips: str = "127.0.0.1"  # Proxy addresses or networks whose X-Forwarded-For is believed
+    
+    # Password hashing - bcrypt runs on a dedicated, size-limited worker pool
+    bcrypt_rounds: int = 12  # Changing this rehashes passwords on next login
+    max_concurrent_password_checks: int = 4  # Worker threads
+    password_hash_queue_size: int = 32  # Jobs allowed to wait for a worker
+    password_check_wait_seconds: float = 5.0  # Queue + hashing timeout
+    
+    # Audit history writer - batches TaskHistory inserts off the request path
+    audit_durable: bool = False  # Write each entry synchronously (tests)
+    audit_queue_size: int = 10000
+    audit_batch_size: int = 100
+    audit_flush_interval_seconds: float = 1.0
+    audit_log_dir: Optional[str] = "./audit_log"  # Append-only segment archive; empty disables it
+    audit_log_segment_bytes: int = 8 * 1024 * 1024
+    audit_log_block_records: int = 256
+    audit_mirror_table: Optional[bool] = None  # Also copy entries to the detached audit_log table; on in production
+    
+    # Database connection pool, per worker process (size it against the server's connection limit)
+    db_pool_size: int = 5  # Connections kept open
+    db_max_overflow: int = 10  # Extra connections opened under load and closed when returned
+    db_pool_timeout_seconds: float = 30.0  # Wait for a free connection before failing the request
+    db_pool_recycle_seconds: int = 300  # Replace connections older than this
+    db_pool_pre_ping: str = "idle"  # always, idle (only connections idle longer than below) or never
+    db_pool_pre_ping_idle_seconds: float = 30.0
+    db_statement_timeout_ms: int = 0  # PostgreSQL statement_timeout; 0 disables
+    
+    # Optional read replica for list, detail, search and guest reads
+    read_replica_url: Optional[str] = None
+    read_replica_max_lag_seconds: float = 5.0  # Read from the primary while the replica is further behind
+    read_replica_check_interval_seconds: float = 5.0  # How often replica lag is measured
+    read_your_writes_seconds: float = 10.0  # Users who wrote read from the primary for this long
+    
+    # SQLite profile for small deployments (ignored for PostgreSQL)
+    sqlite_pragmas_enabled: bool = True  # Apply the pragmas below to every connection
+    sqlite_journal_mode: str = "wal"  # Readers and the writer no longer block each other
+    sqlite_synchronous: str = "normal"  # Safe with WAL; fsync at checkpoints instead of every commit
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_cache_size_mb: int = 64  # Page cache per connection
+    sqlite_temp_store: str = "memory"
+    sqlite_single_writer: bool = False  # Queue writers in-process instead of contending for the file lock
+    
+    # Schema migrations
+    database_auto_migrate: bool = True  # Run pending Alembic migrations on startup
+    
+    # Periodic maintenance jobs
+    maintenance_enabled: bool = True
+    session_cleanup_interval_seconds: int = 3600
+    session_cleanup_batch_size: int = 500
+    
+    # Task history partitioning and retention
+    history_partitions_ahead: int = 3  # Monthly partitions created in advance (PostgreSQL)
+    history_retention_months: int = 0  # Older months are exported and dropped; 0 keeps everything
+    history_archive_dir: str = "./history_archive"  # Must be persistent storage when retention is on
+    history_partition_interval_seconds: int = 86400
+    
+    # Board snapshots for point-in-time reconstruction
+    board_snapshot_interval_seconds: int = 3600
+    board_snapshot_retention_days: int = 90  # 0 keeps every snapshot
+    
+    # Live task counters for board headers and priority ordering
+    task_counts_table: bool = False  # Also keep counts in the task_counts table, updated with each write
+    task_counts_resync_interval_seconds: int = 300  # Reload counters, picking up other processes' writes
+    
+    # Production server (render_start.py) - see backend/workers.py for multi-worker rules
+    web_workers: int = 1  # Worker processes sharing the listening socket
+    web_loop: str = "auto"  # auto, uvloop or asyncio; auto uses uvloop when installed
+    web_http: str = "auto"  # auto, httptools or h11; auto uses httptools when installed
+    web_max_requests: int = 0  # Gracefully restart a worker after this many requests; 0 never restarts
+    web_max_requests_jitter: int = 0  # Random extra requests per worker so restarts are staggered
+    web_graceful_timeout_seconds: int = 30  # Time given to in-flight requests when a worker stops
+    worker_sync_interval_seconds: int = 5  # With several workers, reload revocations and counters this often
+    client_names_resync_interval_seconds: int = 60  # With several workers, reload the client name index this often
+    
+    # Prometheus metrics at /metrics
+    metrics_enabled: bool = True  # Off in production until METRICS_TOKEN is set
+    metrics_token: Optional[str] = None  # When set, scrapers must send "Authorization: Bearer <token>"
+    metrics_loop_lag_interval_seconds: float = 0.5  # Event-loop lag sampling period; 0 disables sampling
+    
+    # Per-request SQL auditing; unset switches follow DEBUG and ENVIRONMENT=test
+    query_audit_enabled: Optional[bool] = None  # Count statements per request, log slow and repeated ones
+    query_slow_ms: float = 100.0  # Log statements slower than this, with their parameters
+    query_repeat_threshold: int = 5  # Flag a statement shape run this often in one request as a likely N+1
+    query_budget_strict: Optional[bool] = None  # Fail requests over their endpoint's @query_budget with a 500
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Convert string to list if needed (for environment variables)
@@ -42,6 +136,27 @@ class Settings(BaseSettings):
         # In production, allow all origins for CORS (Render provides HTTPS)
         if self.environment == "production" or self.database_url.startswith("postgresql"):
             self.allowed_origins = ["*"]
+        
+        # Local disks on hosts like Render are wiped on deploy, so production
+        # keeps the archive in the database as well
+        if self.audit_mirror_table is None:
+            self.audit_mirror_table = self.environment == "production"
+        
+        # State that must be shared between worker processes lives in the database
+        if self.web_workers > 1:
+            self.task_counts_table = True
+            self.audit_log_dir = None  # The segment archive allows a single writer
+            self.audit_mirror_table = True
+        
+        # Never serve /metrics unauthenticated in production
+        if self.environment == "production" and not self.metrics_token:
+            self.metrics_enabled = False
+        
+        # Query auditing is for development and test runs
+        if self.query_audit_enabled is None:
+            self.query_audit_enabled = self.debug or self.environment == "test"
+        if self.query_budget_strict is None:
+            self.query_budget_strict = self.environment == "test"
     
     class Config:
         env_file = ".env"
@@ -2,10 +2,32 @@
 Database configuration and session management for SQLite/PostgreSQL
 """
 
-from sqlalchemy import create_engine
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .db_pool import install_pool_events, pool_options
+from .sqlite_tuning import install_sqlite_profile
+
+logger = logging.getLogger(__name__)
+
+# alembic.ini and migrations/ live at the project root
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def postgresql_connect_args() -> dict:
+    """Driver arguments for PostgreSQL connections"""
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        # Enforced by the server for every statement on the connection
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    return connect_args
+
 
 # Create database engine with conditional configuration
 if settings.database_url.startswith("sqlite"):
@@ -13,17 +35,21 @@ if settings.database_url.startswith("sqlite"):
     engine = create_engine(
         settings.database_url,
         connect_args={"check_same_thread": False},  # Required for SQLite
-        echo=settings.debug  # Log SQL queries in debug mode
+        echo=settings.debug,  # Log SQL queries in debug mode
+        **pool_options()
     )
+    install_sqlite_profile(engine)  # WAL and friends, single-writer queue
 else:
     # PostgreSQL configuration (for production)
     engine = create_engine(
         settings.database_url,
+        connect_args=postgresql_connect_args(),
         echo=settings.debug,  # Log SQL queries in debug mode
-        pool_pre_ping=True,   # Verify connections before using
-        pool_recycle=300      # Recycle connections every 5 minutes
+        **pool_options()      # Size, overflow, timeout, recycling and pre-ping from DB_POOL_* settings
     )
 
+install_pool_events(engine)
+
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -45,7 +71,107 @@ def get_db():
 
 def create_tables():
     """
-    Create all database tables
-    Call this when starting the application
+    Create all database tables directly from the models
+
+    For throwaway databases (benchmarks, scripts). A database created this
+    way is stamped at the latest migration so upgrade_schema leaves it alone.
+    Application startup uses upgrade_schema instead.
     """
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from alembic import command
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.begin() as connection:
+        fresh = MigrationContext.configure(connection).get_current_revision() is None
+        Base.metadata.create_all(bind=connection)
+        if fresh:
+            config = _alembic_config(connection)
+            command.stamp(config, "head")
+
+
+def upgrade_schema() -> Optional[str]:
+    """
+    Bring the database schema up to the latest Alembic migration
+
+    A database already at head costs a single version lookup and Alembic
+    itself is not even imported, so restarts skip create_all, metadata
+    reflection and the migration machinery entirely. Empty databases are
+    built by running every migration; databases created by create_all
+    before migrations existed are stamped at 0001 and upgraded from there.
+
+    Returns:
+        The revision the database is at afterwards
+
+    Raises:
+        RuntimeError: If the schema is behind and auto-migration is disabled
+    """
+    with engine.begin() as connection:
+        head = _head_revision()
+        current = _current_revision(connection)
+
+        if head is not None and current == head:
+            logger.info(f"Database schema is at head ({head})")
+            return current
+
+        from alembic import command
+        from alembic.script import ScriptDirectory
+
+        config = _alembic_config(connection)
+        head = ScriptDirectory.from_config(config).get_current_head()
+        if current == head:
+            return current
+
+        if not settings.database_auto_migrate:
+            raise RuntimeError(
+                f"Database schema is at {current or 'no revision'}, expected {head}; "
+                "run `alembic upgrade head`"
+            )
+
+        if current is None and inspect(connection).has_table("tasks"):
+            logger.info("Stamping pre-migration database at revision 0001")
+            command.stamp(config, "0001")
+            current = "0001"
+
+        if connection.dialect.name == "postgresql":
+            # Index builds and backfills may run longer than a request should
+            connection.execute(text("SET LOCAL statement_timeout = 0"))
+        
+        logger.info(f"Upgrading database schema from {current or 'empty'} to {head}")
+        command.upgrade(config, "head")
+
+    return head
+
+
+_REVISION = re.compile(r"^(down_revision|revision)\b[^=]*=\s*[\"'](\w+)[\"']", re.MULTILINE)
+
+
+def _head_revision() -> Optional[str]:
+    """
+    Latest migration id, read from the revision files without importing Alembic
+
+    Returns None unless there is exactly one head, leaving anything unusual
+    to Alembic itself.
+    """
+    revisions, parents = set(), set()
+    for path in (PROJECT_ROOT / "migrations" / "versions").glob("*.py"):
+        for kind, revision in _REVISION.findall(path.read_text()):
+            (revisions if kind == "revision" else parents).add(revision)
+
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def _current_revision(connection) -> Optional[str]:
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _alembic_config(connection):
+    """Alembic config that runs migrations on `connection`"""
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
\ No newline at end of file
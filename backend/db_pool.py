@@ -0,0 +1,175 @@
+"""
+Instrumented database connection pool and checkout policies
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from .config import settings
+from .workers import worker_count
+
+# Checkouts slower than this count as having waited for a connection
+SLOW_CHECKOUT_SECONDS = 0.01
+
+PRE_PING_POLICIES = ("always", "idle", "never")
+
+
+class PoolMetrics:
+    """
+    Checkout counters for one engine's pool in this worker process
+
+    Wait time covers everything between asking the pool for a connection
+    and getting one: waiting for a free connection, opening a new one and
+    any pre-ping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+        self.pre_ping_failures = 0
+        self.peak_checked_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, checked_out: int, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.slow_checkouts += wait >= SLOW_CHECKOUT_SECONDS
+            self.overflow_checkouts += overflowed
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "slow_checkouts": self.slow_checkouts,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_checked_out": self.peak_checked_out,
+                "connections_opened": self.connections_opened,
+                "connections_invalidated": self.connections_invalidated,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+
+
+# Global pool metrics instance for the primary engine
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout and counts overflow and timeouts"""
+
+    metrics = pool_metrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        checked_out = self.checkedout()
+        self.metrics.record_checkout(time.perf_counter() - started, checked_out, checked_out > self.size())
+        return connection
+
+
+def pool_options(metrics: PoolMetrics = pool_metrics) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for the DB_POOL_* settings
+
+    Args:
+        metrics: Counters the engine's pool reports to
+    """
+    if settings.db_pool_pre_ping not in PRE_PING_POLICIES:
+        raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_POLICIES)}")
+
+    # A subclass per metrics object survives the pool being recreated
+    poolclass = InstrumentedQueuePool
+    if metrics is not pool_metrics:
+        poolclass = type(InstrumentedQueuePool.__name__, (InstrumentedQueuePool,), {"metrics": metrics})
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def install_pool_events(engine: Engine, metrics: PoolMetrics = pool_metrics) -> None:
+    """Count opened and invalidated connections and apply the "idle" pre-ping policy"""
+
+    @event.listens_for(engine, "connect")
+    def _opened(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidated(dbapi_connection, connection_record, exception):
+        metrics.connections_invalidated += 1
+
+    if settings.db_pool_pre_ping != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def _checked_in(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        # Connections in steady use skip the round trip; only those idle long
+        # enough to have been dropped by the server or a proxy are tested
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pool_pre_ping_idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception:
+            metrics.pre_ping_failures += 1
+            # The pool discards this connection and checks out another
+            raise exc.DisconnectionError()
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Current pool occupancy, configuration and checkout counters"""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "pool_size": pool.size(),
+            "max_overflow": settings.db_max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    status.update({
+        "max_connections_all_workers": worker_count() * (settings.db_pool_size + settings.db_max_overflow),
+        "pre_ping": settings.db_pool_pre_ping,
+        "statement_timeout_ms": settings.db_statement_timeout_ms or None,
+    })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
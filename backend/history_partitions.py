@@ -0,0 +1,296 @@
+"""
+Time-based partitioning and retention for task history
+
+PostgreSQL: task_history is a table partitioned by RANGE (timestamp) with
+one partition per month (task_history_YYYYMM) plus a default partition.
+Partitions are created `history_partitions_ahead` months in advance and the
+planner prunes them for time-bounded queries.
+
+SQLite: task_history holds the current month only. Closed months are rolled
+over into task_history_YYYYMM tables with the same columns and indexes, and
+history queries visit only the tables whose month overlaps the requested
+range. The ORM `Task.history` relationship reads task_history alone, so on
+SQLite it only sees the current month; go through `history_sources` for
+anything older.
+
+On both backends, months older than `history_retention_months` are exported
+to gzip-compressed JSON lines files and then detached/dropped, which avoids
+bulk DELETEs and keeps vacuum cost bounded. Retention is off by default:
+the export is the only copy left, so HISTORY_ARCHIVE_DIR has to be on
+persistent storage.
+"""
+
+import gzip
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, delete, insert, select, text
+)
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import JSONValue, TaskHistory
+
+logger = logging.getLogger(__name__)
+
+_MONTH_TABLE = re.compile(r"^task_history_(\d{4})(\d{2})$")
+_rollover_metadata = MetaData()
+
+# Table names per database URL, valid while its schema_version is unchanged
+_sqlite_table_names: Dict[str, Tuple[Optional[int], List[str]]] = {}
+_SQLITE_TABLES = text(
+    "SELECT name, (SELECT schema_version FROM pragma_schema_version) "
+    "FROM sqlite_master WHERE type = 'table'"
+)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """`value` as naive UTC, the form history timestamps are stored in on SQLite"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing `value` (naive UTC)"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month start by `months` months"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_table_name(start: datetime) -> str:
+    return f"task_history_{start.year:04d}{start.month:02d}"
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+# ===== Month tables =====
+
+def _month_table(name: str) -> Table:
+    """Table object for a partition or rollover table named task_history_YYYYMM"""
+    if name in _rollover_metadata.tables:
+        return _rollover_metadata.tables[name]
+
+    return Table(
+        name,
+        _rollover_metadata,
+        Column("id", Integer, primary_key=True),
+        Column("task_id", Integer, nullable=False),
+        Column("user_id", Integer, nullable=False),
+        Column("action", String(50), nullable=False),
+        Column("old_values", JSONValue, nullable=True),
+        Column("new_values", JSONValue, nullable=True),
+        Column("timestamp", DateTime(timezone=True)),
+        Index(f"ix_{name}_task_ts", "task_id", "timestamp", "id"),
+        Index(f"ix_{name}_user_ts", "user_id", "timestamp", "id"),
+        Index(f"ix_{name}_ts", "timestamp", "id"),
+    )
+
+
+def month_tables(db: Session) -> List[Tuple[datetime, str]]:
+    """
+    Existing task_history_YYYYMM tables, newest first
+
+    On PostgreSQL these are the attached partitions; on SQLite the rollover
+    tables.
+    """
+    if _dialect(db) == "postgresql":
+        names = db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'task_history'::regclass"
+        )).scalars().all()
+    else:
+        names = _table_names(db)
+
+    tables = []
+    for name in names:
+        match = _MONTH_TABLE.match(name)
+        if match:
+            tables.append((datetime(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(tables, reverse=True)
+
+
+def _table_names(db: Session) -> List[str]:
+    """
+    Table names of a SQLite database, listed again only after its schema
+    changes
+
+    SQLite bumps schema_version on every CREATE or DROP, including those run
+    by other worker processes. A cached list costs one PRAGMA to validate;
+    the first lookup reads the names and the version in one statement.
+    """
+    key = str(db.get_bind().url)
+    cached = _sqlite_table_names.get(key)
+    if cached is not None and db.execute(text("PRAGMA schema_version")).scalar() == cached[0]:
+        return cached[1]
+
+    rows = db.execute(_SQLITE_TABLES).all()
+    names = [name for name, _ in rows]
+    _sqlite_table_names[key] = (rows[0][1] if rows else None, names)
+    return names
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether task_history is a partitioned table (PostgreSQL only)"""
+    if _dialect(db) != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'task_history'::regclass"
+    )).first() is not None
+
+
+# ===== Scheduled jobs =====
+
+def ensure_history_partitions(db: Session) -> int:
+    """
+    Keep the monthly layout up to date
+
+    PostgreSQL: create missing partitions for the current month and the
+    next `history_partitions_ahead` months.
+    SQLite: roll rows from closed months out of task_history into their
+    month tables.
+
+    Returns:
+        Partitions created (PostgreSQL) or rows rolled over (SQLite)
+    """
+    current = month_start(datetime.utcnow())
+
+    if _dialect(db) == "postgresql":
+        if not is_partitioned(db):
+            return 0
+
+        created = 0
+        for offset in range(settings.history_partitions_ahead + 1):
+            start = add_months(current, offset)
+            name = month_table_name(start)
+            exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+            if exists:
+                continue
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF task_history "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+            ))
+            db.commit()
+            created += 1
+            logger.info(f"Created history partition {name}")
+        return created
+
+    history = TaskHistory.__table__
+    oldest_query = select(history.c.timestamp).where(
+        history.c.timestamp < current
+    ).order_by(history.c.timestamp.asc()).limit(1)
+
+    moved = 0
+    # Each pass moves the month of the oldest remaining row, skipping empty months
+    while (oldest := db.execute(oldest_query).scalar()) is not None:
+        start = month_start(oldest)
+        end = add_months(start, 1)
+        in_month = (history.c.timestamp >= start) & (history.c.timestamp < end)
+
+        table = _month_table(month_table_name(start))
+        table.create(bind=db.connection(), checkfirst=True)
+        result = db.execute(insert(table).from_select(
+            [column.name for column in table.columns],
+            select(*[history.c[column.name] for column in table.columns]).where(in_month)
+        ))
+        db.execute(delete(history).where(in_month))
+        db.commit()
+
+        moved += result.rowcount or 0
+
+    return moved
+
+
+def export_month(db: Session, name: str, directory: Path) -> int:
+    """
+    Write every row of a month table to `directory`/<name>.jsonl.gz
+
+    Returns:
+        Number of rows exported
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    table = _month_table(name)
+    path = directory / f"{name}.jsonl.gz"
+
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as target:
+        for row in db.execute(select(table).order_by(table.c.timestamp, table.c.id)).mappings():
+            target.write(json.dumps(jsonable_encoder(dict(row)), separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def apply_history_retention(db: Session) -> int:
+    """
+    Archive and remove months older than `history_retention_months`
+
+    Each expired month is exported to HISTORY_ARCHIVE_DIR, then detached
+    (PostgreSQL) and dropped. Returns the number of rows archived.
+    """
+    if settings.history_retention_months <= 0:
+        return 0
+
+    cutoff = add_months(month_start(datetime.utcnow()), -settings.history_retention_months)
+    directory = Path(settings.history_archive_dir)
+    postgres = _dialect(db) == "postgresql"
+
+    archived = 0
+    for start, name in month_tables(db):
+        if start >= cutoff:
+            continue
+
+        rows = export_month(db, name, directory)
+        if postgres:
+            db.execute(text(f"ALTER TABLE task_history DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+
+        _rollover_metadata.remove(_month_table(name))
+        archived += rows
+        logger.info(f"Archived {rows} history rows from {name} to {directory}")
+
+    return archived
+
+
+# ===== Query routing =====
+
+def history_sources(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List[Table]:
+    """
+    Tables to read for a history query, newest first
+
+    PostgreSQL prunes partitions itself, so the parent table is enough. On
+    SQLite the rollover tables whose month overlaps [since, until) follow
+    task_history in descending time order, so callers can stop reading as
+    soon as a page is full.
+    """
+    sources = [TaskHistory.__table__]
+    if _dialect(db) == "postgresql":
+        return sources
+
+    since = naive_utc(since) if since else None
+    until = naive_utc(until) if until else None
+
+    for start, name in month_tables(db):
+        if until is not None and start >= until:
+            continue
+        if since is not None and add_months(start, 1) <= since:
+            continue
+        sources.append(_month_table(name))
+    return sources
@@ -0,0 +1,84 @@
+"""
+Query helpers for field-level filters on task history JSON values
+"""
+
+import re
+from typing import Any, Optional
+
+from sqlalchemy import Table, and_, func, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from .models import TaskHistory
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def validate_field_name(field: str) -> str:
+    """
+    Ensure `field` is a plain identifier usable as a JSON key
+
+    Raises:
+        ValueError: If the field name is not a simple identifier
+    """
+    if not _FIELD_NAME.match(field):
+        raise ValueError(f"Invalid history field name: {field!r}")
+    return field
+
+
+def json_field_equals(column, field: str, value: Any, dialect_name: str) -> ColumnElement:
+    """
+    Filter rows whose JSON `column` has `field` equal to `value`
+
+    On PostgreSQL this is a JSONB containment test (`@>`), which the GIN
+    index on new_values serves. Elsewhere it falls back to json_extract.
+
+    Args:
+        column: TaskHistory.old_values or TaskHistory.new_values
+        field: Top-level key in the JSON object
+        value: Value to match
+        dialect_name: Name of the database dialect in use
+
+    Returns:
+        SQLAlchemy filter expression
+    """
+    validate_field_name(field)
+
+    if dialect_name == "postgresql":
+        return type_coerce(column, JSONB).contains({field: value})
+
+    return func.json_extract(column, f"$.{field}") == value
+
+
+def field_transition(
+    field: str,
+    dialect_name: str,
+    from_value: Optional[Any] = None,
+    to_value: Optional[Any] = None,
+    table: Optional[Table] = None
+) -> ColumnElement:
+    """
+    Filter history rows where `field` changed from `from_value` to `to_value`
+
+    Either side may be omitted, e.g. to_value="awaiting-documents" alone
+    finds every time a task entered that status.
+
+    Args:
+        field: Task field name (e.g. "status", "processing")
+        dialect_name: Name of the database dialect in use
+        from_value: Value before the change (optional)
+        to_value: Value after the change (optional)
+        table: History table to filter (defaults to task_history)
+
+    Returns:
+        SQLAlchemy filter expression
+    """
+    table = table if table is not None else TaskHistory.__table__
+    criteria = []
+
+    if from_value is not None:
+        criteria.append(json_field_equals(table.c.old_values, field, from_value, dialect_name))
+    if to_value is not None:
+        criteria.append(json_field_equals(table.c.new_values, field, to_value, dialect_name))
+
+    return and_(*criteria) if criteria else true()
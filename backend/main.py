@@ -4,18 +4,33 @@ FastAPI main application for Entrust RE Kanban Backend
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
+import hmac
 import logging
-import uvicorn
 import os
 
 from .config import settings
-from .database import create_tables, engine
-from .routers import auth, tasks, websocket, guest
+from .database import engine, SessionLocal, upgrade_schema
+from .metrics import metrics
+from .password_hasher import password_hasher
+from .query_audit import budget_overrun, count_queries, install_query_audit
+from .read_replica import SAFE_METHODS, replica_router
+from .session_store import revoked_tokens
+from .startup_profile import startup_profiler
+from .task_counts import task_counters
+from .client_names import client_names
+from .websocket_manager import manager
+from .workers import event_relay, maintenance_leader, multi_worker, worker_count
+from .auth import cleanup_expired_sessions
+from .maintenance import scheduler
+from .history_partitions import apply_history_retention, ensure_history_partitions
+from .board_history import take_board_snapshot
+from .audit import audit_writer
+from .routers import auth, tasks, websocket, guest, admin, history
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +58,58 @@ app.add_middleware(
 )
 
 
+# Statement counts and timings for /metrics, attributed to the request
+if settings.metrics_enabled:
+    metrics.instrument_engine(engine)
+    if replica_router.enabled:
+        metrics.instrument_engine(replica_router.engine)
+elif settings.environment == "production" and not settings.metrics_token:
+    logger.warning("Metrics are disabled: set METRICS_TOKEN to serve /metrics in production")
+
+
+# Per-request statement counts, slow queries, N+1 warnings and query
+# budgets; on with DEBUG or ENVIRONMENT=test
+if settings.query_audit_enabled:
+    install_query_audit(engine)
+    if replica_router.enabled:
+        install_query_audit(replica_router.engine)
+
+    @app.middleware("http")
+    async def audit_queries(request: Request, call_next):
+        with count_queries(label=f"{request.method} {request.url.path}") as queries:
+            response = await call_next(request)
+            route = request.scope.get("route")
+            if route is not None:
+                queries.label = f"{request.method} {route.path}"
+        response.headers["X-Query-Count"] = str(queries.count)
+        overrun = budget_overrun(queries, request.scope.get("endpoint"))
+        if overrun and settings.query_budget_strict:
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": "Query budget exceeded", "error": overrun}
+            )
+        return response
+
+
+# Time to first response after a cold start
+if startup_profiler.enabled:
+    @app.middleware("http")
+    async def record_first_response(request: Request, call_next):
+        response = await call_next(request)
+        startup_profiler.first_response()
+        return response
+
+
+# Read-your-writes: authors of successful writes read from the primary
+if replica_router.enabled:
+    @app.middleware("http")
+    async def pin_writers_to_primary(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            replica_router.pin_writer(request, response)
+        return response
+
+
 # Global exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -91,17 +158,86 @@ async def startup_event():
     logger.info("Starting up TEG Task Management System API...")
     
     try:
-        # Create database tables
-        create_tables()
-        logger.info("Database tables created successfully")
+        # Apply pending migrations; a schema already at head costs one query
+        with startup_profiler.step("schema check"):
+            upgrade_schema()
         
-        # Test database connection
-        with engine.connect() as connection:
-            result = connection.execute(text("SELECT 1")).fetchone()
-            if result:
-                logger.info("Database connection verified")
-            else:
-                logger.error("Database connection test failed")
+        # Load revoked session tokens so logouts survive restarts. The client
+        # name index and board counters load on first use.
+        with startup_profiler.step("revoked tokens"):
+            db = SessionLocal()
+            try:
+                revoked_tokens.load(db)
+            finally:
+                db.close()
+        
+        # Start periodic maintenance jobs
+        if settings.maintenance_enabled:
+            scheduler.add_job(
+                "session_cleanup",
+                lambda db: cleanup_expired_sessions(db, batch_size=settings.session_cleanup_batch_size),
+                interval=settings.session_cleanup_interval_seconds
+            )
+            scheduler.add_job(
+                "history_partitions",
+                ensure_history_partitions,
+                interval=settings.history_partition_interval_seconds,
+                initial_delay=0
+            )
+            scheduler.add_job(
+                "history_retention",
+                apply_history_retention,
+                interval=settings.history_partition_interval_seconds
+            )
+            scheduler.add_job(
+                "board_snapshot",
+                take_board_snapshot,
+                interval=settings.board_snapshot_interval_seconds
+            )
+        
+        # With several workers, reload the state other workers write and
+        # relay WebSocket events between them (see backend/workers.py)
+        if multi_worker():
+            logger.info(f"Worker {os.getpid()} is one of {worker_count()} worker processes")
+            sync_interval = settings.worker_sync_interval_seconds
+            scheduler.add_job(
+                "revoked_tokens_sync",
+                revoked_tokens.load,
+                interval=sync_interval,
+                initial_delay=sync_interval,
+                leader_only=False
+            )
+            scheduler.add_job(
+                "client_names_resync",
+                lambda db: client_names.load(db) if client_names.loaded else 0,
+                interval=settings.client_names_resync_interval_seconds,
+                leader_only=False
+            )
+            event_relay.start(manager.broadcast)
+        
+        # Reload the board counters to pick up other processes' writes, more
+        # often with several workers. Counters not loaded yet stay lazy.
+        if settings.maintenance_enabled or multi_worker():
+            counts_interval = (
+                settings.worker_sync_interval_seconds if multi_worker()
+                else settings.task_counts_resync_interval_seconds
+            )
+            scheduler.add_job(
+                "task_counts_resync",
+                lambda db: task_counters.load(db) if task_counters.loaded else 0,
+                interval=counts_interval,
+                initial_delay=counts_interval,
+                leader_only=False
+            )
+        
+        if scheduler.jobs:
+            scheduler.start()
+        
+        if settings.metrics_enabled:
+            metrics.start_loop_monitor()
+        
+        startup_profiler.mark("startup complete")
+        startup_profiler.log_report()
                 
     except Exception as e:
         logger.error(f"Startup error: {e}")
@@ -112,7 +248,15 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup tasks on shutdown"""
     logger.info("Shutting down TEG Task Management System API...")
+    await scheduler.stop()
+    await metrics.stop_loop_monitor()
+    event_relay.stop()
+    maintenance_leader.release()
+    audit_writer.stop()
+    password_hasher.shutdown()
     engine.dispose()
+    if replica_router.enabled:
+        replica_router.engine.dispose()
 
 
 # Health check endpoints
@@ -153,11 +297,25 @@ async def api_health_check():
         )
 
 
+# Prometheus scrape endpoint; each worker process reports its own metrics
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics(request: Request):
+        """Metrics in the Prometheus text exposition format"""
+        if settings.metrics_token:
+            expected = f"Bearer {settings.metrics_token}"
+            if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected.encode()):
+                return PlainTextResponse("Unauthorized", status_code=status.HTTP_401_UNAUTHORIZED)
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Include routers with proper prefixes
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["tasks"])
 app.include_router(websocket.router, prefix="/api/v1/ws", tags=["websocket"])
 app.include_router(guest.router, prefix="/api/v1/guest", tags=["guest"])
+app.include_router(history.router, prefix="/api/v1/history", tags=["history"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 # API Root endpoint (only for /api path)
 @app.get("/api")
@@ -176,8 +334,18 @@ if os.path.exists("frontend"):
     logger.info("Frontend static files mounted at /")
 
 
+# Per-route latency, concurrency and query metrics; needs every route registered
+if settings.metrics_enabled:
+    metrics.instrument_app(app)
+
+
+startup_profiler.mark("app imported")
+
+
 # Development server runner
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
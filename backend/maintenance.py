@@ -0,0 +1,160 @@
+"""
+In-app scheduler for periodic database maintenance jobs
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal
+from .workers import maintenance_leader
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceJob:
+    """A named job run every `interval` seconds with its own DB session"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Session], int],
+        interval: float,
+        initial_delay: float = 60,
+        leader_only: bool = True
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.leader_only = leader_only
+
+        # Last run report
+        self.runs = 0
+        self.failures = 0
+        self.last_rows: Optional[int] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_finished_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def run(self) -> int:
+        """Run the job once (blocking) and record rows processed and duration"""
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            rows = self.func(db)
+        except Exception as e:
+            db.rollback()
+            self.failures += 1
+            self.last_error = str(e)
+            logger.error(f"Maintenance job '{self.name}' failed: {e}")
+            raise
+        finally:
+            db.close()
+            self.runs += 1
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            self.last_finished_at = datetime.utcnow()
+
+        self.last_rows = rows
+        self.last_error = None
+        # Jobs in every worker (resyncs) run every few seconds; keep them out of the INFO log
+        logger.log(
+            logging.INFO if self.leader_only else logging.DEBUG,
+            f"Maintenance job '{self.name}' processed {rows} rows in {self.last_duration_ms} ms"
+        )
+        return rows
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval,
+            "leader_only": self.leader_only,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_rows": self.last_rows,
+            "last_duration_ms": self.last_duration_ms,
+            "last_finished_at": self.last_finished_at.isoformat() if self.last_finished_at else None,
+            "last_error": self.last_error,
+        }
+
+
+class MaintenanceScheduler:
+    """
+    Runs registered jobs on fixed intervals inside the application process
+
+    Each job loops in its own asyncio task and executes in a worker thread,
+    so slow database work never blocks the event loop. With several worker
+    processes, leader-only jobs run in the worker holding the maintenance
+    lock (see backend/workers.py).
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, MaintenanceJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[Session], int],
+        interval: float,
+        initial_delay: float = 60,
+        leader_only: bool = True
+    ) -> MaintenanceJob:
+        """
+        Register a job
+
+        Args:
+            name: Unique job name
+            func: Callable taking a DB session and returning rows processed
+            interval: Seconds between runs
+            initial_delay: Seconds to wait after startup before the first run
+            leader_only: Run in one worker process only; False runs it in
+                every worker (for refreshing per-process state)
+
+        Returns:
+            The registered job
+        """
+        job = MaintenanceJob(name, func, interval, initial_delay, leader_only)
+        self.jobs[name] = job
+        return job
+
+    async def _loop(self, job: MaintenanceJob) -> None:
+        await asyncio.sleep(job.initial_delay)
+        while True:
+            if job.leader_only and not maintenance_leader.acquire():
+                # Another worker runs the job; take over soon if it exits
+                await asyncio.sleep(min(job.interval, settings.worker_sync_interval_seconds))
+                continue
+            try:
+                await asyncio.to_thread(job.run)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # Already logged and recorded by the job
+            await asyncio.sleep(job.interval)
+
+    def start(self) -> None:
+        """Start all job loops on the running event loop"""
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"maintenance:{job.name}"))
+        logger.info(f"Maintenance scheduler started with {len(self.jobs)} job(s)")
+
+    async def stop(self) -> None:
+        """Cancel all job loops"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Report for every registered job"""
+        return [job.report() for job in self.jobs.values()]
+
+
+# Global scheduler instance
+scheduler = MaintenanceScheduler()
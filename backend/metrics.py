@@ -0,0 +1,298 @@
+"""
+Prometheus metrics: request latency, database queries, WebSockets, caches
+and event-loop lag
+
+Everything is collected in plain Python counters owned by this worker
+process and rendered in the Prometheus text format only when /metrics is
+scraped. Each route's ASGI app is wrapped once at import with its own
+preallocated metrics, so the request path does no label lookups and no
+string formatting; it bumps integers and histogram buckets found by
+bisecting fixed tuples of bounds, and its only allocation is the two-slot
+tally its database statements are counted in, made only once an engine is
+instrumented.
+
+Request metrics are only updated on the event loop thread and need no
+lock. Database metrics are also updated from threadpool threads, so those
+updates hold a lock.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Mount, Route
+
+from .config import settings
+from .token_cache import token_cache
+from .websocket_manager import manager
+from .workers import event_relay, multi_worker
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "teg_tms"
+
+# Histogram bucket upper bounds (seconds, or queries per request)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_QUERY_STARTED = "metrics_query_started"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative on render"""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # bisect_left: a value equal to a bound belongs to that bound's bucket (le)
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str, lines: List[str]) -> None:
+        separator = "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {cumulative}')
+        braced = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{braced} {self.sum}")
+        lines.append(f"{name}_count{braced} {cumulative}")
+
+
+class RouteMetrics:
+    """Latency, concurrency and database work of one route"""
+
+    __slots__ = ("labels", "latency", "in_flight", "db_queries", "db_seconds")
+
+    def __init__(self, method: str, path: str):
+        self.labels = f'method="{method}",route="{path}"'
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.in_flight = 0
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+
+
+class QueryTally:
+    """Statements run and time spent in the database by one request"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# The request a database statement is attributed to. Sync endpoints and
+# dependencies run in threadpool threads with a copy of the request's
+# context, so they see the same tally object.
+current_tally: contextvars.ContextVar[Optional[QueryTally]] = contextvars.ContextVar("current_tally", default=None)
+
+
+class Metrics:
+    """Registry of this worker process's metrics"""
+
+    def __init__(self):
+        self.routes: List[RouteMetrics] = []
+
+        self.db_queries = 0
+        self.db_query_seconds = Histogram(QUERY_BUCKETS)
+        self._db_lock = threading.Lock()  # Statements finish on threadpool threads too
+        self.tracks_queries = False  # Set by instrument_engine; requests tally statements only then
+
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.loop_lag_last = 0.0
+        self._lag_task: Optional[asyncio.Task] = None
+
+    def instrument_app(self, app) -> int:
+        """
+        Wrap every HTTP route and mount of `app` with its own metrics
+
+        Call once all routes are registered. WebSocket routes are left alone
+        and reported through the connection manager instead.
+
+        Returns:
+            Number of routes instrumented
+        """
+        for route in app.routes:
+            if isinstance(route, Route):
+                methods = ",".join(sorted(route.methods or ()))
+                path = route.path
+            elif isinstance(route, Mount):
+                methods = "*"
+                path = f"{route.path}/{{path:path}}"
+            else:
+                continue
+            stats = RouteMetrics(methods, path)
+            route.app = self._measured(route.app, stats)
+            self.routes.append(stats)
+        return len(self.routes)
+
+    def _measured(self, route_app: Callable, stats: RouteMetrics) -> Callable:
+        latency = stats.latency
+        db_queries = stats.db_queries
+        db_seconds = stats.db_seconds
+        perf_counter = time.perf_counter
+
+        async def measured(scope, receive, send):
+            if scope["type"] != "http":
+                # Mounts also see WebSocket connections
+                await route_app(scope, receive, send)
+                return
+            stats.in_flight += 1
+            tally = QueryTally() if self.tracks_queries else None
+            token = current_tally.set(tally)
+            started = perf_counter()
+            try:
+                await route_app(scope, receive, send)
+            finally:
+                latency.observe(perf_counter() - started)
+                current_tally.reset(token)
+                if tally is not None:
+                    db_queries.observe(tally.queries)
+                    db_seconds.observe(tally.seconds)
+                stats.in_flight -= 1
+
+        return measured
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """Time every statement `engine` runs and attribute it to the current request"""
+        perf_counter = time.perf_counter
+        lock = self._db_lock
+        self.tracks_queries = True
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _query_started(conn, cursor, statement, parameters, context, executemany):
+            conn.info[_QUERY_STARTED] = perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _query_finished(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop(_QUERY_STARTED, None)
+            if started is None:
+                return
+            elapsed = perf_counter() - started
+            tally = current_tally.get()
+            with lock:
+                self.db_queries += 1
+                self.db_query_seconds.observe(elapsed)
+                if tally is not None:
+                    tally.queries += 1
+                    tally.seconds += elapsed
+
+    def start_loop_monitor(self) -> None:
+        """Start sampling event-loop lag on the running loop"""
+        if self._lag_task is None and settings.metrics_loop_lag_interval_seconds > 0:
+            self._lag_task = asyncio.create_task(self._sample_loop_lag(settings.metrics_loop_lag_interval_seconds))
+
+    async def stop_loop_monitor(self) -> None:
+        if self._lag_task is None:
+            return
+        self._lag_task.cancel()
+        try:
+            await self._lag_task
+        except asyncio.CancelledError:
+            pass
+        self._lag_task = None
+
+    async def _sample_loop_lag(self, interval: float) -> None:
+        # A sleep that oversleeps was kept waiting by callbacks hogging the loop
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - started - interval)
+            self.loop_lag.observe(lag)
+            self.loop_lag_last = lag
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        # Each worker keeps its own counters; label them so series don't mix
+        worker = f'worker="{os.getpid()}"' if multi_worker() else ""
+
+        def labelled(labels: str) -> str:
+            return ",".join(part for part in (worker, labels) if part)
+
+        def header(name: str, kind: str, description: str) -> str:
+            name = f"{PREFIX}_{name}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            return name
+
+        def sample(name: str, value, labels: str = "") -> None:
+            labels = labelled(labels)
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+        # HTTP requests; routes appear once they have been requested
+        routes = [stats for stats in self.routes if stats.in_flight or any(stats.latency.counts)]
+        name = header("http_request_duration_seconds", "histogram", "Time spent in the route, including dependencies")
+        for stats in routes:
+            stats.latency.render(name, labelled(stats.labels), lines)
+        name = header("http_requests_in_flight", "gauge", "Requests currently being handled by the route")
+        for stats in routes:
+            sample(name, stats.in_flight, stats.labels)
+        name = header("http_request_db_queries", "histogram", "Database statements run per request")
+        for stats in routes:
+            stats.db_queries.render(name, labelled(stats.labels), lines)
+        name = header("http_request_db_seconds", "histogram", "Database time per request")
+        for stats in routes:
+            stats.db_seconds.render(name, labelled(stats.labels), lines)
+
+        # Database
+        name = header("db_queries_total", "counter", "Database statements run, in requests or not")
+        sample(name, self.db_queries)
+        name = header("db_query_duration_seconds", "histogram", "Time per database statement")
+        self.db_query_seconds.render(name, labelled(""), lines)
+
+        # WebSockets
+        name = header("websocket_connections", "gauge", "Open WebSocket connections")
+        sample(name, manager.get_connection_count())
+        name = header("websocket_users", "gauge", "Users with at least one open WebSocket connection")
+        sample(name, len(manager.active_connections))
+        name = header("websocket_broadcasts_total", "counter", "Messages broadcast to all connections")
+        sample(name, manager.broadcasts)
+        name = header("websocket_messages_sent_total", "counter", "Messages delivered to individual connections")
+        sample(name, manager.messages_sent)
+        name = header("websocket_send_failures_total", "counter", "Sends that failed and dropped the connection")
+        sample(name, manager.send_failures)
+        if event_relay.enabled:
+            name = header("websocket_relay_messages_total", "counter", "Events relayed between worker processes")
+            sample(name, event_relay.sent, 'direction="sent"')
+            sample(name, event_relay.received, 'direction="received"')
+            sample(name, event_relay.dropped, 'direction="dropped"')
+
+        # Caches
+        name = header("cache_requests_total", "counter", "Cache lookups by result")
+        sample(name, token_cache.hits, 'cache="token",result="hit"')
+        sample(name, token_cache.misses, 'cache="token",result="miss"')
+        lookups = token_cache.hits + token_cache.misses
+        name = header("cache_hit_ratio", "gauge", "Share of cache lookups that hit since startup")
+        sample(name, round(token_cache.hits / lookups, 4) if lookups else 0.0, 'cache="token"')
+
+        # Event loop
+        name = header("event_loop_lag_seconds", "histogram", "How late the event loop woke a sleeping task")
+        self.loop_lag.render(name, labelled(""), lines)
+        name = header("event_loop_lag_last_seconds", "gauge", "Event-loop lag at the last sample")
+        sample(name, round(self.loop_lag_last, 6))
+
+        lines.append("")
+        return "\n".join(lines)
+
+
+# Global metrics registry instance
+metrics = Metrics()
@@ -2,12 +2,17 @@
 SQLAlchemy models for the Kanban board application
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index, JSON, DDL, event, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
 
 
+# Native JSON column: JSONB on PostgreSQL (GIN-indexable), JSON text on SQLite
+JSONValue = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
 class User(Base):
     """User model for authentication and authorization"""
     
@@ -31,6 +36,26 @@ class Task(Base):
     """Task model representing Kanban cards"""
     
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Board columns and the common task list filter combinations
+        Index("ix_tasks_status_priority", "status", "priority_order"),
+        Index("ix_tasks_type_status", "task_type", "status"),
+        # LIKE prefix matches on task_type under a non-C collation (PostgreSQL only)
+        Index(
+            "ix_tasks_type_pattern", "task_type",
+            postgresql_ops={"task_type": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_tasks_owner_status", "owner_id", "status"),
+        Index("ix_tasks_created_at", "created_at"),
+        # Only completed tasks have a completion time
+        Index(
+            "ix_tasks_completed_at", "completed_at",
+            postgresql_where=text("completed_at IS NOT NULL"),
+            sqlite_where=text("completed_at IS NOT NULL"),
+        ),
+        # Deleted tasks keep their history, so their ids must never be reused
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     custom_id = Column(String(6), unique=True, nullable=False, index=True)  # 6-char alphanumeric ID
@@ -53,25 +78,102 @@ class Task(Base):
     
     # Relationships
     owner = relationship("User", back_populates="tasks")
-    # Add relationship to task history with cascade delete
-    history = relationship("TaskHistory", back_populates="task", cascade="all, delete-orphan")
+    # History is kept after the task is deleted so the board can be reconstructed.
+    # Only covers task_history itself: on SQLite, closed months are rolled over
+    # into task_history_YYYYMM tables (see history_partitions.history_sources)
+    history = relationship(
+        "TaskHistory",
+        primaryjoin="Task.id == foreign(TaskHistory.task_id)",
+        back_populates="task",
+        viewonly=True
+    )
+
+
+def task_search_vector():
+    """
+    Weighted tsvector over the searchable task fields (PostgreSQL)
+
+    client_name ranks above address, which ranks above description. The
+    'simple' configuration skips stemming, which suits names and addresses.
+    """
+    def weighted(column, weight):
+        return func.setweight(
+            func.to_tsvector(literal_column("'simple'"), func.coalesce(column, literal_column("''"))),
+            literal_column(f"'{weight}'")
+        )
+
+    return weighted(Task.client_name, "A").op("||")(
+        weighted(Task.address, "B")
+    ).op("||")(
+        weighted(Task.description, "C")
+    )
+
+
+# Full-text search index (PostgreSQL); must match task_search_vector() exactly
+Task.__table__.append_constraint(
+    Index("ix_tasks_search", task_search_vector(), postgresql_using="gin").ddl_if(dialect="postgresql")
+)
+
+# Full-text search on SQLite: an external-content FTS5 table kept in sync by triggers
+TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "client_name, address, description, content='tasks', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, client_name, address, description) "
+    "VALUES (new.id, new.client_name, new.address, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, client_name, address, description) "
+    "VALUES ('delete', old.id, old.client_name, old.address, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF client_name, address, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, client_name, address, description) "
+    "VALUES ('delete', old.id, old.client_name, old.address, old.description); "
+    "INSERT INTO tasks_fts(rowid, client_name, address, description) "
+    "VALUES (new.id, new.client_name, new.address, new.description); END",
+)
+
+for _statement in TASKS_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
 
 
 class TaskHistory(Base):
-    """Track task changes for audit and undo functionality"""
+    """
+    Track task changes for audit and undo functionality
+
+    On PostgreSQL the table is partitioned by month on `timestamp` (see
+    migration 0007 and history_partitions.py). On SQLite it holds the
+    current month, and closed months move to task_history_YYYYMM tables.
+    """
     
     __tablename__ = "task_history"
+    __table_args__ = (
+        # Keyset pagination for per-task, per-user and time-range history queries
+        Index("ix_task_history_task_ts", "task_id", "timestamp", "id"),
+        Index("ix_task_history_user_ts", "user_id", "timestamp", "id"),
+        Index("ix_task_history_ts", "timestamp", "id"),
+        # Containment queries on changed fields (PostgreSQL only)
+        Index(
+            "ix_task_history_new_values", "new_values",
+            postgresql_using="gin",
+            postgresql_ops={"new_values": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    # No foreign key to tasks: entries outlive deleted tasks for replay and undo
+    task_id = Column(Integer, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    action = Column(String(50), nullable=False)  # created, updated, deleted, moved
-    old_values = Column(Text, nullable=True)  # JSON string of old values
-    new_values = Column(Text, nullable=True)  # JSON string of new values
+    action = Column(String(50), nullable=False)  # created, updated, deleted, moved, undone
+    old_values = Column(JSONValue, nullable=True)  # Changed fields before the action
+    new_values = Column(JSONValue, nullable=True)  # Changed fields after the action
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    task = relationship("Task", back_populates="history")
+    task = relationship(
+        "Task",
+        primaryjoin="foreign(TaskHistory.task_id) == Task.id",
+        back_populates="history",
+        viewonly=True
+    )
     user = relationship("User")
 
 
@@ -79,10 +181,16 @@ class UserSession(Base):
     """Track active user sessions for enhanced security"""
     
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # Expired-session cleanup and revocation loading filter on both columns
+        Index("ix_user_sessions_active_expires", "is_active", "expires_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    session_token = Column(String(255), unique=True, index=True, nullable=False)
+    # Fixed-size JWT id (jti claim). The column keeps its original name;
+    # migration 0002 narrows it from the String(255) that held full tokens.
+    token_id = Column("session_token", String(32), unique=True, index=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_activity = Column(DateTime(timezone=True), server_default=func.now())
@@ -91,4 +199,47 @@ class UserSession(Base):
     is_active = Column(Boolean, default=True)
     
     # Relationships
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+
+class AuditLogEntry(Base):
+    """Detached mirror of task history that is kept when tasks are deleted"""
+    
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_task_ts", "task_id", "timestamp"),
+        Index("ix_audit_log_custom_id", "custom_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    # No foreign keys: entries must outlive the tasks and users they refer to
+    task_id = Column(Integer, nullable=False)
+    custom_id = Column(String(6), nullable=True)
+    user_id = Column(Integer, nullable=False)
+    action = Column(String(50), nullable=False)
+    old_values = Column(JSONValue, nullable=True)
+    new_values = Column(JSONValue, nullable=True)
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+
+
+class BoardSnapshot(Base):
+    """Compact copy of the whole board, the starting point for history replay"""
+    
+    __tablename__ = "board_snapshots"
+    
+    id = Column(Integer, primary_key=True)
+    taken_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    task_count = Column(Integer, nullable=False)
+    # {"fields": [...], "tasks": [[task_id, value, ...], ...]}
+    data = Column(JSONValue, nullable=False)
+
+
+class TaskCount(Base):
+    """Number of tasks per (status, task_type, processing) combination"""
+    
+    __tablename__ = "task_counts"
+    
+    status = Column(String(30), primary_key=True)
+    task_type = Column(String(50), primary_key=True)
+    processing = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
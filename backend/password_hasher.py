@@ -0,0 +1,175 @@
+"""
+Dedicated worker pool for bcrypt password hashing and verification
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from .config import settings
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """
+    Password hashing context, built on first use
+
+    passlib and bcrypt are imported here rather than at startup. Hashes
+    whose cost differs from the configured rounds are flagged by
+    verify_and_update and rehashed on the next login.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_desired_rounds=settings.bcrypt_rounds,
+        bcrypt__max_desired_rounds=settings.bcrypt_rounds,
+    )
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is full or a job waited too long"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work on its own size-limited thread pool
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    while keeping password work off FastAPI's shared threadpool. Jobs beyond
+    `max_queue` are rejected immediately, and jobs that cannot finish within
+    `timeout` seconds are cancelled. The context and the worker threads are
+    created by the first job.
+    """
+
+    def __init__(
+        self,
+        context_factory: Callable[[], "CryptContext"],
+        max_workers: int,
+        max_queue: int,
+        timeout: float
+    ):
+        self._context_factory = context_factory
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._pending = 0       # submitted and not yet started
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._rehashed = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def context(self) -> "CryptContext":
+        return self._context_factory()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+            return self._executor
+
+    def _run(self, func: Callable, *args) -> Any:
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._busy_seconds += elapsed
+
+    async def _submit(self, func: Callable, *args) -> Any:
+        with self._lock:
+            if self._pending + self._running >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+
+        future = self._get_executor().submit(self._run, func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                # Never started, so _run will not decrement the queue
+                with self._lock:
+                    self._pending -= 1
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Password hashing job timed out after {self.timeout}s")
+            raise PasswordHasherBusy("Password hashing timed out")
+
+    # The context is resolved on a worker, so the first job imports passlib
+    # off the event loop
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the pool"""
+        return await self._submit(lambda: self.context.hash(password))
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password on the pool
+
+        Returns:
+            (valid, new_hash) - new_hash is set when the stored hash uses
+            outdated cost parameters and should be replaced
+        """
+        valid, new_hash = await self._submit(lambda: self.context.verify_and_update(password, hashed_password))
+        if new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool metrics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._pending,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "rehashed": self._rehashed,
+                "busy_seconds": round(self._busy_seconds, 3),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    get_pwd_context,
+    max_workers=settings.max_concurrent_password_checks,
+    max_queue=settings.password_hash_queue_size,
+    timeout=settings.password_check_wait_seconds,
+)
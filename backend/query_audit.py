@@ -0,0 +1,164 @@
+"""
+Per-request SQL statement auditing for debug and test runs: query budgets,
+slow statement logging and repeated-statement (N+1) detection
+
+Every statement is recorded in the `QueryLog` of the request (or
+`count_queries` block) that ran it, keyed by its shape - the SQL text with
+expanded IN lists collapsed - so a loop issuing the same query per row
+shows up as one shape run many times. Endpoints declare the most
+statements they may run with `@query_budget(n)`; with QUERY_BUDGET_STRICT
+a request over budget fails with a 500 so tests and CI catch the
+regression.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_STARTED = "query_audit_started"
+
+# "(?, ?, ?)" or "(%(id_1_1)s, %(id_1_2)s)": an IN list expanded per value
+_EXPANDED_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s)(?:\s*,\s*(?:\?|%\(\w+\)s))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Longest parameter repr written to the slow statement log
+_MAX_PARAMETERS_LOGGED = 1000
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a `count_queries` block runs more statements than allowed"""
+
+
+def statement_shape(statement: str) -> str:
+    """SQL text with whitespace normalized and expanded IN lists collapsed"""
+    return _EXPANDED_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare the most SQL statements an endpoint may run per request
+
+    Apply below the route decorator. Audited requests over budget are
+    logged, and fail when QUERY_BUDGET_STRICT is on.
+
+    Args:
+        max_queries: Statement limit, including authentication lookups
+    """
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorate
+
+
+class QueryLog:
+    """Statements run by one request or `count_queries` block"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.slow: List[Tuple[float, str]] = []  # (seconds, statement)
+
+    def record(self, statement: str, parameters: Any, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if elapsed * 1000 >= settings.query_slow_ms:
+            self.slow.append((elapsed, statement))
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) in {self.label}: {statement_shape(statement)} "
+                f"parameters={repr(parameters)[:_MAX_PARAMETERS_LOGGED]}"
+            )
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, most frequent first"""
+        threshold = threshold or settings.query_repeat_threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def report_repeats(self) -> None:
+        """Log every shape run often enough to suggest an N+1 pattern"""
+        for shape, count in self.repeated():
+            logger.warning(f"Possible N+1 in {self.label}: {count}x {shape[:300]}")
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+@contextmanager
+def count_queries(max_queries: Optional[int] = None, label: str = "block") -> Iterator[QueryLog]:
+    """
+    Record the statements run inside the block, on this thread or in code
+    it awaits or hands to the threadpool
+
+    A TestClient serves requests on its own thread, outside the block's
+    context; for HTTP calls check the X-Query-Count response header or the
+    endpoint's @query_budget instead.
+
+    Args:
+        max_queries: Raise QueryBudgetExceeded at exit if more ran
+        label: Name used in log messages
+
+    Raises:
+        QueryBudgetExceeded: If `max_queries` was exceeded
+
+    Example:
+        with count_queries(max_queries=1):
+            client_names.load(db)
+    """
+    log = QueryLog(label)
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+    log.report_repeats()
+    if max_queries is not None and log.count > max_queries:
+        raise QueryBudgetExceeded(_budget_message(log, max_queries))
+
+
+def _budget_message(log: QueryLog, budget: int) -> str:
+    top = "; ".join(f"{count}x {shape[:120]}" for shape, count in log.shapes.most_common(3))
+    return f"{log.label} ran {log.count} SQL statements, budget is {budget} (most frequent: {top})"
+
+
+def budget_overrun(log: QueryLog, endpoint: Optional[Callable]) -> Optional[str]:
+    """
+    Check a finished request against its endpoint's `query_budget`
+
+    Returns:
+        A description of the overrun, or None within budget or without one
+    """
+    budget = getattr(endpoint, "query_budget", None)
+    if budget is None or log.count <= budget:
+        return None
+    message = _budget_message(log, budget)
+    logger.warning(f"Query budget exceeded: {message}")
+    return message
+
+
+def install_query_audit(engine: Engine) -> None:
+    """Record `engine`'s statements in the current QueryLog, if any"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement_started(conn, cursor, statement, parameters, context, executemany):
+        if _current_log.get() is not None:
+            conn.info[_STATEMENT_STARTED] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop(_STATEMENT_STARTED, None)
+        log = _current_log.get()
+        if started is not None and log is not None:
+            log.record(statement, parameters, time.perf_counter() - started)
@@ -0,0 +1,128 @@
+"""
+In-process rate limiting and admission control for public endpoints
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from .config import settings
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by (route, client IP)
+
+    Buckets refill lazily on access, so no background work is needed.
+    Memory is bounded by evicting the least recently used bucket once
+    `max_buckets` is reached - an idle bucket has refilled anyway, so
+    dropping it loses nothing.
+    """
+
+    def __init__(self, per_minute: int, burst: int, max_buckets: int = 10000):
+        self.rate = per_minute / 60.0  # tokens per second
+        self.capacity = float(max(burst, 1))
+        self.max_buckets = max_buckets
+        # key -> [tokens, last_refill_monotonic]
+        self._buckets: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Tuple[str, str]) -> Optional[int]:
+        """
+        Take one token from the bucket for `key`
+
+        Args:
+            key: (route, client IP) tuple
+
+        Returns:
+            None if the request is allowed, otherwise the number of
+            seconds the caller should wait before retrying
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return None
+
+            if self.rate <= 0:
+                return 60
+            return max(1, math.ceil((1.0 - bucket[0]) / self.rate))
+
+    def reset(self) -> None:
+        """Drop all buckets"""
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Best-effort client address for rate limiting
+
+    Behind a proxy this is the forwarded client address, which uvicorn
+    substitutes for requests from TRUSTED_PROXY_IPS; otherwise every client
+    would share the proxy's bucket.
+    """
+    if request.client and request.client.host:
+        return request.client.host
+    return "unknown"
+
+
+def rate_limit(limiter: RateLimiter) -> Callable:
+    """
+    Build a FastAPI dependency that enforces `limiter` per route and client IP
+
+    Args:
+        limiter: Rate limiter holding the buckets
+
+    Returns:
+        Dependency raising HTTP 429 with Retry-After when over the limit
+    """
+    async def dependency(request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+
+        route = request.scope.get("route")
+        route_key = getattr(route, "path", request.url.path)
+        retry_after = limiter.acquire((route_key, get_client_ip(request)))
+
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    return dependency
+
+
+# Limiters for unauthenticated endpoints; with several worker processes
+# each one enforces the full limits (see backend/workers.py)
+guest_limiter = RateLimiter(
+    settings.guest_rate_limit_per_minute,
+    settings.guest_rate_limit_burst,
+    settings.rate_limit_max_buckets,
+)
+login_limiter = RateLimiter(
+    settings.login_rate_limit_per_minute,
+    settings.login_rate_limit_burst,
+    settings.rate_limit_max_buckets,
+)
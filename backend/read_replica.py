@@ -0,0 +1,240 @@
+"""
+Read-replica routing for read-only endpoints
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .auth import security, user_for_token, verify_token
+from .config import settings
+from .database import SessionLocal, engine as primary_engine, postgresql_connect_args
+from .db_pool import PoolMetrics, install_pool_events, pool_options
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica's replay is behind the primary; 0 when caught up
+_POSTGRESQL_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Set on successful writes so browsers stay on the primary on every worker
+READ_PRIMARY_COOKIE = "read_primary"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRouter:
+    """
+    Chooses the replica or the primary for each read-only request
+
+    The replica is used while its measured lag is within
+    `max_lag` seconds. Lag is measured at most every `check_interval`
+    seconds by whichever request finds the last measurement stale; a failed
+    measurement sends reads to the primary until the next one. Users who
+    wrote within `pin_seconds` read from the primary, so they always see
+    their own changes.
+    """
+
+    def __init__(self, engine: Optional[Engine], max_lag: float, check_interval: float, pin_seconds: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.pin_seconds = pin_seconds
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine) if engine else None
+
+        self._check_lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._usable = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._pins: Dict[int, float] = {}  # user id -> monotonic deadline
+
+        # Metrics
+        self.replica_reads = 0
+        self.primary_reads = {"pinned": 0, "lagging": 0, "unavailable": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None
+
+    def replica_usable(self) -> bool:
+        """Whether the replica is reachable and within the lag limit"""
+        now = time.monotonic()
+        stale = self._checked_at is None or now - self._checked_at >= self.check_interval
+        # One request measures; the others use the previous result meanwhile
+        if stale and self._check_lock.acquire(blocking=self._checked_at is None):
+            try:
+                self._measure()
+                self._checked_at = time.monotonic()
+            finally:
+                self._check_lock.release()
+        return self._usable
+
+    def _measure(self) -> None:
+        try:
+            with self.engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    lag = float(connection.execute(_POSTGRESQL_LAG).scalar() or 0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            if self._usable or self.last_error is None:
+                logger.warning(f"Read replica unavailable, reading from the primary: {e}")
+            self._usable = False
+            self.lag_seconds = None
+            self.last_error = str(e)
+            return
+
+        if lag > self.max_lag and (self._usable or self.lag_seconds is None):
+            logger.warning(f"Read replica is {lag:.1f}s behind, reading from the primary")
+        self._usable = lag <= self.max_lag
+        self.lag_seconds = round(lag, 3)
+        self.last_error = None
+
+    def pin(self, user_id: int) -> None:
+        """Send `user_id`'s reads to the primary for the next `pin_seconds`"""
+        now = time.monotonic()
+        if len(self._pins) > 1000:
+            self._pins = {user: until for user, until in self._pins.items() if until > now}
+        self._pins[user_id] = now + self.pin_seconds
+
+    def pinned(self, user_id: Optional[int]) -> bool:
+        until = self._pins.get(user_id) if user_id is not None else None
+        return until is not None and until > time.monotonic()
+
+    def session(self, request: Request) -> Session:
+        """A session on the replica, or on the primary when it has to be"""
+        if not self.enabled:
+            return SessionLocal()
+
+        if READ_PRIMARY_COOKIE in request.cookies or self.pinned(_request_user_id(request)):
+            self.primary_reads["pinned"] += 1
+            return SessionLocal()
+
+        if not self.replica_usable():
+            self.primary_reads["unavailable" if self.lag_seconds is None else "lagging"] += 1
+            return SessionLocal()
+
+        self.replica_reads += 1
+        return self.session_factory()
+
+    def pin_writer(self, request: Request, response: Response) -> None:
+        """Keep the author of a successful write on the primary"""
+        user_id = _request_user_id(request)
+        if user_id is not None:
+            self.pin(user_id)
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, "1",
+            max_age=max(1, int(self.pin_seconds)), httponly=True, samesite="lax"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "usable": self._usable,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag,
+            "last_error": self.last_error,
+            "replica_reads": self.replica_reads,
+            "primary_reads": dict(self.primary_reads),
+            "pinned_users": sum(1 for until in self._pins.values() if until > time.monotonic()),
+        }
+
+
+def _request_user_id(request: Request) -> Optional[int]:
+    """User id from the bearer token, without touching the database"""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    token_data = verify_token(token)
+    return token_data.user_id if token_data else None
+
+
+def _create_replica_engine() -> Optional[Engine]:
+    if not settings.read_replica_url:
+        return None
+
+    options = pool_options(replica_pool_metrics)
+    if settings.read_replica_url.startswith("sqlite"):
+        replica = create_engine(settings.read_replica_url, connect_args={"check_same_thread": False}, **options)
+    else:
+        replica = create_engine(settings.read_replica_url, connect_args=postgresql_connect_args(), **options)
+    install_pool_events(replica, replica_pool_metrics)
+    return replica
+
+
+# Global replica pool metrics instance
+replica_pool_metrics = PoolMetrics()
+
+# Global replica router instance (disabled without READ_REPLICA_URL)
+replica_router = ReplicaRouter(
+    _create_replica_engine(),
+    max_lag=settings.read_replica_max_lag_seconds,
+    check_interval=settings.read_replica_check_interval_seconds,
+    pin_seconds=settings.read_your_writes_seconds,
+)
+
+
+def get_read_db(request: Request):
+    """
+    Dependency to get a database session for read-only endpoints
+
+    Yields a replica session when a replica is configured, reachable and
+    caught up, and the caller has not written recently; otherwise a
+    primary session. Never write through it.
+    """
+    db = replica_router.session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_current_read_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_read_db)
+) -> User:
+    """
+    get_current_user for endpoints on get_read_db
+
+    Loads the user through the endpoint's own read session, so a request
+    served by the replica does not also check out a primary connection. A
+    user not yet replicated is looked up on the primary.
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    user = user_for_token(credentials.credentials, db)
+
+    if user is None and db.get_bind() is not primary_engine:
+        primary = SessionLocal()
+        try:
+            user = user_for_token(credentials.credentials, primary)
+        finally:
+            primary.close()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return user
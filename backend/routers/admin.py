@@ -0,0 +1,94 @@
+"""
+Administrative API routes for operational status
+"""
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..audit import audit_writer
+from ..auth import get_admin_user
+from ..config import settings
+from ..database import engine
+from ..db_pool import pool_status
+from ..maintenance import scheduler
+from ..models import User
+from ..read_replica import replica_router
+from ..sqlite_tuning import writer_queue
+from ..startup_profile import startup_profiler
+from ..workers import event_relay, maintenance_leader, worker_count
+
+router = APIRouter()
+
+
+@router.get("/maintenance")
+def get_maintenance_status(current_user: User = Depends(get_admin_user)):
+    """
+    Get the last run report of every maintenance job (admin only)
+    """
+    return {"jobs": scheduler.status()}
+
+
+@router.get("/startup-profile")
+def get_startup_profile(current_user: User = Depends(get_admin_user)):
+    """
+    Get the cold start timeline, startup step durations and, when started
+    with STARTUP_PROFILE=true, the slowest imports (admin only)
+    """
+    return startup_profiler.report()
+
+
+@router.get("/db-pool")
+def get_db_pool_status(current_user: User = Depends(get_admin_user)):
+    """
+    Get connection pool occupancy and checkout wait, overflow and timeout
+    counters of the worker process that served this request, and the read
+    replica's lag and routing counters when one is configured (admin only)
+    """
+    status = pool_status(engine)
+    if engine.dialect.name == "sqlite" and settings.sqlite_single_writer:
+        status["sqlite_writer_queue"] = writer_queue.stats()
+    if replica_router.enabled:
+        status["read_replica"] = dict(replica_router.stats(), pool=pool_status(replica_router.engine))
+    return status
+
+
+@router.get("/worker")
+def get_worker_status(current_user: User = Depends(get_admin_user)):
+    """
+    Get the state of the worker process that served this request (admin only)
+
+    With several workers, repeated calls may reach different processes.
+    """
+    return {
+        "pid": os.getpid(),
+        "workers": worker_count(),
+        "maintenance_leader": maintenance_leader.is_leader,
+        "event_relay": event_relay.stats(),
+    }
+
+
+@router.post("/maintenance/{job_name}/run")
+async def run_maintenance_job(job_name: str, current_user: User = Depends(get_admin_user)):
+    """
+    Run a maintenance job immediately (admin only)
+    """
+    job = scheduler.jobs.get(job_name)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance job not found"
+        )
+
+    await run_in_threadpool(job.run)
+
+    return job.report()
+
+
+@router.get("/audit")
+def get_audit_writer_status(current_user: User = Depends(get_admin_user)):
+    """
+    Get audit writer queue and throughput metrics (admin only)
+    """
+    return audit_writer.stats()
@@ -15,10 +15,14 @@ from ..schemas import (
     UserSessionCreate, UserSessionResponse
 )
 from ..auth import (
-    authenticate_user, create_access_token, get_password_hash,
-    get_current_user
+    authenticate_user, hash_password, issue_session_token,
+    invalidate_user_sessions, revoke_sessions,
+    get_current_user, get_admin_user
 )
+from ..password_hasher import password_hasher
+from ..token_cache import token_cache
 from ..config import settings
+from ..rate_limit import rate_limit, login_limiter
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -44,7 +48,7 @@ def register_user(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = hash_password(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -61,7 +65,7 @@ def register_user(
     return db_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit(login_limiter))])
 def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     request: Request = None,
@@ -81,44 +85,12 @@ def login_for_access_token(
     # Allow both active and inactive users to login
     # Inactive users will be restricted at the endpoint level
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.username, "user_id": user.id},
-        expires_delta=access_token_expires
-    )
-    
-    # Create session record
-    session_token = access_token
-    expires_at = datetime.utcnow() + access_token_expires
-    
-    # Get client info from request
-    user_agent = request.headers.get("User-Agent") if request else None
-    client_host = request.client.host if request and request.client else None
-    
-    # Deactivate any existing sessions for this user
-    db.query(UserSession).filter(
-        UserSession.user_id == user.id,
-        UserSession.is_active == True
-    ).update({"is_active": False})
-    
-    # Create new session
-    session = UserSession(
-        user_id=user.id,
-        session_token=session_token,
-        expires_at=expires_at,
-        user_agent=user_agent,
-        ip_address=client_host,
-        is_active=True
-    )
-    
-    db.add(session)
-    db.commit()
-    db.refresh(session)
+    access_token = issue_session_token(db, user, request)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/login-json", response_model=LoginResponse)
+@router.post("/login-json", response_model=LoginResponse, dependencies=[Depends(rate_limit(login_limiter))])
 def login_json(
     login_data: UserLogin,
     request: Request = None,
@@ -137,39 +109,7 @@ def login_json(
     # Allow both active and inactive users to login
     # Inactive users will be restricted at the endpoint level
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.username, "user_id": user.id},
-        expires_delta=access_token_expires
-    )
-    
-    # Create session record
-    session_token = access_token
-    expires_at = datetime.utcnow() + access_token_expires
-    
-    # Get client info from request
-    user_agent = request.headers.get("User-Agent") if request else None
-    client_host = request.client.host if request and request.client else None
-    
-    # Deactivate any existing sessions for this user
-    db.query(UserSession).filter(
-        UserSession.user_id == user.id,
-        UserSession.is_active == True
-    ).update({"is_active": False})
-    
-    # Create new session
-    session = UserSession(
-        user_id=user.id,
-        session_token=session_token,
-        expires_at=expires_at,
-        user_agent=user_agent,
-        ip_address=client_host,
-        is_active=True
-    )
-    
-    db.add(session)
-    db.commit()
-    db.refresh(session)
+    access_token = issue_session_token(db, user, request)
     
     return {
         "access_token": access_token,
@@ -187,12 +127,7 @@ def logout(
     Logout the current user by deactivating their sessions
     """
     # Deactivate all active sessions for this user
-    db.query(UserSession).filter(
-        UserSession.user_id == current_user.id,
-        UserSession.is_active == True
-    ).update({"is_active": False})
-    
-    db.commit()
+    invalidate_user_sessions(db, current_user.id)
     
     return {"message": "Successfully logged out"}
 
@@ -241,7 +176,7 @@ def delete_session(
             detail="Session not found"
         )
     
-    session.is_active = False
+    revoke_sessions(db, UserSession.id == session.id)
     db.commit()
     
     return {"message": "Session deleted successfully"}
@@ -257,11 +192,23 @@ def refresh_token(
     Refresh the access token
     """
     # Allow both active and inactive users to refresh their tokens
+    # The new token replaces the current session
+    access_token = issue_session_token(db, current_user, request)
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": current_user.username, "user_id": current_user.id},
-        expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/hasher/stats")
+def get_password_hasher_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Get password hashing pool metrics (admin only)
+    """
+    return password_hasher.stats()
+
+
+@router.get("/token-cache/stats")
+def get_token_cache_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Get verified-token cache metrics (admin only)
+    """
+    return token_cache.stats()
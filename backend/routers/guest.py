@@ -5,33 +5,31 @@ No authentication required for these endpoints
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from backend.database import get_db
 from backend.models import Task
+from backend.query_audit import query_budget
+from backend.rate_limit import rate_limit, guest_limiter
+from backend.read_replica import get_read_db
 from typing import Dict
 
 router = APIRouter(
-    tags=["guest"]
+    tags=["guest"],
+    dependencies=[Depends(rate_limit(guest_limiter))]
 )
 
 
 @router.get("/task-status/{custom_id}")
-async def get_task_status(custom_id: str, db: Session = Depends(get_db)) -> Dict[str, str]:
+@query_budget(2)
+async def get_task_status(custom_id: str, db: Session = Depends(get_read_db)) -> Dict[str, str]:
     """
     Get task status for guest users by custom_id
-    No authentication required
+    No authentication required; served from the read replica when configured
     """
-    
-    print(f"DEBUG: Received custom_id: '{custom_id}' (length: {len(custom_id)})")
-    
     # Handle both "RE-XXXXXX" and "XXXXXX" formats
-    original_custom_id = custom_id
     if custom_id.upper().startswith('RE-'):
         custom_id = custom_id[3:]  # Remove "RE-" prefix
-        print(f"DEBUG: Removed RE- prefix. New custom_id: '{custom_id}'")
     
     # Validate custom_id format (should be 6 characters alphanumeric after prefix removal)
     if not custom_id or len(custom_id) != 6:
-        print(f"DEBUG: Invalid format - original: '{original_custom_id}', processed: '{custom_id}', length: {len(custom_id) if custom_id else 0}")
         raise HTTPException(
             status_code=400,
             detail="Invalid task ID format. Please enter a 6-character ID or RE-XXXXXX format."
@@ -39,19 +37,9 @@ async def get_task_status(custom_id: str, db: Session = Depends(get_db)) -> Dict
     
     # Convert to uppercase for consistency
     custom_id = custom_id.upper()
-    print(f"DEBUG: Final uppercase custom_id: '{custom_id}'")
-    
-    # Look up task by custom_id
-    task = db.query(Task).filter(Task.custom_id == custom_id).first()
-    print(f"DEBUG: Task found: {task is not None}")
-    if task:
-        print(f"DEBUG: Task details - ID: {task.id}, Custom ID: {task.custom_id}, Status: {task.status}")
     
-    # Let's also check what tasks exist in the database for debugging
-    all_tasks = db.query(Task).all()
-    print(f"DEBUG: Total tasks in database: {len(all_tasks)}")
-    for t in all_tasks[:5]:  # Show first 5 tasks
-        print(f"DEBUG: Task {t.id}: custom_id='{t.custom_id}', status='{t.status}'")
+    # Look up task by custom_id (unique index); only the status is needed
+    task = db.query(Task.custom_id, Task.status).filter(Task.custom_id == custom_id).first()
     
     if not task:
         raise HTTPException(
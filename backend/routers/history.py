@@ -0,0 +1,232 @@
+"""
+Task history (audit log) API routes
+"""
+
+import base64
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from ..audit import audit_writer, segment_log
+from ..auth import get_current_user
+from ..board_history import board_as_of
+from ..database import get_db
+from ..history_partitions import history_sources, naive_utc
+from ..history_queries import field_transition, validate_field_name
+from ..models import AuditLogEntry, Task, User
+from ..schemas import TaskHistoryPage
+
+router = APIRouter()
+
+
+def encode_cursor(timestamp: datetime, history_id: int) -> str:
+    """Opaque keyset cursor for the position after (timestamp, id)"""
+    raw = f"{timestamp.isoformat()}|{history_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, history_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(history_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/", response_model=TaskHistoryPage)
+def get_history(
+    task_id: Optional[int] = None,
+    custom_id: Optional[str] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    field: Optional[str] = None,
+    from_value: Optional[str] = None,
+    to_value: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get task history, newest first, with keyset pagination
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    `field` with `from_value` and/or `to_value` narrows results to changes of
+    that field, e.g. field=status&to_value=awaiting-documents.
+    Per-task and per-user queries are served by (task_id, timestamp, id) and
+    (user_id, timestamp, id) indexes, so page cost does not grow with the
+    size of the history table. Only the monthly partitions (or SQLite
+    rollover tables) overlapping since/until are visited.
+    """
+    if custom_id:
+        custom_id = custom_id.upper()
+        if custom_id.startswith("RE-"):
+            custom_id = custom_id[3:]
+        task = db.query(Task.id).filter(Task.custom_id == custom_id).first()
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        task_id = task.id
+
+    if field and (from_value is not None or to_value is not None):
+        try:
+            validate_field_name(field)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    cursor_timestamp = cursor_id = None
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+
+    # Rows at exactly the cursor timestamp may still follow it (lower ids)
+    upper = until
+    if cursor_timestamp is not None:
+        after_cursor = cursor_timestamp + timedelta(microseconds=1)
+        if upper is None or naive_utc(after_cursor) < naive_utc(upper):
+            upper = after_cursor
+    dialect_name = db.get_bind().dialect.name
+
+    # Sources are disjoint in time and ordered newest first, so reading them
+    # in turn preserves the global (timestamp, id) order
+    rows = []
+    for source in history_sources(db, since=since, until=upper):
+        query = select(source)
+
+        if task_id is not None:
+            query = query.where(source.c.task_id == task_id)
+        if user_id is not None:
+            query = query.where(source.c.user_id == user_id)
+        if action:
+            query = query.where(source.c.action == action)
+        if since:
+            query = query.where(source.c.timestamp >= since)
+        if until:
+            query = query.where(source.c.timestamp < until)
+        if field and (from_value is not None or to_value is not None):
+            query = query.where(field_transition(
+                field, dialect_name, from_value=from_value, to_value=to_value, table=source
+            ))
+        if cursor:
+            query = query.where(
+                tuple_(source.c.timestamp, source.c.id) < tuple_(cursor_timestamp, cursor_id)
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows.extend(db.execute(query.order_by(
+            source.c.timestamp.desc(),
+            source.c.id.desc()
+        ).limit(limit + 1 - len(rows))).all())
+        if len(rows) > limit:
+            break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+@router.get("/board")
+def get_board_as_of(
+    as_of: datetime,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Reconstruct the board as it was at `as_of`
+
+    Starts from the newest board snapshot taken at or before `as_of` and
+    replays only the history recorded after it.
+    """
+    audit_writer.flush()
+    snapshot_taken_at, replayed, state = board_as_of(db, as_of)
+
+    tasks = [
+        {"id": task_id, **fields}
+        for task_id, fields in state.items()
+        if not status_filter or fields["status"] == status_filter
+    ]
+    tasks.sort(key=lambda task: (task["status"] or "", task["priority_order"] or 0, task["id"]))
+
+    return {
+        "as_of": as_of,
+        "snapshot_taken_at": snapshot_taken_at,
+        "replayed": replayed,
+        "tasks": tasks,
+    }
+
+
+@router.get("/archive")
+def get_archived_history(
+    task_id: Optional[int] = None,
+    custom_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get entries from the append-only audit archive, newest first
+
+    Unlike task_history, the archive keeps entries past the history
+    retention window and can be looked up by the custom_id of a task that
+    no longer exists.
+    """
+    if custom_id:
+        custom_id = custom_id.upper()
+        if custom_id.startswith("RE-"):
+            custom_id = custom_id[3:]
+
+    # The mirror table outlives the local segment files on ephemeral disks
+    if segment_log is not None and not audit_writer.mirror_table:
+        newest = segment_log.query(task_id=task_id, custom_id=custom_id, since=since, until=until, newest_first=True)
+        return {"items": list(islice(newest, limit))}
+
+    query = db.query(AuditLogEntry)
+    if task_id is not None:
+        query = query.filter(AuditLogEntry.task_id == task_id)
+    if custom_id:
+        query = query.filter(AuditLogEntry.custom_id == custom_id)
+    if since:
+        query = query.filter(AuditLogEntry.timestamp >= since)
+    if until:
+        query = query.filter(AuditLogEntry.timestamp < until)
+
+    rows = query.order_by(AuditLogEntry.timestamp.desc(), AuditLogEntry.id.desc()).limit(limit).all()
+    return {"items": [
+        {
+            "task_id": row.task_id,
+            "custom_id": row.custom_id,
+            "user_id": row.user_id,
+            "action": row.action,
+            "old_values": row.old_values,
+            "new_values": row.new_values,
+            "timestamp": row.timestamp,
+        }
+        for row in rows
+    ]}
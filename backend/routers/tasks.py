@@ -2,49 +2,287 @@
 Task management API routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, exists
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-from ..database import get_db
+from ..database import SessionLocal, get_db
 from ..models import Task, User, TaskHistory
-from ..schemas import TaskCreate, TaskResponse, TaskUpdate
-from ..auth import get_current_user
+from ..query_audit import query_budget
+from ..read_replica import get_current_read_user, get_read_db
+from ..schemas import TaskCreate, TaskResponse, TaskUpdate, TokenData
+from ..auth import get_current_user, get_token_data
+from ..client_names import client_names, stage_client_name_change
+from ..task_counts import count_key, stage_count_changes, task_counters
 from ..websocket_manager import manager
 from ..utils import generate_unique_custom_id
+from ..audit import audit_writer
+from ..search import search_tasks
+from ..board_history import (
+    BOARD_FIELDS, DELETE_ACTIONS, UNDO_ACTION, board_fields, recorded_completed_at, state_before,
+    task_entries, undo_target, undo_values
+)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TaskResponse])
+@router.get("/", response_model=List[TaskResponse], response_class=ORJSONResponse)
+@query_budget(3)
 def get_tasks(
     status: Optional[str] = None,
+    task_type: Optional[str] = None,
+    processing: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    completed_after: Optional[datetime] = None,
+    completed_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    include: str = "owner",
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_read_user)
 ):
     """
     Get all tasks (visible to all users)
+    
+    A `task_type` ending in "*" matches by prefix, e.g. "Misc - *" returns
+    every custom Misc type. Date ranges include the lower bound and exclude
+    the upper one.
+    
+    `fields` is a comma-separated list of task fields to return (`id` is
+    always included) and `include=owner` adds the owner; pass an empty
+    `include` to skip the owner join.
+    
+    Rows are selected as plain tuples, shaped into dicts and encoded with
+    orjson, bypassing ORM loading and per-row TaskResponse validation.
+    Reads go to the read replica when one is configured.
     """
-    query = db.query(Task).options(joinedload(Task.owner))
+    columns, include_owner = parse_projection(fields, include)
+    query = projection_query(db, columns, include_owner)
     
     if status:
         query = query.filter(Task.status == status)
+    if task_type:
+        query = query.filter(task_type_filter(task_type, db.get_bind().dialect.name))
+    if processing:
+        query = query.filter(Task.processing == processing)
+    if owner_id is not None:
+        query = query.filter(Task.owner_id == owner_id)
+    if created_after:
+        query = query.filter(Task.created_at >= created_after)
+    if created_before:
+        query = query.filter(Task.created_at < created_before)
+    if completed_after:
+        query = query.filter(Task.completed_at >= completed_after)
+    if completed_before:
+        query = query.filter(Task.completed_at < completed_before)
     
     # Order by expedited first, then by priority_order, then by creation time
-    tasks = query.order_by(
+    rows = query.order_by(
         Task.processing == "expedited", 
         Task.priority_order.asc(),
         Task.created_at.asc()
     ).limit(limit).offset(offset).all()
     
+    return ORJSONResponse(projected_tasks(rows, columns, include_owner))
+
+
+# Fields a projection may select; owner is requested through `include`
+TASK_FIELDS = tuple(name for name in TaskResponse.model_fields if name != "owner")
+
+# Related records a projection may include
+TASK_INCLUDES = ("owner",)
+
+
+def parse_projection(fields: Optional[str], include: str) -> Tuple[Optional[List[str]], bool]:
+    """
+    Validate the `fields` and `include` query parameters
+    
+    Returns:
+        (task fields to select, or None for all of them; whether to include the owner)
+    
+    Raises:
+        HTTPException: 400 if an unknown field or include is requested
+    """
+    includes = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = includes.difference(TASK_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    
+    if fields is None:
+        return None, "owner" in includes
+    
+    columns = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in columns:
+            continue
+        if name not in TASK_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown task field: {name}"
+            )
+        columns.append(name)
+    
+    return columns, "owner" in includes
+
+
+def projection_query(db: Session, columns: Optional[List[str]], include_owner: bool):
+    """
+    Query on Task that selects only the requested columns
+    
+    Rows come back as plain tuples, so no Task objects are built or
+    tracked by the session. Filter and order it like a query on Task,
+    then shape the rows with projected_tasks.
+    
+    Args:
+        db: Database session
+        columns: Task fields to select, or None for all of them
+        include_owner: Whether to join the owner's id, username and full name
+    """
+    entities = [getattr(Task, name) for name in columns or TASK_FIELDS]
+    if not include_owner:
+        return db.query(*entities).select_from(Task)
+    
+    entities += [User.id, User.username, User.full_name]
+    return db.query(*entities).select_from(Task).outerjoin(Task.owner)
+
+
+def projected_tasks(rows, columns: Optional[List[str]], include_owner: bool) -> List[dict]:
+    """
+    Shape rows from projection_query into task dicts with just the requested keys
+    """
+    columns = columns or TASK_FIELDS
+    width = len(columns)
+    tasks = []
+    for row in rows:
+        task = dict(zip(columns, row))
+        if include_owner:
+            owner_id, username, full_name = row[width:]
+            task["owner"] = {
+                "id": owner_id, "username": username, "full_name": full_name
+            } if owner_id is not None else None
+        tasks.append(task)
+    
     return tasks
 
 
+def task_type_filter(task_type: str, dialect: str):
+    """
+    Exact task type match, or a prefix match when `task_type` ends in "*"
+
+    On PostgreSQL a prefix becomes `LIKE :prefix || '%'`, served by the
+    text_pattern_ops index ix_tasks_type_pattern; a half-open range would
+    follow the database collation, which under e.g. en_US.UTF-8 does not
+    order strings by code point. SQLite compares task_type bytewise, so
+    there the prefix becomes the range [prefix, prefix + 1) on
+    ix_tasks_type_status (its LIKE is case-insensitive and skips the index).
+    """
+    if not task_type.endswith("*"):
+        return Task.task_type == task_type
+
+    prefix = task_type[:-1]
+    if not prefix:
+        return Task.task_type.isnot(None)
+    if dialect == "postgresql":
+        return Task.task_type.startswith(prefix, autoescape=True)
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(Task.task_type >= prefix, Task.task_type < upper)
+
+
+@router.get("/search", response_model=List[TaskResponse])
+@query_budget(3)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[str] = None,
+    task_type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_read_user)
+):
+    """
+    Search tasks by client name, address and description
+
+    Every word in `q` is matched as a prefix and results are ranked by
+    relevance, with client name matches first.
+    """
+    return search_tasks(db, q, status=status, task_type=task_type, limit=limit)
+
+
+@router.get("/client-names")
+@query_budget(2)
+async def suggest_client_names(
+    q: str = Query("", max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    token: TokenData = Depends(get_token_data)
+):
+    """
+    Autocomplete client names, most frequently used first
+
+    Served from the in-memory typeahead index; only the bearer token is
+    checked, so keystroke requests never reach the database.
+    """
+    if not client_names.loaded:
+        await run_in_threadpool(_load_client_names)
+
+    return [
+        {"client_name": name, "count": count}
+        for name, count in client_names.suggest(q, limit)
+    ]
+
+
+def _load_client_names() -> None:
+    db = SessionLocal()
+    try:
+        client_names.load(db)
+    finally:
+        db.close()
+
+
+@router.get("/counts")
+@query_budget(2)
+async def get_task_counts(
+    token: TokenData = Depends(get_token_data)
+):
+    """
+    Number of tasks per status, task type and processing speed
+
+    Served from the in-memory counters without touching the database.
+    """
+    if not task_counters.loaded:
+        await run_in_threadpool(_load_task_counters)
+
+    return task_counters.snapshot()
+
+
+def _load_task_counters() -> None:
+    db = SessionLocal()
+    try:
+        task_counters.load(db)
+    finally:
+        db.close()
+
+
+def column_size(db: Session, status: str) -> int:
+    """Number of tasks in a board column, from the live counters"""
+    if not task_counters.loaded:
+        task_counters.load(db)
+    return task_counters.count(status=status)
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(
+@query_budget(8)
+def create_task(
     task: TaskCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -65,10 +303,8 @@ async def create_task(
     # Get task data and ensure defaults are set
     task_data = task.dict()
     
-    # Count existing tasks in the same column for priority ordering
-    task_count = db.query(Task).filter(
-        Task.status == task_data.get('status', 'todo')
-    ).count()
+    # New tasks go to the bottom of their column
+    task_count = column_size(db, task_data.get('status', 'todo'))
     
     # Create new task with explicit field assignment to avoid dict unpacking issues
     db_task = Task(
@@ -84,24 +320,21 @@ async def create_task(
     )
     
     db.add(db_task)
+    db.flush()
+    task_id = db_task.id
     db.commit()
-    db.refresh(db_task)
     
-    # Load the task with owner relationship
-    db_task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == db_task.id).first()
+    # Reload the task with its owner in one query (the commit expired it)
+    db_task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == task_id).first()
     
     # Log task creation
     log_task_action(
         db=db,
         task_id=db_task.id,
+        custom_id=db_task.custom_id,
         user_id=current_user.id,
         action="created",
-        new_values={
-            "client_name": db_task.client_name,
-            "task_type": db_task.task_type,
-            "status": db_task.status,
-            "processing": db_task.processing
-        }
+        new_values=board_fields(db_task)
     )
     
     # Broadcast task creation to all connected users
@@ -125,7 +358,7 @@ async def create_task(
         } if db_task.owner else None
     }
     
-    await manager.broadcast_task_event(
+    manager.broadcast_task_event_from_thread(
         "task_created",
         task_data,
         user_id=current_user.id,
@@ -136,7 +369,8 @@ async def create_task(
 
 
 @router.delete("/clear-done")
-async def clear_done_tasks(
+@query_budget(5)
+def clear_done_tasks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -156,31 +390,34 @@ async def clear_done_tasks(
     if not done_tasks:
         return {"message": "No completed tasks to clear", "deleted_count": 0, "type": "warning"}
     
-    # Log each task deletion for history
-    for task in done_tasks:
-        task_info = {
-            "client_name": task.client_name,
-            "task_type": task.task_type,
-            "status": task.status,
-            "processing": task.processing
-        }
-        
-        log_task_action(
-            db=db,
+    # Read what the delete needs before a durable history commit expires the tasks
+    deleted_count = len(done_tasks)
+    deleted_task_ids = [task.id for task in done_tasks]
+    deleted_client_names = [task.client_name for task in done_tasks]
+    count_keys = [count_key(task) for task in done_tasks]
+    
+    # Log each task deletion for history, written together
+    audit_writer.record_many(db, [
+        task_history_row(
             task_id=task.id,
+            custom_id=task.custom_id,
             user_id=current_user.id,
             action="deleted_via_clear",
-            old_values=task_info
+            old_values=undo_values(task)
         )
+        for task in done_tasks
+    ])
     
     # Delete all done tasks
-    deleted_count = len(done_tasks)
-    deleted_task_ids = [task.id for task in done_tasks]
+    for client_name in deleted_client_names:
+        # The bulk delete below bypasses the ORM events
+        stage_client_name_change(db, client_name, None)
+    stage_count_changes(db, [(key, None) for key in count_keys])
     db.query(Task).filter(Task.status == "done").delete()
     db.commit()
     
     # Broadcast task clearing to all connected users
-    await manager.broadcast_task_event(
+    manager.broadcast_task_event_from_thread(
         "tasks_cleared",
         {"deleted_task_ids": deleted_task_ids, "count": deleted_count},
         user_id=current_user.id,
@@ -191,26 +428,43 @@ async def clear_done_tasks(
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
+@query_budget(3)
 def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    fields: Optional[str] = None,
+    include: str = "owner",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_read_user)
 ):
     """
     Get a specific task by ID (visible to all users)
+    
+    Accepts the same `fields` and `include` projection as the task list,
+    and reads from the replica like it.
     """
-    task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == task_id).first()
+    columns, include_owner = parse_projection(fields, include)
+    sparse = columns is not None or not include_owner
+    if sparse:
+        query = projection_query(db, columns, include_owner)
+    else:
+        query = db.query(Task).options(joinedload(Task.owner))
+    
+    task = query.filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
+    if sparse:
+        return ORJSONResponse(projected_tasks([task], columns, include_owner)[0])
+    
     return task
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
-async def update_task(
+@query_budget(6)
+def update_task(
     task_id: int,
     task_update: TaskUpdate,
     db: Session = Depends(get_db),
@@ -233,15 +487,8 @@ async def update_task(
             detail="Task not found"
         )
     
-    # Store old values for history
-    old_values = {
-        "client_name": task.client_name,
-        "task_type": task.task_type,
-        "address": task.address,
-        "processing": task.processing,
-        "status": task.status,
-        "description": task.description
-    }
+    # Store old values for history (all of them, so undo can restore any field)
+    old_values = undo_values(task)
     
     # Update task with provided fields
     update_data = task_update.dict(exclude_unset=True)
@@ -264,6 +511,7 @@ async def update_task(
     log_task_action(
         db=db,
         task_id=task.id,
+        custom_id=task.custom_id,
         user_id=current_user.id,
         action="updated",
         old_values=old_values,
@@ -292,7 +540,7 @@ async def update_task(
         } if task.owner else None
     }
     
-    await manager.broadcast_task_event(
+    manager.broadcast_task_event_from_thread(
         "task_updated",
         task_data,
         user_id=current_user.id,
@@ -303,7 +551,8 @@ async def update_task(
 
 
 @router.delete("/{task_id}")
-async def delete_task(
+@query_budget(6)
+def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -337,9 +586,10 @@ async def delete_task(
     log_task_action(
         db=db,
         task_id=task.id,
+        custom_id=task.custom_id,
         user_id=current_user.id,
         action="deleted",
-        old_values=task_info
+        old_values=undo_values(task)
     )
     
     db.delete(task)
@@ -354,7 +604,7 @@ async def delete_task(
         "processing": task_info["processing"]
     }
     
-    await manager.broadcast_task_event(
+    manager.broadcast_task_event_from_thread(
         "task_deleted",
         task_data,
         user_id=current_user.id,
@@ -365,7 +615,8 @@ async def delete_task(
 
 
 @router.post("/{task_id}/move")
-async def move_task(
+@query_budget(6)
+def move_task(
     task_id: int,
     new_status: str,
     new_priority: Optional[int] = None,
@@ -391,6 +642,7 @@ async def move_task(
     
     old_status = task.status
     old_priority = task.priority_order
+    old_completed_at = task.completed_at
     
     # Update task status
     task.status = new_status
@@ -407,10 +659,9 @@ async def move_task(
         task.priority_order = new_priority
     else:
         # Auto-assign priority based on column
-        max_priority = db.query(Task).filter(
-            Task.status == new_status,
-            Task.id != task_id
-        ).count()
+        max_priority = column_size(db, new_status)
+        if old_status == new_status:
+            max_priority -= 1
         task.priority_order = max_priority
     
     db.commit()
@@ -420,9 +671,10 @@ async def move_task(
     log_task_action(
         db=db,
         task_id=task.id,
+        custom_id=task.custom_id,
         user_id=current_user.id,
         action="moved",
-        old_values={"status": old_status, "priority_order": old_priority},
+        old_values={"status": old_status, "priority_order": old_priority, "completed_at": old_completed_at},
         new_values={"status": new_status, "priority_order": task.priority_order}
     )
     
@@ -448,7 +700,7 @@ async def move_task(
         } if task.owner else None
     }
     
-    await manager.broadcast_task_event(
+    manager.broadcast_task_event_from_thread(
         "task_moved",
         task_data,
         user_id=current_user.id,
@@ -458,29 +710,197 @@ async def move_task(
     return {"message": "Task moved successfully", "task": task}
 
 
+@router.post("/{task_id}/undo")
+@query_budget(8)
+def undo_task_change(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Undo the most recent change to a task (only for active users)
+
+    Updates and moves are reverted field by field, a creation is undone by
+    deleting the task and a deletion by restoring it with its original id.
+    Calling undo again steps further back through the task's history.
+    """
+    # Check if user is active
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive users cannot modify tasks"
+        )
+
+    # A durable history write commits and expires the user, so read it once here
+    user_id, username = current_user.id, current_user.username
+
+    # Make sure the latest changes have reached the history table
+    audit_writer.flush()
+
+    entries = task_entries(db, task_id)
+    target = undo_target(entries)
+    if target is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No changes to undo for this task"
+        )
+
+    task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == task_id).first()
+    recorded = target.old_values or {}
+
+    if target.action in DELETE_ACTIONS:
+        if task:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Task already exists"
+            )
+
+        # Rebuild the deleted task from its earlier history and the deletion entry
+        restored = dict.fromkeys(BOARD_FIELDS)
+        restored.update(state_before(entries, target) or {})
+        restored.update({k: v for k, v in recorded.items() if k in BOARD_FIELDS})
+
+        # Check the custom id and the owner in one statement
+        custom_id_taken, owner_exists = db.query(
+            exists().where(Task.custom_id == restored["custom_id"]),
+            exists().where(User.id == restored["owner_id"])
+        ).one()
+        if not restored["custom_id"] or custom_id_taken:
+            restored["custom_id"] = generate_unique_custom_id(db)
+        if not owner_exists:
+            restored["owner_id"] = user_id
+        if restored["client_name"] is None or restored["task_type"] is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Not enough history to restore this task"
+            )
+
+        task = Task(id=task_id, **{k: v for k, v in restored.items() if v is not None})
+        if task.status == "done":
+            # Entries recorded before completion times were kept fall back to now
+            task.completed_at = recorded_completed_at(recorded) or datetime.utcnow()
+        db.add(task)
+        db.commit()
+
+        task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == task_id).first()
+        task_data = jsonable_encoder(TaskResponse.model_validate(task))
+        log_task_action(
+            db=db,
+            task_id=task_id,
+            custom_id=task_data["custom_id"],
+            user_id=user_id,
+            action=UNDO_ACTION,
+            new_values=board_fields(task)
+        )
+        manager.broadcast_task_event_from_thread(
+            "task_created",
+            task_data,
+            user_id=user_id,
+            exclude_user=username
+        )
+        return {"message": "Task deletion undone", "task": task_data}
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    if target.action == "created":
+        old_values = undo_values(task)
+        db.delete(task)
+        db.commit()
+
+        log_task_action(
+            db=db,
+            task_id=task_id,
+            custom_id=old_values["custom_id"],
+            user_id=user_id,
+            action=UNDO_ACTION,
+            old_values=old_values
+        )
+        manager.broadcast_task_event_from_thread(
+            "task_deleted",
+            {"id": task_id, **{k: old_values[k] for k in ("client_name", "task_type", "status", "processing")}},
+            user_id=user_id,
+            exclude_user=username
+        )
+        return {"message": "Task creation undone"}
+
+    # Updates and moves: restore the previous value of every changed field
+    # that the entry recorded
+    reverted = {
+        k: recorded[k]
+        for k in (target.new_values or {})
+        if k in BOARD_FIELDS and k in recorded
+    }
+    current_values = {k: getattr(task, k) for k in reverted}
+    for field, value in reverted.items():
+        setattr(task, field, value)
+
+    task.updated_at = datetime.utcnow()
+    if "status" in reverted:
+        if "completed_at" in recorded:
+            task.completed_at = recorded_completed_at(recorded)
+        else:
+            task.completed_at = datetime.utcnow() if reverted["status"] == "done" else None
+
+    db.commit()
+
+    task = db.query(Task).options(joinedload(Task.owner)).filter(Task.id == task_id).first()
+    task_data = jsonable_encoder(TaskResponse.model_validate(task))
+    log_task_action(
+        db=db,
+        task_id=task_id,
+        custom_id=task_data["custom_id"],
+        user_id=user_id,
+        action=UNDO_ACTION,
+        old_values=current_values,
+        new_values=reverted
+    )
+    manager.broadcast_task_event_from_thread(
+        "task_updated",
+        task_data,
+        user_id=user_id,
+        exclude_user=username
+    )
+
+    return {"message": f"Task {target.action} change undone", "task": task_data}
+
+
+def task_history_row(
+    task_id: int,
+    user_id: int,
+    action: str,
+    old_values: dict = None,
+    new_values: dict = None,
+    custom_id: Optional[str] = None
+) -> dict:
+    """Column values of one task history entry"""
+    return {
+        "task_id": task_id,
+        "custom_id": custom_id,
+        "user_id": user_id,
+        "action": action,
+        "old_values": jsonable_encoder(old_values) if old_values else None,
+        "new_values": jsonable_encoder(new_values) if new_values else None,
+        "timestamp": datetime.utcnow()
+    }
+
+
 def log_task_action(
     db: Session,
     task_id: int,
     user_id: int,
     action: str,
     old_values: dict = None,
-    new_values: dict = None
+    new_values: dict = None,
+    custom_id: Optional[str] = None
 ):
     """
     Log a task action to the history table
-    """
-    import json
-    
-    history_entry = TaskHistory(
-        task_id=task_id,
-        user_id=user_id,
-        action=action,
-        old_values=json.dumps(old_values) if old_values else None,
-        new_values=json.dumps(new_values) if new_values else None
-    )
     
-    db.add(history_entry)
-    db.commit()
-    db.refresh(history_entry)
-    
-    return history_entry
\ No newline at end of file
+    The entry is handed to the background audit writer, so the request does
+    not wait for the history insert (unless AUDIT_DURABLE is enabled).
+    """
+    audit_writer.record(db, task_history_row(task_id, user_id, action, old_values, new_values, custom_id))
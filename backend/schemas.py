@@ -3,7 +3,7 @@ Pydantic schemas for API request/response models
 """
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -128,6 +128,7 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
     user_id: Optional[int] = None
+    token_id: Optional[str] = None
 
 
 class LoginResponse(BaseModel):
@@ -142,8 +143,8 @@ class TaskHistoryBase(BaseModel):
     task_id: int
     user_id: int
     action: str
-    old_values: Optional[str] = None
-    new_values: Optional[str] = None
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
 
 
 class TaskHistoryCreate(TaskHistoryBase):
@@ -158,11 +159,16 @@ class TaskHistoryResponse(TaskHistoryBase):
         from_attributes = True
 
 
+class TaskHistoryPage(BaseModel):
+    items: List[TaskHistoryResponse]
+    next_cursor: Optional[str] = None
+
+
 # ===== SESSION SCHEMAS =====
 
 class UserSessionBase(BaseModel):
     user_id: int
-    session_token: str
+    token_id: str
     expires_at: datetime
     user_agent: Optional[str] = None
     ip_address: Optional[str] = None
@@ -0,0 +1,109 @@
+"""
+Full-text search over task client name, address and description
+
+PostgreSQL matches against task_search_vector() through the ix_tasks_search
+GIN index and ranks with ts_rank. SQLite uses the tasks_fts FTS5 table and
+ranks with bm25. Every search term is a prefix, so "smi rea" finds
+"Smith Realty".
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.orm import Session, joinedload
+
+from .models import Task, task_search_vector
+
+# Upper bound on terms per query, to keep query plans small
+MAX_TERMS = 8
+
+# Candidates ranked per requested result when status/type filters apply
+FILTER_WINDOW = 10
+
+# bm25 column weights for client_name, address, description
+_FTS_WEIGHTS = "10.0, 5.0, 1.0"
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a user query into lowercase word terms"""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def search_tasks(
+    db: Session,
+    query: str,
+    status: Optional[str] = None,
+    task_type: Optional[str] = None,
+    limit: int = 20
+) -> List[Task]:
+    """
+    Find tasks matching every term of `query`, best match first
+
+    Args:
+        db: Database session
+        query: Free text; each word is matched as a prefix
+        status: Only return tasks in this column
+        task_type: Only return tasks of this type
+        limit: Maximum number of results
+
+    Returns:
+        Matching tasks with their owner loaded, ordered by relevance
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+        vector = task_search_vector()
+        rank = func.ts_rank(vector, tsquery)
+        results = _filtered(db.query(Task).filter(vector.op("@@")(tsquery)), status, task_type)
+        return results.options(joinedload(Task.owner)).order_by(rank.desc(), Task.id.desc()).limit(limit).all()
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    filtered = bool(status or task_type)
+
+    # Rank inside FTS5 and keep only the best candidates, so the join with
+    # tasks touches a handful of rows. Filters get a wider window and fall
+    # back to ranking every match if the window runs dry.
+    window = limit * FILTER_WINDOW if filtered else limit
+    tasks = _fts_search(db, match, status, task_type, limit, window)
+    if filtered and len(tasks) < limit:
+        tasks = _fts_search(db, match, status, task_type, limit, None)
+    return tasks
+
+
+def _filtered(results, status: Optional[str], task_type: Optional[str]):
+    if status:
+        results = results.filter(Task.status == status)
+    if task_type:
+        results = results.filter(Task.task_type == task_type)
+    return results
+
+
+def _fts_search(
+    db: Session,
+    match: str,
+    status: Optional[str],
+    task_type: Optional[str],
+    limit: int,
+    window: Optional[int]
+) -> List[Task]:
+    """SQLite search through tasks_fts, ranking at most `window` candidates"""
+    # bm25 scores are negative; lower is better
+    rank = literal_column(f"bm25(tasks_fts, {_FTS_WEIGHTS})")
+    ranked = select(
+        literal_column("rowid").label("task_id"),
+        rank.label("rank")
+    ).select_from(text("tasks_fts")).where(
+        text("tasks_fts MATCH :match").bindparams(match=match)
+    )
+    if window is not None:
+        ranked = ranked.order_by(rank).limit(window)
+    ranked = ranked.subquery()
+
+    results = _filtered(db.query(Task).join(ranked, Task.id == ranked.c.task_id), status, task_type)
+    return results.options(joinedload(Task.owner)).order_by(
+        ranked.c.rank.asc(), Task.id.desc()
+    ).limit(limit).all()
@@ -0,0 +1,108 @@
+"""
+Production server launcher: uvicorn workers with optional graceful recycling
+"""
+
+import functools
+import importlib.util
+import logging
+import os
+import random
+import shutil
+from typing import List, Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from .config import settings
+from .workers import runtime_dir
+
+logger = logging.getLogger(__name__)
+
+APP = "backend.main:app"
+
+
+def resolve_implementation(choice: str, fast: str, fallback: str) -> str:
+    """
+    Pick the event loop or HTTP parser implementation
+
+    Args:
+        choice: Configured value; "auto" prefers `fast` when it is installed
+        fast: Optional accelerated implementation, e.g. "uvloop"
+        fallback: Pure-Python implementation, e.g. "asyncio"
+
+    Returns:
+        Implementation name understood by uvicorn
+    """
+    if choice != "auto":
+        return choice
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def build_config(host: str, port: int, reload: bool = False) -> uvicorn.Config:
+    """
+    uvicorn configuration from the WEB_* settings, shared by the production
+    launcher and the development runner
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        reload: Restart on code changes (development only)
+    """
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        reload=reload,
+        workers=settings.web_workers,
+        loop=resolve_implementation(settings.web_loop, "uvloop", "asyncio"),
+        http=resolve_implementation(settings.web_http, "httptools", "h11"),
+        limit_max_requests=settings.web_max_requests or None,
+        timeout_graceful_shutdown=settings.web_graceful_timeout_seconds,
+        # Client addresses (rate limits, logs) come from X-Forwarded-For sent by these proxies
+        proxy_headers=True,
+        forwarded_allow_ips=settings.trusted_proxy_ips,
+        log_level="info",
+    )
+
+
+def _serve_worker(config: uvicorn.Config, jitter: int, sockets: Optional[List] = None) -> None:
+    """Worker process entry point; each worker draws its own recycle jitter"""
+    if config.limit_max_requests and jitter:
+        config.limit_max_requests += random.randint(0, jitter)
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def serve(host: str, port: int) -> None:
+    """
+    Run the application until interrupted
+
+    A single worker without recycling runs in this process. Otherwise this
+    process binds the socket and supervises the workers: a worker that has
+    served WEB_MAX_REQUESTS requests finishes its in-flight requests and
+    exits, and the supervisor starts a fresh one while the others (or the
+    socket backlog, with one worker) keep accepting connections.
+    """
+    config = build_config(host, port)
+    print(
+        f"⚙️  {settings.web_workers} worker(s), loop={config.loop}, http={config.http}, "
+        f"max requests per worker={settings.web_max_requests or 'unlimited'}"
+    )
+
+    if settings.web_workers <= 1 and not settings.web_max_requests:
+        uvicorn.Server(config).run()
+        return
+
+    if settings.web_workers > 1 and settings.database_url.startswith("sqlite"):
+        logger.warning("Several workers share a SQLite database; writes from different workers will wait on each other")
+
+    # Migrate once here so the workers don't race to upgrade the schema
+    from .database import engine, upgrade_schema
+    upgrade_schema()
+    engine.dispose()
+
+    target = functools.partial(_serve_worker, config, settings.web_max_requests_jitter)
+    try:
+        Multiprocess(config, target=target, sockets=[config.bind_socket()]).run()
+    finally:
+        # Relay sockets and the maintenance lock of this server's workers
+        shutil.rmtree(runtime_dir(os.getpid()), ignore_errors=True)
@@ -0,0 +1,124 @@
+"""
+In-memory revocation set for session token ids (JWT `jti` claims)
+"""
+
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import UserSession
+from .token_cache import token_cache
+
+logger = logging.getLogger(__name__)
+
+
+def new_token_id() -> str:
+    """Generate a fixed-size (32 hex chars) token id for the `jti` claim"""
+    return secrets.token_hex(16)
+
+
+def _to_epoch(value: datetime) -> float:
+    # Sessions are stored as naive UTC datetimes
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevokedTokens:
+    """
+    Token ids whose session was deactivated before the token expired
+
+    Mirrors `user_sessions` rows with is_active = False and expires_at in the
+    future, so request authentication can check revocation without touching
+    the database. Entries are dropped once the token would have expired
+    anyway, which keeps the set as small as the number of revoked-but-live
+    tokens.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}  # token id -> expiry (epoch seconds)
+        self._lock = threading.Lock()
+
+    def __contains__(self, token_id: str) -> bool:
+        expires = self._revoked.get(token_id)
+        if expires is None:
+            return False
+        if expires <= time.time():
+            with self._lock:
+                self._revoked.pop(token_id, None)
+            return False
+        return True
+
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        """Mark a token id as revoked until its expiry"""
+        with self._lock:
+            self._revoked[token_id] = _to_epoch(expires_at)
+        token_cache.discard_token_id(token_id)
+
+    def purge_expired(self) -> int:
+        """Drop entries for tokens that have expired; returns number dropped"""
+        now = time.time()
+        with self._lock:
+            expired = [token_id for token_id, expires in self._revoked.items() if expires <= now]
+            for token_id in expired:
+                del self._revoked[token_id]
+        return len(expired)
+
+    def load(self, db: Session) -> int:
+        """
+        Rebuild the set from the user_sessions table
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of revoked token ids loaded
+        """
+        rows = db.query(UserSession.token_id, UserSession.expires_at).filter(
+            UserSession.is_active == False,
+            UserSession.expires_at > datetime.utcnow()
+        ).all()
+
+        with self._lock:
+            self._revoked = {token_id: _to_epoch(expires_at) for token_id, expires_at in rows}
+
+        logger.info(f"Loaded {len(rows)} revoked session token ids")
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# Global revocation set instance
+revoked_tokens = RevokedTokens()
+
+
+_PENDING_REVOCATIONS = "pending_revocations"
+
+
+def stage_revocation(db: Session, token_id: str, expires_at: datetime) -> None:
+    """
+    Queue a token id for revocation once `db` commits
+
+    Keeps the in-memory set in step with the table: a rolled back
+    deactivation never reaches the set.
+    """
+    db.info.setdefault(_PENDING_REVOCATIONS, []).append((token_id, expires_at))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_pending_revocations(session: Session) -> None:
+    for token_id, expires_at in session.info.pop(_PENDING_REVOCATIONS, ()):
+        revoked_tokens.add(token_id, expires_at)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending_revocations(session: Session) -> None:
+    session.info.pop(_PENDING_REVOCATIONS, None)
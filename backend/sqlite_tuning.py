@@ -0,0 +1,195 @@
+"""
+SQLite profile for small and single-node deployments: connection pragmas
+and an in-process single-writer queue
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements that make pysqlite open a write transaction
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA name -> value for every new connection, from the SQLITE_* settings"""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,  # WAL: readers never block the writer
+        "synchronous": settings.sqlite_synchronous,  # NORMAL is durable across crashes in WAL mode
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "cache_size": -settings.sqlite_cache_size_mb * 1024,  # Negative means KiB
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+class WriterQueue:
+    """
+    FIFO lock that lets one transaction at a time write to the database
+
+    SQLite allows a single writer; without a queue concurrent writers spin
+    in SQLite's busy handler, sleeping in growing steps, and give up with
+    "database is locked" once busy_timeout runs out. Queued writers are
+    handed the lock in arrival order the moment it is released, which
+    bounds tail latency; each handoff needs the GIL, so under heavy CPU
+    load raw write throughput can be lower than with the busy handler.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+        self._held = False
+        self.holder: Any = None  # DBAPI connection holding the lock, set by its owner
+
+        # Metrics
+        self.acquired = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.max_queue = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Wait for the write lock
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            True if the lock was acquired
+        """
+        started = time.perf_counter()
+        with self._lock:
+            if not self._held and not self._waiters:
+                self._held = True
+                self.acquired += 1
+                return True
+            waiter = threading.Lock()
+            waiter.acquire()
+            self._waiters.append(waiter)
+            self.queued += 1
+            self.max_queue = max(self.max_queue, len(self._waiters))
+
+        granted = waiter.acquire(timeout=timeout)
+
+        with self._lock:
+            if not granted:
+                try:
+                    self._waiters.remove(waiter)
+                    self.timeouts += 1
+                except ValueError:
+                    granted = True  # Handed over just as the wait timed out
+            if granted:
+                self.acquired += 1
+            wait = time.perf_counter() - started
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return granted
+
+    def release(self) -> None:
+        """Pass the lock to the longest-waiting writer, if any"""
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().release()
+            else:
+                self._held = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "queued": self.queued,
+                "waiting": len(self._waiters),
+                "max_queue": self.max_queue,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.queued * 1000, 3) if self.queued else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+# Global SQLite writer queue instance
+writer_queue = WriterQueue()
+
+
+def install_sqlite_profile(engine: Engine) -> None:
+    """
+    Apply the SQLite pragmas on connect and, if enabled, route writes
+    through the writer queue
+
+    A connection joins the queue at its first INSERT, UPDATE or DELETE -
+    which is also where pysqlite begins the transaction, so the writer never
+    holds a stale read snapshot - and leaves it once its COMMIT or ROLLBACK
+    has finished, or when it goes back to the pool. Joining blocks, so
+    writes must not run on the event loop thread; the write endpoints are
+    plain functions that FastAPI runs in its threadpool.
+    """
+    if settings.sqlite_pragmas_enabled:
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+
+    if not settings.sqlite_single_writer:
+        return
+
+    wait_seconds = settings.sqlite_busy_timeout_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _join_writer_queue(conn, cursor, statement, parameters, context, executemany):
+        dbapi_connection = conn.connection.dbapi_connection
+        if writer_queue.holder is dbapi_connection or not statement.lstrip()[:7].upper().startswith(_WRITE_VERBS):
+            return
+        if writer_queue.acquire(wait_seconds):
+            writer_queue.holder = dbapi_connection
+        else:
+            logger.warning(f"Waited {wait_seconds}s for the SQLite writer queue; writing without it")
+
+    def _leave_writer_queue(dbapi_connection: Any) -> None:
+        # Only the holder's own thread can find itself here, so no lock needed
+        if dbapi_connection is not None and writer_queue.holder is dbapi_connection:
+            writer_queue.holder = None
+            writer_queue.release()
+
+    # Released once COMMIT or ROLLBACK has finished; the engine's commit and
+    # rollback events fire before the statement runs, so the next writer
+    # would only spin in SQLite's busy handler until it completes
+    dialect = engine.dialect
+    do_commit, do_rollback = dialect.do_commit, dialect.do_rollback
+
+    def _commit(connection):
+        try:
+            do_commit(connection)
+        finally:
+            _leave_writer_queue(connection.dbapi_connection)
+
+    def _rollback(connection):
+        try:
+            do_rollback(connection)
+        finally:
+            _leave_writer_queue(connection.dbapi_connection)
+
+    dialect.do_commit = _commit
+    dialect.do_rollback = _rollback
+
+    # Connections returned or discarded without an explicit commit or rollback
+    @event.listens_for(engine, "checkin")
+    def _released(dbapi_connection, connection_record):
+        _leave_writer_queue(dbapi_connection)
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidated(dbapi_connection, connection_record, exception):
+        _leave_writer_queue(dbapi_connection)
@@ -0,0 +1,168 @@
+"""
+Cold start profiling: per-module import times, startup steps and time to first response
+
+Set STARTUP_PROFILE=true in the process environment to enable the import
+timer; it is installed by the backend package itself so every import after
+`import backend` is measured. Startup steps are always timed, the report is
+only logged when profiling is enabled. Only the standard library is used
+here so that installing the timer does not itself import anything heavy.
+"""
+
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def profiling_requested() -> bool:
+    """Whether STARTUP_PROFILE is set to a true value in the environment"""
+    return os.environ.get("STARTUP_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader and times exec_module"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(module.__name__, time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that times every module executed after installation
+
+    Inclusive time covers the module and everything it imports; self time
+    excludes nested imports, so it points at the module doing the work.
+    """
+
+    def __init__(self):
+        self.times: Dict[str, Tuple[float, float]] = {}  # module -> (inclusive, self) seconds
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def enter(self) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+
+    def leave(self, name: str, elapsed: float) -> None:
+        stack = self._local.stack
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.times[name] = (elapsed, elapsed - nested)
+
+    def slowest(self, limit: int, by_self: bool = False) -> List[Dict[str, Any]]:
+        index = 1 if by_self else 0
+        ranked = sorted(self.times.items(), key=lambda item: item[1][index], reverse=True)[:limit]
+        return [
+            {"module": name, "inclusive_ms": round(inclusive * 1000, 1), "self_ms": round(own * 1000, 1)}
+            for name, (inclusive, own) in ranked
+        ]
+
+
+class StartupProfiler:
+    """Timeline of a cold start, from `import backend` to the first response"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.import_timer: Optional[ImportTimer] = None
+        self.steps: List[Tuple[str, float]] = []  # (step, milliseconds)
+        self.marks: List[Tuple[str, float]] = []  # (event, milliseconds since start)
+        self.first_response_ms: Optional[float] = None
+
+    def install(self) -> None:
+        """Start timing imports; call before the application is imported"""
+        if self.import_timer is None:
+            self.enabled = True
+            self.import_timer = ImportTimer()
+            sys.meta_path.insert(0, self.import_timer)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, event: str) -> None:
+        """Record a point on the timeline, e.g. "app imported" """
+        self.marks.append((event, round(self.elapsed_ms(), 1)))
+
+    @contextmanager
+    def step(self, name: str):
+        """Time a named startup step"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, round((time.perf_counter() - started) * 1000, 1)))
+
+    def first_response(self) -> None:
+        """Record time to first response; later calls are ignored"""
+        if self.first_response_ms is None:
+            self.first_response_ms = round(self.elapsed_ms(), 1)
+            if self.enabled:
+                logger.info(f"Startup profile: first response {self.first_response_ms} ms after import")
+
+    def report(self, limit: int = 25) -> Dict[str, Any]:
+        """Timeline, startup steps and the slowest imports"""
+        report = {
+            "enabled": self.enabled,
+            "marks": [{"event": event, "at_ms": at} for event, at in self.marks],
+            "steps": [{"step": name, "ms": ms} for name, ms in self.steps],
+            "first_response_ms": self.first_response_ms,
+        }
+        if self.import_timer is not None:
+            report["modules_imported"] = len(self.import_timer.times)
+            report["slowest_imports"] = self.import_timer.slowest(limit)
+            report["slowest_imports_self"] = self.import_timer.slowest(limit, by_self=True)
+        return report
+
+    def log_report(self, limit: int = 15) -> None:
+        """Log the report when profiling is enabled"""
+        if not self.enabled:
+            return
+
+        for event, at in self.marks:
+            logger.info(f"Startup profile: {event} at {at} ms")
+        for name, ms in self.steps:
+            logger.info(f"Startup profile: step {name} took {ms} ms")
+        if self.import_timer is not None:
+            for entry in self.import_timer.slowest(limit):
+                logger.info(
+                    f"Startup profile: import {entry['module']} "
+                    f"{entry['inclusive_ms']} ms ({entry['self_ms']} ms self)"
+                )
+
+
+# Global startup profiler instance
+startup_profiler = StartupProfiler()
@@ -0,0 +1,211 @@
+"""
+Live task counters per status, task type and processing speed
+"""
+
+import logging
+import threading
+from collections import Counter
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal
+from .models import Task, TaskCount
+
+logger = logging.getLogger(__name__)
+
+# Fields the board is counted by; a task is counted under one key of these
+COUNT_FIELDS = ("status", "task_type", "processing")
+
+CountKey = Tuple[str, str, str]
+
+
+def count_key(task: Task) -> CountKey:
+    """(status, task_type, processing) of a task"""
+    return tuple(_plain(getattr(task, field)) for field in COUNT_FIELDS)
+
+
+def _plain(value):
+    # Endpoints may assign the schema enums; count them by their value
+    return value.value if isinstance(value, Enum) else value
+
+
+class TaskCounters:
+    """
+    Task counts per (status, task_type, processing) combination
+
+    Per-column, per-type and per-speed totals are summed from the handful
+    of combinations on request, so board headers and priority ordering
+    never need COUNT(*). Counts are kept in step with the tasks table by
+    session events and applied only when a transaction commits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self.loaded = False
+
+    def load(self, db: Session) -> int:
+        """
+        Rebuild the counters from the task_counts table, or from the tasks
+        table when the counter table is disabled
+
+        An empty counter table is seeded from the tasks table first.
+
+        Returns:
+            Number of (status, task_type, processing) combinations loaded
+        """
+        if settings.task_counts_table:
+            rows = db.query(TaskCount.status, TaskCount.task_type, TaskCount.processing, TaskCount.count).all()
+            if not rows:
+                rows = _group_counts(db)
+                if rows:
+                    _write_deltas(db, {tuple(row[:3]): row[3] for row in rows})
+                    db.commit()
+                    logger.info(f"Seeded task_counts with {len(rows)} rows")
+        else:
+            rows = _group_counts(db)
+
+        counts = Counter({tuple(row[:3]): row[3] for row in rows if row[3] > 0})
+        with self._lock:
+            self._counts = counts
+            self.loaded = True
+
+        logger.info(f"Loaded task counters for {sum(counts.values())} tasks")
+        return len(counts)
+
+    def apply(self, changes: Iterable[Tuple[Optional[CountKey], Optional[CountKey]]]) -> None:
+        """Move tasks between keys; None stands for a created or deleted task"""
+        with self._lock:
+            for old, new in changes:
+                if old is not None:
+                    self._counts[old] -= 1
+                    if self._counts[old] <= 0:
+                        del self._counts[old]
+                if new is not None:
+                    self._counts[new] += 1
+
+    def count(self, **criteria: str) -> int:
+        """
+        Number of tasks matching every given field, e.g. count(status="todo")
+        """
+        positions = [(COUNT_FIELDS.index(field), value) for field, value in criteria.items()]
+        with self._lock:
+            return sum(
+                count for key, count in self._counts.items()
+                if all(key[position] == value for position, value in positions)
+            )
+
+    def snapshot(self) -> Dict:
+        """
+        Board totals, e.g. {"total": 12, "status": {"todo": 5, ...},
+        "task_type": {...}, "processing": {...}}
+        """
+        with self._lock:
+            items = list(self._counts.items())
+
+        totals = {field: Counter() for field in COUNT_FIELDS}
+        for key, count in items:
+            for field, value in zip(COUNT_FIELDS, key):
+                totals[field][value] += count
+
+        snapshot = {"total": sum(count for _, count in items)}
+        snapshot.update({field: dict(totals[field]) for field in COUNT_FIELDS})
+        return snapshot
+
+
+# Global task counters instance
+task_counters = TaskCounters()
+
+
+def _group_counts(db: Session) -> List[Tuple]:
+    return db.query(Task.status, Task.task_type, Task.processing, func.count(Task.id)).group_by(
+        Task.status, Task.task_type, Task.processing
+    ).all()
+
+
+def _write_deltas(db: Session, deltas: Dict[CountKey, int]) -> None:
+    """Add `deltas` to the task_counts rows in the current transaction"""
+    rows = [dict(zip(COUNT_FIELDS, key), count=delta) for key, delta in deltas.items() if delta]
+    if not rows:
+        return
+
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    table = TaskCount.__table__
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(COUNT_FIELDS),
+        set_={"count": table.c.count + statement.excluded.count}
+    )
+    db.connection().execute(statement, rows)
+
+
+_PENDING_COUNTS = "pending_task_counts"
+
+
+def stage_count_changes(db: Session, changes: List[Tuple[Optional[CountKey], Optional[CountKey]]]) -> None:
+    """
+    Queue counter changes to apply once `db` commits
+
+    With the counter table enabled, the changes are also written to it in
+    the current transaction. Called for every flush below; bulk updates
+    and deletes that bypass the ORM must call it themselves.
+    """
+    if not changes:
+        return
+
+    db.info.setdefault(_PENDING_COUNTS, []).extend(changes)
+
+    if settings.task_counts_table:
+        deltas: Counter = Counter()
+        for old, new in changes:
+            if old is not None:
+                deltas[old] -= 1
+            if new is not None:
+                deltas[new] += 1
+        _write_deltas(db, deltas)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _stage_flushed_counts(session: Session, flush_context) -> None:
+    changes = []
+    for task in session.new:
+        if isinstance(task, Task):
+            changes.append((None, count_key(task)))
+    for task in session.deleted:
+        if isinstance(task, Task):
+            changes.append((_flushed_key(task), None))
+    for task in session.dirty:
+        if isinstance(task, Task):
+            old = _flushed_key(task)
+            new = count_key(task)
+            if old != new:
+                changes.append((old, new))
+    stage_count_changes(session, changes)
+
+
+def _flushed_key(task: Task) -> CountKey:
+    """Count key of `task` before the flush that is being processed"""
+    attrs = inspect(task).attrs
+    key = []
+    for field in COUNT_FIELDS:
+        history = attrs[field].history
+        key.append(_plain(history.deleted[0] if history.deleted else getattr(task, field)))
+    return tuple(key)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_count_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_COUNTS, ())
+    if task_counters.loaded:
+        task_counters.apply(changes)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_count_changes(session: Session) -> None:
+    session.info.pop(_PENDING_COUNTS, None)
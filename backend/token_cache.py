@@ -0,0 +1,117 @@
+"""
+Bounded cache of verified JWT claims
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import settings
+
+
+def token_digest(token: str) -> bytes:
+    """Cache key for a raw token; the token itself is never stored"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    LRU cache of verified token claims keyed by token digest
+
+    Entries expire at the token's own `exp`, so a cached token is never
+    accepted for longer than the JWT itself allows. Revoked token ids are
+    purged through `discard_token_id`.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        # digest -> (claims, expires_at_epoch, token_id)
+        self._entries: "OrderedDict[bytes, Tuple[Any, float, Optional[str]]]" = OrderedDict()
+        # token id -> digest, for purging on revocation
+        self._by_token_id: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return cached claims for `token`, or None on a miss or expiry"""
+        if self.max_size <= 0:
+            return None
+
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at, token_id = entry
+            if expires_at <= time.time():
+                self._remove(key, token_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: Any, expires_at: float, token_id: Optional[str] = None) -> None:
+        """
+        Cache verified claims until `expires_at`
+
+        Args:
+            token: Raw JWT
+            claims: Verified claims to return on later hits
+            expires_at: Token expiry (epoch seconds)
+            token_id: JWT id, used to purge the entry on revocation
+        """
+        if self.max_size <= 0:
+            return
+
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (claims, expires_at, token_id)
+            self._entries.move_to_end(key)
+            if token_id is not None:
+                self._by_token_id[token_id] = key
+
+            while len(self._entries) > self.max_size:
+                old_key, (_, _, old_token_id) = self._entries.popitem(last=False)
+                if old_token_id is not None and self._by_token_id.get(old_token_id) == old_key:
+                    del self._by_token_id[old_token_id]
+
+    def discard_token_id(self, token_id: str) -> None:
+        """Drop any cached entry for a revoked token id"""
+        with self._lock:
+            key = self._by_token_id.get(token_id)
+            if key is not None:
+                self._remove(key, token_id)
+
+    def _remove(self, key: bytes, token_id: Optional[str]) -> None:
+        self._entries.pop(key, None)
+        if token_id is not None and self._by_token_id.get(token_id) == key:
+            del self._by_token_id[token_id]
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._by_token_id.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Global verified-token cache instance
+token_cache = TokenCache(settings.token_cache_size)
@@ -10,7 +10,7 @@ import time
 import random
 import string
 
-from .models import User, Task, TaskHistory, UserSession
+from .models import User, Task, TaskHistory
 from .auth import get_password_hash
 
 
@@ -153,25 +153,6 @@ def create_sample_tasks(db: Session, user_id: int) -> list[Task]:
     return created_tasks
 
 
-def cleanup_expired_sessions(db: Session) -> int:
-    """
-    Clean up expired user sessions
-    
-    Args:
-        db: Database session
-    
-    Returns:
-        Number of sessions cleaned up
-    """
-    expired_count = db.query(UserSession).filter(
-        UserSession.expires_at < datetime.utcnow(),
-        UserSession.is_active == True
-    ).update({"is_active": False})
-    
-    db.commit()
-    return expired_count
-
-
 def get_task_statistics(db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Get comprehensive task statistics
@@ -5,12 +5,16 @@ WebSocket connection manager for real-time updates
 import json
 import logging
 import asyncio
+from functools import partial
 from typing import Dict, List, Set
+from anyio import from_thread
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from .auth import verify_token
 from .database import get_db
 from .models import User
+from .task_counts import task_counters
+from .workers import event_relay
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,10 @@ class ConnectionManager:
         self.active_connections: Dict[str, List[WebSocket]] = {}
         # Store WebSocket to user mapping for quick lookup
         self.websocket_users: Dict[WebSocket, str] = {}
+        # Metrics
+        self.broadcasts = 0
+        self.messages_sent = 0
+        self.send_failures = 0
 
     async def connect(self, websocket: WebSocket, token: str):
         """Accept WebSocket connection and authenticate user"""
@@ -93,8 +101,10 @@ class ConnectionManager:
         """Send message to specific WebSocket connection"""
         try:
             await websocket.send_text(json.dumps(message))
+            self.messages_sent += 1
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
+            self.send_failures += 1
             # Remove broken connection
             self.disconnect(websocket)
 
@@ -105,8 +115,10 @@ class ConnectionManager:
             for websocket in self.active_connections[username]:
                 try:
                     await websocket.send_text(json.dumps(message))
+                    self.messages_sent += 1
                 except Exception as e:
                     logger.error(f"Error sending message to {username}: {e}")
+                    self.send_failures += 1
                     disconnected.append(websocket)
             
             # Clean up disconnected websockets
@@ -115,6 +127,7 @@ class ConnectionManager:
 
     async def broadcast(self, message: dict, exclude_user: str = None):
         """Broadcast message to all connected users except excluded user"""
+        self.broadcasts += 1
         disconnected = []
         
         for username, websockets in self.active_connections.items():
@@ -125,8 +138,10 @@ class ConnectionManager:
             for websocket in websockets:
                 try:
                     await websocket.send_text(json.dumps(message))
+                    self.messages_sent += 1
                 except Exception as e:
                     logger.error(f"Error broadcasting to {username}: {e}")
+                    self.send_failures += 1
                     disconnected.append(websocket)
         
         # Clean up disconnected websockets
@@ -134,20 +149,30 @@ class ConnectionManager:
             self.disconnect(websocket)
 
     async def broadcast_task_event(self, event_type: str, task_data: dict, user_id: int = None, exclude_user: str = None):
-        """Broadcast task-related events to all users"""
+        """Broadcast task-related events to all users, with the updated board counts"""
         message = {
             "type": event_type,
             "data": task_data,
             "user_id": user_id,
             "timestamp": task_data.get("updated_at") or task_data.get("created_at")
         }
+        if task_counters.loaded:
+            message["counts"] = task_counters.snapshot()
         
         # Send to ALL users - don't exclude anyone
         # The frontend will handle whether to apply optimistic updates or not
         await self.broadcast(message, exclude_user=None)
+        # Connections held by the other worker processes
+        event_relay.publish(message)
         
         logger.info(f"Broadcasted {event_type} for task {task_data.get('id')} to {len(self.get_connected_users())} users")
     
+    def broadcast_task_event_from_thread(self, event_type: str, task_data: dict, user_id: int = None, exclude_user: str = None):
+        """Broadcast a task event from a sync endpoint's worker thread, waiting for it on the event loop"""
+        from_thread.run(partial(
+            self.broadcast_task_event, event_type, task_data, user_id=user_id, exclude_user=exclude_user
+        ))
+    
     def schedule_task_event(self, event_type: str, task_data: dict, user_id: int = None, exclude_user: str = None):
         """Schedule a task event broadcast from a synchronous context"""
         if not self.connections:
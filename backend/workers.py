@@ -0,0 +1,216 @@
+"""
+Coordination between worker processes serving the same application
+
+render_start.py can run several uvicorn workers (WEB_WORKERS) that share
+one listening socket. Each worker is a separate process with its own copy
+of every in-memory structure, so each one is kept correct as follows:
+
+    State                     With several workers
+    ------------------------  -------------------------------------------------
+    token_cache               Safe: only caches signature checks; revocation is
+                              checked separately on every request
+    password_hasher           Safe: a bounded pool per worker
+    revoked_tokens            Reloaded from user_sessions every
+                              WORKER_SYNC_INTERVAL_SECONDS; a logout on another
+                              worker takes effect within that interval
+    task_counters             The task_counts table is forced on and the
+                              counters reload from it every sync interval
+    client_names              Reloaded every CLIENT_NAMES_RESYNC_INTERVAL_SECONDS
+                              (suggestions only, so staleness is harmless)
+    Rate limiters             Each worker enforces the full limits. A keep-alive
+                              client stays on one worker; one that reconnects
+                              can get up to WEB_WORKERS times the limit
+    ConnectionManager         Task events are relayed to the other workers
+                              (EventRelay below), which deliver them to their
+                              own WebSocket connections
+    Maintenance scheduler     Jobs run only in the worker holding the
+                              maintenance lock; the others take over within a
+                              sync interval if it exits
+    Audit segment archive     Single writer per directory, so it is disabled
+                              and entries are mirrored to the audit_log table
+
+Settings applies the forced overrides when WEB_WORKERS > 1. The relay and
+the lock live in a runtime directory shared by the workers of one server.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    """Number of worker processes the server was configured with"""
+    return max(settings.web_workers, 1)
+
+
+def multi_worker() -> bool:
+    """Whether in-memory state has to be coordinated between processes"""
+    return worker_count() > 1
+
+
+def runtime_dir(server_pid: Optional[int] = None) -> Path:
+    """
+    Directory shared by the workers of one server
+
+    Workers are children of the server process, so the directory is keyed
+    by the parent pid and a restarted server never sees stale sockets.
+
+    Args:
+        server_pid: Server process id; defaults to this worker's parent
+    """
+    pid = server_pid if server_pid is not None else os.getppid()
+    path = Path(tempfile.gettempdir()) / f"teg-tms-{pid}"
+    path.mkdir(mode=0o700, exist_ok=True)
+    return path
+
+
+class MaintenanceLeader:
+    """
+    Exclusive file lock deciding which worker runs maintenance jobs
+
+    The lock is released by the operating system when its worker exits,
+    so the next worker to ask becomes the leader. A single worker is
+    always the leader.
+    """
+
+    def __init__(self):
+        self._file = None
+
+    def acquire(self) -> bool:
+        """Take the lock if it is free; returns whether this worker is the leader"""
+        if not multi_worker() or self._file is not None:
+            return True
+
+        import fcntl
+
+        lock_file = open(runtime_dir() / "maintenance.lock", "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+
+        self._file = lock_file
+        logger.info(f"Worker {os.getpid()} now runs the maintenance jobs")
+        return True
+
+    @property
+    def is_leader(self) -> bool:
+        return not multi_worker() or self._file is not None
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Global maintenance leader instance
+maintenance_leader = MaintenanceLeader()
+
+
+class EventRelay:
+    """
+    Forwards WebSocket broadcasts to the other worker processes
+
+    Each worker binds a Unix datagram socket in the runtime directory and
+    sends every task event to its siblings' sockets; a receiving worker
+    delivers the event to its own connections only. Sockets left behind
+    by workers that crashed are removed on the first failed send.
+    """
+
+    MAX_MESSAGE_BYTES = 256 * 1024
+
+    def __init__(self):
+        self._socket: Optional[socket.socket] = None
+        self._path: Optional[Path] = None
+        self._deliver: Optional[Callable[[dict], Awaitable[None]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._socket is not None
+
+    def start(self, deliver: Callable[[dict], Awaitable[None]]) -> None:
+        """
+        Listen for events from the other workers on the running event loop
+
+        Args:
+            deliver: Coroutine function sending a relayed message to local connections
+        """
+        self._path = runtime_dir() / f"worker-{os.getpid()}.sock"
+        with suppress(FileNotFoundError):
+            self._path.unlink()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self._path))
+        sock.setblocking(False)
+
+        self._socket = sock
+        self._deliver = deliver
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(sock.fileno(), self._receive)
+        logger.info(f"Worker {os.getpid()} relaying WebSocket events through {self._path.parent}")
+
+    def _receive(self) -> None:
+        while True:
+            try:
+                data = self._socket.recv(self.MAX_MESSAGE_BYTES)
+            except (BlockingIOError, InterruptedError):
+                return
+            try:
+                message = json.loads(data)
+            except ValueError:
+                logger.warning("Ignored a malformed relayed event")
+                continue
+            self.received += 1
+            self._loop.create_task(self._deliver(message))
+
+    def publish(self, message: dict) -> None:
+        """Send `message` to every other worker; a no-op until started"""
+        if self._socket is None:
+            return
+
+        data = json.dumps(message, default=str).encode()
+        for path in self._path.parent.glob("worker-*.sock"):
+            if path == self._path:
+                continue
+            try:
+                self._socket.sendto(data, str(path))
+                self.sent += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker exited without removing its socket
+                with suppress(FileNotFoundError):
+                    path.unlink()
+            except OSError as e:
+                # Receiver queue full or message too large; the event is lost for that worker
+                self.dropped += 1
+                logger.warning(f"Could not relay event to {path.name}: {e}")
+
+    def stop(self) -> None:
+        if self._socket is None:
+            return
+        self._loop.remove_reader(self._socket.fileno())
+        self._socket.close()
+        self._socket = None
+        with suppress(FileNotFoundError):
+            self._path.unlink()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "sent": self.sent, "received": self.received, "dropped": self.dropped}
+
+
+# Global event relay instance
+event_relay = EventRelay()
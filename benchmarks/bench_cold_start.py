@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first byte after a cold start
+
+Starts the production entry point (render_start.py) in a fresh process
+against an existing SQLite database, polls /api/v1/health until it
+answers and reports the time from process spawn to the first response.
+The first run migrates the database and is not counted.
+
+Set STARTUP_PROFILE=true to have each server log its startup profile.
+
+Usage: python benchmarks/bench_cold_start.py [runs]
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cold_start(env: dict, timeout: float = 60.0) -> float:
+    """Seconds from spawning the server to its first successful response"""
+    port = free_port()
+    env = dict(env, PORT=str(port))
+    url = f"http://127.0.0.1:{port}/api/v1/health"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "render_start.py"],
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if env.get("STARTUP_PROFILE") else subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read()
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("Server did not answer in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    tmpdir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmpdir}/bench.db",
+        ENVIRONMENT="production",
+        DEBUG="false",
+    )
+
+    cold_start(env)
+
+    timings = sorted(cold_start(env) * 1000 for _ in range(runs))
+    print(f"time to first byte over {runs} cold starts")
+    print(f"  median {timings[len(timings) // 2]:.0f} ms, min {timings[0]:.0f} ms, max {timings[-1]:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-text task search latency on a large board
+
+Fills a throwaway SQLite database with synthetic tasks (100k by default)
+and times search_tasks for common query shapes: a full word, short
+prefixes, multi-term queries and a status filter.
+
+Usage: python benchmarks/bench_search.py [tasks]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database and keep the benchmark quiet
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import logging
+
+from sqlalchemy import insert
+
+from backend.database import SessionLocal, create_tables, engine
+from backend.models import Task, User
+from backend.search import search_tasks
+
+FIRST = ["Smith", "Jones", "Garcia", "Miller", "Davis", "Lopez", "Wilson", "Anderson", "Thomas", "Moore"]
+SUFFIX = ["Realty", "Title", "Homes", "Properties", "Escrow", "Group", "Partners", "Estates"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Smithfield", "Lakeview", "Hillcrest", "Park"]
+WORDS = ["deed", "lien", "closing", "signature", "notary", "rush", "appraisal", "survey", "payoff", "escrow"]
+STATUSES = ["todo", "in-review", "awaiting-documents", "done"]
+TYPES = ["BDL", "SDL", "nBDL", "nPO", "Misc"]
+
+QUERIES = [
+    ("word", "garcia", None),
+    ("2-char prefix", "sm", None),
+    ("3-char prefix", "lak", None),
+    ("two terms", "smith realty", None),
+    ("address + word", "maple notary", None),
+    ("status filter", "jones", "awaiting-documents"),
+]
+
+
+def populate(count: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{
+            "username": "bench", "email": "bench@example.com", "hashed_password": "x"
+        }])
+        for start in range(0, count, 10000):
+            connection.execute(insert(Task), [{
+                "custom_id": f"{i:06X}",
+                "client_name": f"{rng.choice(FIRST)} {rng.choice(SUFFIX)}",
+                "task_type": rng.choice(TYPES),
+                "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)} St",
+                "status": rng.choice(STATUSES),
+                "description": " ".join(rng.sample(WORDS, 3)),
+                "owner_id": 1,
+            } for i in range(start, min(start + 10000, count))])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    logging.disable(logging.INFO)
+
+    create_tables()
+    started = time.perf_counter()
+    populate(count)
+    print(f"Inserted {count} tasks in {time.perf_counter() - started:.1f} s\n")
+
+    db = SessionLocal()
+    print(f"{'query':16} {'q':16} {'results':>7} {'median (ms)':>12} {'max (ms)':>9}")
+    for label, query, status in QUERIES:
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            results = search_tasks(db, query, status=status, limit=20)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+        timings.sort()
+        print(f"{label:16} {query:16} {len(results):7} {timings[len(timings) // 2]:12.2f} {timings[-1]:9.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent reads and writes on SQLite with and without tuning
+
+Runs the same mixed workload against a fresh SQLite database for each
+profile, each in its own process since settings are read at import:
+
+    baseline   driver defaults (rollback journal, synchronous=FULL)
+    pragmas    WAL, synchronous=NORMAL, busy_timeout, mmap, cache, temp_store
+    tuned      pragmas plus the single-writer queue (SQLITE_SINGLE_WRITER)
+
+Writer threads create a task and move an existing one per transaction;
+reader threads load a board column. Reports committed writes and reads
+per second, "database is locked" errors and p99 latencies.
+
+Usage: python benchmarks/bench_sqlite_concurrency.py [writers] [readers] [seconds]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    "baseline": {"SQLITE_PRAGMAS_ENABLED": "false", "SQLITE_SINGLE_WRITER": "false"},
+    "pragmas": {"SQLITE_PRAGMAS_ENABLED": "true", "SQLITE_SINGLE_WRITER": "false"},
+    "tuned": {"SQLITE_PRAGMAS_ENABLED": "true", "SQLITE_SINGLE_WRITER": "true"},
+}
+
+SEED_TASKS = 2000
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_workload(writers: int, readers: int, seconds: float) -> dict:
+    """Child process: seed a database and hammer it from threads"""
+    import itertools
+    import logging
+    import random
+    import threading
+    import time
+
+    sys.path.insert(0, str(project_root))
+    logging.disable(logging.WARNING)
+
+    from sqlalchemy.exc import OperationalError
+
+    from backend.database import SessionLocal, create_tables
+    from backend.models import Task
+    from backend.utils import create_admin_user
+
+    create_tables()
+    db = SessionLocal()
+    owner_id = create_admin_user(db).id
+    custom_ids = itertools.count()
+    db.add_all(
+        Task(custom_id=f"{next(custom_ids):06X}", client_name=f"Client {i % 50}", task_type="BDL", owner_id=owner_id)
+        for i in range(SEED_TASKS)
+    )
+    db.commit()
+    db.close()
+
+    results = {"writes": 0, "reads": 0, "write_errors": 0, "read_errors": 0, "write_ms": [], "read_ms": []}
+    results_lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    statuses = ("todo", "in-review", "awaiting-documents")
+
+    def writer():
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            db = SessionLocal()
+            started = time.perf_counter()
+            try:
+                db.add(Task(custom_id=f"{next(custom_ids):06X}", client_name="Bench", task_type="SDL", owner_id=owner_id))
+                task = db.get(Task, rng.randint(1, SEED_TASKS))
+                task.status = rng.choice(statuses)
+                db.commit()
+                outcome = "writes"
+            except OperationalError:
+                db.rollback()
+                outcome = "write_errors"
+            finally:
+                db.close()
+            with results_lock:
+                results[outcome] += 1
+                results["write_ms"].append((time.perf_counter() - started) * 1000)
+
+    def reader():
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            db = SessionLocal()
+            started = time.perf_counter()
+            try:
+                db.query(Task).filter(Task.status == rng.choice(statuses)).order_by(
+                    Task.priority_order
+                ).limit(50).all()
+                outcome = "reads"
+            except OperationalError:
+                outcome = "read_errors"
+            finally:
+                db.close()
+            with results_lock:
+                results[outcome] += 1
+                results["read_ms"].append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "writes_per_s": round(results["writes"] / seconds, 1),
+        "reads_per_s": round(results["reads"] / seconds, 1),
+        "write_errors": results["write_errors"],
+        "read_errors": results["read_errors"],
+        "write_p99_ms": round(percentile(results["write_ms"], 0.99), 1),
+        "read_p99_ms": round(percentile(results["read_ms"], 0.99), 1),
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        writers, readers, seconds = int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+        print(json.dumps(run_workload(writers, readers, seconds)))
+        return
+
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = sys.argv[3] if len(sys.argv) > 3 else "10"
+
+    print(f"{writers} writer and {readers} reader threads, {seconds}s per profile, {SEED_TASKS} seeded tasks\n")
+    print(f"{'profile':<10} {'writes/s':>9} {'reads/s':>9} {'w errors':>9} {'r errors':>9} {'w p99 ms':>9} {'r p99 ms':>9}")
+
+    for name, overrides in PROFILES.items():
+        tmpdir = tempfile.mkdtemp()
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmpdir}/bench.db",
+            MAINTENANCE_ENABLED="false",
+            AUDIT_LOG_DIR="",
+            BCRYPT_ROUNDS="4",
+            DB_POOL_SIZE=str(writers + readers),
+            **overrides,
+        )
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", str(writers), str(readers), seconds],
+            cwd=project_root, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{name:<10} {result['writes_per_s']:>9} {result['reads_per_s']:>9} {result['write_errors']:>9} "
+            f"{result['read_errors']:>9} {result['write_p99_ms']:>9} {result['read_p99_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
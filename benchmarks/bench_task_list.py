@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: task list serialization on a large board
+
+Fills a throwaway SQLite database with synthetic tasks (5,000 by default)
+and times building the GET /api/v1/tasks/ response body two ways:
+
+- orm: ORM objects with the owner joined, validated through
+  List[TaskResponse] and encoded with the standard JSON encoder, which is
+  what FastAPI does for a response_model endpoint returning ORM objects
+- fast: the endpoint's projection query, pre-shaped dicts and orjson
+
+Also reports a compact card projection and checks both full paths
+produce the same tasks.
+
+Usage: python benchmarks/bench_task_list.py [tasks]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database and keep the benchmark quiet
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import logging
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from backend.database import SessionLocal, create_tables, engine
+from backend.models import Task, User
+from backend.routers.tasks import parse_projection, projected_tasks, projection_query
+from backend.schemas import TaskResponse
+
+STATUSES = ["todo", "in-review", "awaiting-documents", "done"]
+TYPES = ["BDL", "SDL", "nBDL", "nPO", "Misc"]
+
+task_list = TypeAdapter(List[TaskResponse])
+
+
+def populate(count: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{
+            "username": f"user{i}", "email": f"user{i}@example.com",
+            "full_name": f"User {i}", "hashed_password": "x"
+        } for i in range(10)])
+        connection.execute(insert(Task), [{
+            "custom_id": f"{i:06X}",
+            "client_name": f"Client {rng.randint(1, 500)}",
+            "task_type": rng.choice(TYPES),
+            "address": f"{rng.randint(1, 9999)} Main St",
+            "status": rng.choice(STATUSES),
+            "description": "Closing package, signature pages and payoff letter " * 2,
+            "owner_id": rng.randint(1, 10),
+            "priority_order": i,
+        } for i in range(count)])
+
+
+def orm_body(db, limit: int) -> bytes:
+    tasks = db.query(Task).options(joinedload(Task.owner)).order_by(
+        Task.processing == "expedited", Task.priority_order.asc(), Task.created_at.asc()
+    ).limit(limit).all()
+    content = task_list.dump_python(task_list.validate_python(tasks, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_body(db, limit: int, fields=None, include: str = "owner") -> bytes:
+    columns, include_owner = parse_projection(fields, include)
+    rows = projection_query(db, columns, include_owner).order_by(
+        Task.processing == "expedited", Task.priority_order.asc(), Task.created_at.asc()
+    ).limit(limit).all()
+    return orjson.dumps(projected_tasks(rows, columns, include_owner))
+
+
+def timed(label: str, build, db, runs: int = 10) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = build()
+        timings.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"{label:34} {median:10.1f} {len(body) / 1024:10.0f}")
+    return median
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.INFO)
+
+    create_tables()
+    populate(count)
+
+    db = SessionLocal()
+    same = json.loads(orm_body(db, count)) == json.loads(fast_body(db, count))
+    db.expunge_all()
+
+    print(f"{count} tasks\n")
+    print(f"{'path':34} {'median ms':>10} {'KiB':>10}")
+    orm = timed("orm + TaskResponse + json", lambda: orm_body(db, count), db)
+    fast = timed("projection + orjson", lambda: fast_body(db, count), db)
+    timed("projection + orjson, card fields", lambda: fast_body(
+        db, count, fields="custom_id,client_name,task_type,status,processing,priority_order", include=""
+    ), db)
+    db.close()
+
+    print(f"\nfast path is {orm / fast:.1f}x faster; identical output: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU cost of token verification with and without the verified-token cache
+
+Measures verify_token in isolation and GET /api/v1/tasks/ end to end against
+a throwaway SQLite database.
+
+Usage: python benchmarks/bench_token_cache.py [requests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database and keep the benchmark quiet
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+import logging
+
+from fastapi.testclient import TestClient
+
+from backend.auth import create_access_token, verify_token
+from backend.database import SessionLocal
+from backend.main import app
+from backend.token_cache import token_cache
+from backend.utils import create_admin_user, create_sample_tasks
+
+
+def cpu_per_call(func, iterations: int) -> float:
+    """Average CPU microseconds per call"""
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logging.disable(logging.INFO)
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        admin = create_admin_user(db)
+        create_sample_tasks(db, admin.id)
+        token = create_access_token({"sub": admin.username, "user_id": admin.id})
+        db.close()
+
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def verify():
+            verify_token(token)
+
+        def get_tasks():
+            client.get("/api/v1/tasks/", headers=headers)
+
+        results = {}
+        for label, size in (("no cache", 0), ("cache", 1024)):
+            token_cache.clear()
+            token_cache.max_size = size
+            get_tasks()  # warm up
+            results[label] = (
+                cpu_per_call(verify, requests * 10),
+                cpu_per_call(get_tasks, requests),
+            )
+
+    print(f"{'':10} {'verify_token (us)':>18} {'GET /tasks (us)':>16}")
+    for label, (verify_us, request_us) in results.items():
+        print(f"{label:10} {verify_us:18.1f} {request_us:16.1f}")
+
+    saved = results["no cache"][1] - results["cache"][1]
+    print(f"\nCPU saved per GET /tasks request: {saved:.1f} us "
+          f"({saved / results['no cache'][1] * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Check: task endpoints stay within their SQL query budgets
+
+Drives the task board endpoints against a throwaway SQLite database with
+ENVIRONMENT=test, so each request is audited and any endpoint running more
+statements than its @query_budget fails with a 500. Several tasks are
+cleared at once to catch per-row statements in clear-done. Prints the
+statements each request ran next to its budget and exits non-zero on any
+overrun.
+
+Usage: python benchmarks/check_query_budgets.py [--durable]
+
+--durable writes history on the request's session (AUDIT_DURABLE=true),
+which adds the history insert to every write.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Use a throwaway database and audit every request strictly
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/check.db"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+os.environ["AUDIT_DURABLE"] = "true" if "--durable" in sys.argv else "false"
+os.environ["AUDIT_LOG_DIR"] = ""
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["MAINTENANCE_ENABLED"] = "false"
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+import logging
+
+from fastapi.testclient import TestClient
+
+from backend.auth import create_access_token
+from backend.database import SessionLocal
+from backend.main import app
+from backend.utils import create_admin_user
+
+DONE_TASKS = 5
+
+
+def main():
+    logging.disable(logging.INFO)
+    failures = 0
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        admin = create_admin_user(db)
+        token = create_access_token({"sub": admin.username, "user_id": admin.id})
+        db.close()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def call(method: str, url: str, **kwargs):
+            nonlocal failures
+            response = client.request(method, url, headers=headers, **kwargs)
+            route = response.request.url.path
+            budget = "-"
+            for candidate in app.routes:
+                match, _ = candidate.matches({"type": "http", "path": route, "method": method})
+                if match.name == "FULL":
+                    budget = getattr(getattr(candidate, "endpoint", None), "query_budget", "-")
+                    break
+            over = response.status_code == 500 and response.json().get("detail") == "Query budget exceeded"
+            failures += over
+            print(
+                f"{'FAIL' if over else 'ok':<5} {method:<7} {route:<36} "
+                f"{response.headers.get('X-Query-Count', '?'):>7} {budget!s:>6}"
+            )
+            if over:
+                print(f"      {response.json()['error']}")
+            return response
+
+        print(f"{'':<5} {'method':<7} {'path':<36} {'queries':>7} {'budget':>6}")
+        task_ids = [
+            call("POST", "/api/v1/tasks/", json={"client_name": f"Client {i}", "task_type": "BDL"}).json()["id"]
+            for i in range(DONE_TASKS + 2)
+        ]
+        custom_id = call("GET", f"/api/v1/tasks/{task_ids[0]}").json()["custom_id"]
+        call("GET", "/api/v1/tasks/")
+        call("GET", "/api/v1/tasks/search", params={"q": "Client"})
+        call("GET", "/api/v1/tasks/counts")
+        call("GET", "/api/v1/tasks/client-names", params={"q": "Cli"})
+        call("PUT", f"/api/v1/tasks/{task_ids[0]}", json={"description": "Checked"})
+        for task_id in task_ids[:DONE_TASKS]:
+            call("POST", f"/api/v1/tasks/{task_id}/move", params={"new_status": "done"})
+        call("POST", f"/api/v1/tasks/{task_ids[-1]}/undo")
+        call("DELETE", "/api/v1/tasks/clear-done")
+        call("DELETE", f"/api/v1/tasks/{task_ids[-2]}")
+        call("GET", f"/api/v1/guest/task-status/RE-{custom_id}")
+
+    print(f"\n{'All endpoints within budget' if not failures else f'{failures} request(s) over budget'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Check: task list filters are served by indexes
+
+Calls GET /api/v1/tasks/ with each common filter combination against a
+throwaway SQLite database, captures the SQL the endpoint runs, and asserts
+that EXPLAIN QUERY PLAN searches the expected index instead of scanning
+the tasks table. Exits non-zero if any plan regresses.
+
+Usage: python benchmarks/check_task_indexes.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Use a throwaway database and keep the check quiet
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/check.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["MAINTENANCE_ENABLED"] = "false"
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from backend.auth import create_access_token
+from backend.database import SessionLocal, engine
+from backend.main import app
+from backend.utils import create_admin_user, create_sample_tasks
+
+# (filters, index expected in the plan)
+CASES = [
+    ({"status": "todo"}, "ix_tasks_status_priority"),
+    ({"task_type": "BDL"}, "ix_tasks_type_status"),
+    ({"task_type": "Misc - *"}, "ix_tasks_type_status"),
+    ({"task_type": "BDL", "status": "done"}, "ix_tasks_type_status"),
+    ({"owner_id": 1}, "ix_tasks_owner_status"),
+    ({"owner_id": 1, "status": "in-review"}, "ix_tasks_owner_status"),
+    ({"created_after": "2024-01-01T00:00:00", "created_before": "2024-02-01T00:00:00"}, "ix_tasks_created_at"),
+    ({"completed_after": "2024-01-01T00:00:00"}, "ix_tasks_completed_at"),
+]
+
+
+def main():
+    logging.disable(logging.INFO)
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM tasks" in statement:
+            captured.append((statement, parameters))
+
+    failures = 0
+    with TestClient(app) as client:
+        db = SessionLocal()
+        admin = create_admin_user(db)
+        create_sample_tasks(db, admin.id)
+        token = create_access_token({"sub": admin.username, "user_id": admin.id})
+        db.close()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            for filters, expected in CASES:
+                captured.clear()
+                response = client.get("/api/v1/tasks/", params=filters, headers=headers)
+                assert response.status_code == 200, response.text
+
+                statement, parameters = captured[-1]
+                with engine.connect() as connection:
+                    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                details = [row[-1] for row in plan]
+
+                used = any(expected in detail for detail in details)
+                scanned = any(detail.startswith("SCAN tasks") for detail in details)
+                ok = used and not scanned
+                failures += not ok
+
+                print(f"{'ok  ' if ok else 'FAIL'} {filters}")
+                if not ok:
+                    for detail in details:
+                        print(f"       {detail}")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+    print(f"\n{len(CASES) - failures}/{len(CASES)} filter plans use their index")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
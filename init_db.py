@@ -14,17 +14,17 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from sqlalchemy.orm import Session
-from backend.database import engine, SessionLocal, create_tables
+from backend.database import engine, SessionLocal, upgrade_schema
 from backend.utils import create_admin_user, create_sample_tasks
 from backend.models import User
 
 
 def init_database():
     """Initialize the database and create tables"""
-    print("🗃️  Creating database tables...")
+    print("🗃️  Applying database migrations...")
     try:
-        create_tables()
-        print("✅ Database tables created successfully!")
+        upgrade_schema()
+        print("✅ Database schema is up to date!")
         return True
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
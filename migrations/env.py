@@ -0,0 +1,79 @@
+"""
+Alembic migration environment for the TEG Task Management System
+"""
+
+import re
+from logging.config import fileConfig
+
+from alembic import context
+
+from backend.config import settings
+from backend.database import Base, engine
+import backend.models  # noqa: F401 - registers models on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Tables managed outside the models: the SQLite FTS5 index and its shadow
+# tables, and the monthly task_history tables and partitions
+UNMODELED_TABLES = re.compile(r"^(tasks_fts(_\w+)?|task_history_(\d{6}|default))$")
+
+# Indexes the models only create on PostgreSQL
+POSTGRESQL_ONLY_INDEXES = {"ix_tasks_search", "ix_task_history_new_values", "ix_tasks_type_pattern"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from flagging objects the models don't describe"""
+    if type_ == "table" and UNMODELED_TABLES.match(name):
+        return False
+    if type_ == "index" and name in POSTGRESQL_ONLY_INDEXES:
+        return context.get_bind().dialect.name == "postgresql"
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running against a database"""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=settings.database_url.startswith("sqlite"),
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the application's engine"""
+    connection = config.attributes.get("connection")
+
+    if connection is None:
+        with engine.connect() as connection:
+            _run(connection)
+    else:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,43 @@
+"""Narrow user_sessions.session_token to the 32-character token id
+
+Sessions are keyed by the JWT id (32 hex characters) rather than the whole
+token. Rows from before that change hold full tokens; they can no longer
+match a request and are removed first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM user_sessions WHERE length(session_token) > 32")
+    with op.batch_alter_table("user_sessions") as batch_op:
+        batch_op.alter_column(
+            "session_token",
+            existing_type=sa.String(length=255),
+            type_=sa.String(length=32),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user_sessions") as batch_op:
+        batch_op.alter_column(
+            "session_token",
+            existing_type=sa.String(length=32),
+            type_=sa.String(length=255),
+            existing_nullable=False,
+        )
@@ -0,0 +1,29 @@
+"""Add an index for expired session cleanup
+
+Serves the batched cleanup of expired sessions and the startup load of
+revoked token ids.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_sessions_active_expires", "user_sessions", ["is_active", "expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_sessions_active_expires", table_name="user_sessions")
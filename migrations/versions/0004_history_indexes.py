@@ -0,0 +1,30 @@
+"""Add composite indexes for task history pagination
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_task_history_task_ts", "task_history", ["task_id", "timestamp", "id"])
+    op.create_index("ix_task_history_user_ts", "task_history", ["user_id", "timestamp", "id"])
+    op.create_index("ix_task_history_ts", "task_history", ["timestamp", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_history_ts", table_name="task_history")
+    op.drop_index("ix_task_history_user_ts", table_name="task_history")
+    op.drop_index("ix_task_history_task_ts", table_name="task_history")
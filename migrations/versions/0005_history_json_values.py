@@ -0,0 +1,61 @@
+"""Store task history old/new values as native JSON
+
+PostgreSQL columns become JSONB (existing JSON strings are cast in place)
+and new_values gets a GIN index for containment queries. SQLite keeps the
+text it already stores, which is valid JSON; only the declared type changes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for column in ("old_values", "new_values"):
+            op.alter_column(
+                "task_history",
+                column,
+                type_=postgresql.JSONB(),
+                postgresql_using=f"{column}::jsonb",
+            )
+        op.create_index(
+            "ix_task_history_new_values",
+            "task_history",
+            ["new_values"],
+            postgresql_using="gin",
+            postgresql_ops={"new_values": "jsonb_path_ops"},
+        )
+    else:
+        with op.batch_alter_table("task_history") as batch_op:
+            batch_op.alter_column("old_values", type_=sa.JSON())
+            batch_op.alter_column("new_values", type_=sa.JSON())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_task_history_new_values", table_name="task_history")
+        for column in ("old_values", "new_values"):
+            op.alter_column(
+                "task_history",
+                column,
+                type_=sa.Text(),
+                postgresql_using=f"{column}::text",
+            )
+    else:
+        with op.batch_alter_table("task_history") as batch_op:
+            batch_op.alter_column("old_values", type_=sa.Text())
+            batch_op.alter_column("new_values", type_=sa.Text())
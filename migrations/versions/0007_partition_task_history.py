@@ -0,0 +1,144 @@
+"""Partition task_history by month on PostgreSQL
+
+task_history becomes a RANGE (timestamp) partitioned table with one
+partition per month, from the oldest existing row through three months
+ahead, plus a default partition. The primary key is widened to
+(id, timestamp) because PostgreSQL requires the partition key in every
+unique constraint; ids still come from the same sequence.
+
+SQLite has no declarative partitioning; the history_partitions maintenance
+job rolls closed months into task_history_YYYYMM tables instead.
+
+On both, task_history loses its foreign key to tasks (and the ON DELETE
+CASCADE): months are archived with the history of tasks deleted since, and
+the rows of a deleted task no longer have to be removed from every month.
+SQLite tasks also become AUTOINCREMENT, so a new task never takes over the
+id, and with it the history, of a deleted one.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+COLUMNS = "id, task_id, user_id, action, old_values, new_values, timestamp"
+INDEXES = ("ix_task_history_id", "ix_task_history_task_ts", "ix_task_history_user_ts",
+           "ix_task_history_ts", "ix_task_history_new_values")
+
+# Names the unnamed SQLite foreign key so batch mode can drop it
+SQLITE_NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.execute("CREATE INDEX ix_task_history_id ON task_history (id)")
+    op.execute("CREATE INDEX ix_task_history_task_ts ON task_history (task_id, timestamp, id)")
+    op.execute("CREATE INDEX ix_task_history_user_ts ON task_history (user_id, timestamp, id)")
+    op.execute("CREATE INDEX ix_task_history_ts ON task_history (timestamp, id)")
+    op.execute("CREATE INDEX ix_task_history_new_values ON task_history USING gin (new_values jsonb_path_ops)")
+
+
+def _detach_legacy() -> None:
+    """Rename task_history out of the way, freeing its index and sequence names"""
+    op.execute("ALTER TABLE task_history RENAME TO task_history_legacy")
+    op.execute("ALTER TABLE task_history_legacy RENAME CONSTRAINT task_history_pkey TO task_history_legacy_pkey")
+    op.execute("ALTER SEQUENCE task_history_id_seq OWNED BY NONE")
+    for index in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("task_history", naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.drop_constraint("fk_task_history_task_id_tasks", type_="foreignkey")
+        with op.batch_alter_table("tasks", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+            pass
+        return
+
+    _detach_legacy()
+
+    op.execute("""
+        CREATE TABLE task_history (
+            id INTEGER NOT NULL DEFAULT nextval('task_history_id_seq'),
+            task_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(50) NOT NULL,
+            old_values JSONB,
+            new_values JSONB,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE task_history_default PARTITION OF task_history DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(timestamp) FROM task_history_legacy")).scalar()
+    now = datetime.utcnow()
+    start = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), PARTITIONS_AHEAD)
+    while start <= last:
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE task_history_{start.year:04d}{start.month:02d} PARTITION OF task_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute(
+        f"INSERT INTO task_history ({COLUMNS}) "
+        f"SELECT id, task_id, user_id, action, old_values, new_values, COALESCE(timestamp, now()) "
+        f"FROM task_history_legacy"
+    )
+    op.execute("DROP TABLE task_history_legacy")
+    op.execute("ALTER SEQUENCE task_history_id_seq OWNED BY task_history.id")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    # History rows of deleted tasks would violate the restored constraint
+    op.execute("DELETE FROM task_history WHERE task_id NOT IN (SELECT id FROM tasks)")
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("tasks", recreate="always"):
+            pass
+        with op.batch_alter_table("task_history", naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.create_foreign_key(
+                "fk_task_history_task_id_tasks", "tasks", ["task_id"], ["id"], ondelete="CASCADE"
+            )
+        return
+
+    _detach_legacy()
+
+    op.execute("""
+        CREATE TABLE task_history (
+            id INTEGER NOT NULL DEFAULT nextval('task_history_id_seq') PRIMARY KEY,
+            task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(50) NOT NULL,
+            old_values JSONB,
+            new_values JSONB,
+            timestamp TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.execute(f"INSERT INTO task_history ({COLUMNS}) SELECT {COLUMNS} FROM task_history_legacy")
+    op.execute("DROP TABLE task_history_legacy CASCADE")
+    op.execute("ALTER SEQUENCE task_history_id_seq OWNED BY task_history.id")
+    _create_indexes()
@@ -0,0 +1,38 @@
+"""Add board snapshots, the starting points for history replay
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONValue = sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "board_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("data", JSONValue, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_board_snapshots_taken_at", "board_snapshots", ["taken_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_board_snapshots_taken_at", table_name="board_snapshots")
+    op.drop_table("board_snapshots")
@@ -0,0 +1,61 @@
+"""Add full-text search over client name, address and description
+
+PostgreSQL gets a GIN index on a weighted tsvector expression (it must stay
+identical to models.task_search_vector). SQLite gets an external-content
+FTS5 table, filled from existing tasks and kept in sync by triggers.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "((setweight(to_tsvector('simple', coalesce(client_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(address, '')), 'B')) || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C'))"
+)
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "client_name, address, description, content='tasks', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, client_name, address, description) "
+    "VALUES (new.id, new.client_name, new.address, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, client_name, address, description) "
+    "VALUES ('delete', old.id, old.client_name, old.address, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF client_name, address, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, client_name, address, description) "
+    "VALUES ('delete', old.id, old.client_name, old.address, old.description); "
+    "INSERT INTO tasks_fts(rowid, client_name, address, description) "
+    "VALUES (new.id, new.client_name, new.address, new.description); END",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(f"CREATE INDEX ix_tasks_search ON tasks USING gin ({SEARCH_VECTOR})")
+    else:
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search")
+    else:
+        for trigger in ("tasks_fts_insert", "tasks_fts_delete", "tasks_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
@@ -0,0 +1,38 @@
+"""Add indexes for task list filters
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_status_priority", "tasks", ["status", "priority_order"])
+    op.create_index("ix_tasks_type_status", "tasks", ["task_type", "status"])
+    op.create_index("ix_tasks_owner_status", "tasks", ["owner_id", "status"])
+    op.create_index("ix_tasks_created_at", "tasks", ["created_at"])
+    op.create_index(
+        "ix_tasks_completed_at", "tasks", ["completed_at"],
+        postgresql_where=sa.text("completed_at IS NOT NULL"),
+        sqlite_where=sa.text("completed_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_completed_at", table_name="tasks")
+    op.drop_index("ix_tasks_created_at", table_name="tasks")
+    op.drop_index("ix_tasks_owner_status", table_name="tasks")
+    op.drop_index("ix_tasks_type_status", table_name="tasks")
+    op.drop_index("ix_tasks_status_priority", table_name="tasks")
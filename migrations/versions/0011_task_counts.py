@@ -0,0 +1,39 @@
+"""Add task_counts table for live board counters
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counts",
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.Column("task_type", sa.String(length=50), nullable=False),
+        sa.Column("processing", sa.String(length=20), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "task_type", "processing"),
+    )
+    # Seed from the current board so the table is correct from the start
+    op.execute(
+        "INSERT INTO task_counts (status, task_type, processing, count) "
+        "SELECT status, task_type, processing, COUNT(*) FROM tasks "
+        "GROUP BY status, task_type, processing"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_counts")
@@ -0,0 +1,35 @@
+"""Add a pattern index for task type prefix filters on PostgreSQL
+
+Prefix filters ("Misc - *") run as LIKE 'prefix%'. Under a non-C collation
+such as en_US.UTF-8 PostgreSQL can only serve that from an index built with
+text_pattern_ops. SQLite compares task types bytewise and keeps using
+ix_tasks_type_status.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index(
+            "ix_tasks_type_pattern", "tasks", ["task_type"],
+            postgresql_ops={"task_type": "text_pattern_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_tasks_type_pattern", table_name="tasks")
@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
 """
 Render deployment startup script
-Handles database initialization and starts the FastAPI server
+Starts the FastAPI server; the app applies pending migrations on startup
 """
 
 import os
-import sys
-import uvicorn
-from backend.database import create_tables
 from backend.config import settings
+from backend.server import serve
 
 def main():
     """Main startup function for Render deployment"""
@@ -17,27 +15,15 @@ def main():
     print(f"Environment: {settings.environment}")
     print(f"Database URL: {settings.database_url[:20]}...")
     
-    # Create database tables
-    print("📦 Creating database tables...")
-    try:
-        create_tables()
-        print("✅ Database tables created successfully")
-    except Exception as e:
-        print(f"❌ Error creating database tables: {e}")
-        sys.exit(1)
+    # Schema migrations run once in the app's startup event
     
     # Get port from environment (Render sets PORT env var)
     port = int(os.environ.get("PORT", 8000))
     
     print(f"🌐 Starting server on port {port}...")
     
-    # Start the server
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=port,
-        log_level="info"
-    )
+    # Start the server; WEB_WORKERS and WEB_MAX_REQUESTS control the worker processes
+    serve(host="0.0.0.0", port=port)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
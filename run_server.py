@@ -7,6 +7,7 @@ import uvicorn
 import os
 import sys
 from pathlib import Path
+from uvicorn.supervisors import ChangeReload
 
 # Add the project root to Python path
 project_root = Path(__file__).parent
@@ -14,6 +15,7 @@ sys.path.insert(0, str(project_root))
 
 # Import the FastAPI app
 from backend.main import app
+from backend.server import build_config
 
 if __name__ == "__main__":
     # Check if .env file exists
@@ -24,15 +26,9 @@ if __name__ == "__main__":
         print("💡 Example: cp .env.example .env")
         print()
     
-    # Development server configuration
-    config = {
-        "app": "backend.main:app",
-        "host": "0.0.0.0",
-        "port": 8000,
-        "reload": True,
-        "log_level": "info",
-        "access_log": True,
-    }
+    # Development server configuration: the production settings (proxy
+    # headers included) plus auto-reload
+    config = build_config("0.0.0.0", 8000, reload=True)
     
     print("🚀 Starting Entrust RE Kanban Backend...")
     print(f"📍 Server will be available at: http://localhost:8000")
@@ -42,7 +38,7 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
-        uvicorn.run(**config)
+        ChangeReload(config, target=uvicorn.Server(config).run, sockets=[config.bind_socket()]).run()
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: the app on a throwaway SQLite database
+
+Settings are read when backend is first imported, so the environment is set
+here before any test module imports it. ENVIRONMENT=test audits every
+request and fails those over their @query_budget.
+"""
+
+import os
+import tempfile
+
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["AUDIT_DURABLE"] = "true"
+os.environ["AUDIT_LOG_DIR"] = ""
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["MAINTENANCE_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.auth import create_access_token
+from backend.database import SessionLocal
+from backend.main import app
+from backend.utils import create_admin_user
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin(client):
+    db = SessionLocal()
+    try:
+        user = create_admin_user(db)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def auth_headers(admin):
+    token = create_access_token({"sub": admin.username, "user_id": admin.id})
+    return {"Authorization": f"Bearer {token}"}
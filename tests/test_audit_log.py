@@ -0,0 +1,69 @@
+"""
+Append-only audit segment log
+"""
+
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from backend.audit_log import SegmentLog
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def segment_log(tmp_path):
+    # Small segments and blocks so the records span several sealed segments
+    log = SegmentLog(str(tmp_path), segment_bytes=4000, block_records=7)
+    for i in range(300):
+        log.append([{
+            "task_id": i % 5,
+            "custom_id": f"ID{i % 5:04d}",
+            "action": "updated",
+            "timestamp": (START + timedelta(minutes=i)).isoformat(),
+            "seq": i,
+        }])
+    yield log
+    log.close()
+
+
+def test_segments_are_sealed(segment_log, tmp_path):
+    assert list(tmp_path.glob("audit-*.log.gz"))
+    assert len(list(segment_log.query())) == 300
+
+
+def test_filters_use_the_sparse_index(segment_log):
+    assert [record["seq"] for record in segment_log.query(task_id=3)] == list(range(3, 300, 5))
+    assert {record["custom_id"] for record in segment_log.query(custom_id="ID0001")} == {"ID0001"}
+
+    window = segment_log.query(since=START + timedelta(minutes=50), until=START + timedelta(minutes=120))
+    assert [record["seq"] for record in window] == list(range(50, 120))
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"task_id": 3},
+    {"custom_id": "ID0001"},
+    {"since": START + timedelta(minutes=50), "until": START + timedelta(minutes=120)},
+])
+def test_newest_first_reverses_the_log(segment_log, filters):
+    oldest_first = [record["seq"] for record in segment_log.query(**filters)]
+    newest_first = [record["seq"] for record in segment_log.query(newest_first=True, **filters)]
+
+    assert oldest_first
+    assert newest_first == oldest_first[::-1]
+
+
+def test_newest_first_stops_early(segment_log):
+    newest = [record["seq"] for record in islice(segment_log.query(task_id=2, newest_first=True), 3)]
+    assert newest == [297, 292, 287]
+
+
+def test_reopened_log_keeps_records(segment_log, tmp_path):
+    segment_log.append([{"task_id": 9, "custom_id": None, "action": "created", "timestamp": START.isoformat()}])
+    segment_log.close()
+
+    reopened = SegmentLog(str(tmp_path), segment_bytes=4000, block_records=7)
+    assert len(list(reopened.query())) == 301
+    reopened.close()
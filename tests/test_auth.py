@@ -0,0 +1,47 @@
+"""
+Registration, login and logout
+"""
+
+
+def register(client, username: str, password: str = "correct horse"):
+    return client.post("/api/v1/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": password
+    })
+
+
+def test_register_and_login(client):
+    assert register(client, "alice").status_code == 201
+
+    response = client.post("/api/v1/auth/login-json", json={"username": "alice", "password": "correct horse"})
+    assert response.status_code == 200
+    assert response.json()["user"]["username"] == "alice"
+
+
+def test_form_login(client):
+    register(client, "erin")
+    response = client.post("/api/v1/auth/login", data={"username": "erin", "password": "correct horse"})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+def test_register_rejects_duplicates(client):
+    assert register(client, "bob").status_code == 201
+    assert register(client, "bob").status_code == 400
+
+
+def test_login_rejects_wrong_password(client):
+    register(client, "carol")
+    response = client.post("/api/v1/auth/login-json", json={"username": "carol", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_the_token(client):
+    register(client, "dave")
+    token = client.post(
+        "/api/v1/auth/login-json", json={"username": "dave", "password": "correct horse"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
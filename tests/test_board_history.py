@@ -0,0 +1,146 @@
+"""
+Point-in-time board reconstruction and single-task undo
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend.board_history import apply_entry, take_board_snapshot, undo_target
+from backend.database import SessionLocal
+
+
+def create_task(client, headers, **fields):
+    fields.setdefault("client_name", "History Client")
+    fields.setdefault("task_type", "BDL")
+    response = client.post("/api/v1/tasks/", headers=headers, json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def board(client, headers, as_of):
+    response = client.get("/api/v1/history/board", headers=headers, params={"as_of": as_of.isoformat()})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def board_task(body, task_id):
+    return next((task for task in body["tasks"] if task["id"] == task_id), None)
+
+
+def test_apply_entry_folds_changes():
+    state = {}
+    apply_entry(state, 1, "created", None, {"client_name": "A", "status": "todo"})
+    apply_entry(state, 1, "moved", {"status": "todo"}, {"status": "done"})
+    assert state[1]["client_name"] == "A" and state[1]["status"] == "done"
+
+    apply_entry(state, 1, "deleted", {"status": "done"}, None)
+    assert state == {}
+
+
+def test_apply_entry_starts_unknown_tasks_from_old_values():
+    # Older history of the task was archived
+    state = {}
+    apply_entry(state, 7, "updated", {"client_name": "A", "status": "todo"}, {"status": "done"})
+    assert state[7]["client_name"] == "A" and state[7]["status"] == "done"
+
+
+def test_each_undo_cancels_one_older_entry():
+    entries = [
+        SimpleNamespace(id=4, action="undone"),
+        SimpleNamespace(id=3, action="undone"),
+        SimpleNamespace(id=2, action="moved"),
+        SimpleNamespace(id=1, action="updated"),
+        SimpleNamespace(id=0, action="created"),
+    ]
+    assert undo_target(entries).id == 0
+    assert undo_target(entries[2:]).id == 2
+
+
+def test_board_as_of_replays_history(client, auth_headers):
+    task = create_task(client, auth_headers)
+    before_move = datetime.utcnow()
+    client.post(f"/api/v1/tasks/{task['id']}/move", headers=auth_headers, params={"new_status": "in-review"})
+
+    assert board_task(board(client, auth_headers, before_move), task["id"])["status"] == "todo"
+    assert board_task(board(client, auth_headers, datetime.utcnow()), task["id"])["status"] == "in-review"
+
+
+def test_board_as_of_starts_from_snapshot(client, auth_headers):
+    task = create_task(client, auth_headers)
+    db = SessionLocal()
+    try:
+        take_board_snapshot(db)
+    finally:
+        db.close()
+    client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"description": "After snapshot"})
+
+    body = board(client, auth_headers, datetime.utcnow())
+    assert body["snapshot_taken_at"] is not None
+    assert body["replayed"] >= 1
+    assert board_task(body, task["id"])["description"] == "After snapshot"
+
+
+def test_board_as_of_omits_deleted_tasks(client, auth_headers):
+    task = create_task(client, auth_headers)
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    assert board_task(board(client, auth_headers, datetime.utcnow()), task["id"]) is None
+
+
+def test_undo_steps_back_through_history(client, auth_headers):
+    task = create_task(client, auth_headers, description="First")
+    client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"description": "Second"})
+    client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"description": "Third"})
+
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.json()["task"]["description"] == "Second"
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.json()["task"]["description"] == "First"
+
+
+def test_undo_delete_restores_the_task(client, auth_headers):
+    task = create_task(client, auth_headers, address="1 Main St")
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    restored = client.get(f"/api/v1/tasks/{task['id']}", headers=auth_headers).json()
+    assert restored["custom_id"] == task["custom_id"]
+    assert restored["address"] == "1 Main St"
+
+
+def test_undo_create_deletes_the_task(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.status_code == 200
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=auth_headers).status_code == 404
+
+
+def test_undo_update_restores_priority_order(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"priority_order": 42})
+    assert response.json()["priority_order"] == 42
+
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["task"]["priority_order"] == task["priority_order"]
+
+
+def test_undo_status_change_restores_completed_at(client, auth_headers):
+    task = create_task(client, auth_headers)
+    done = client.post(f"/api/v1/tasks/{task['id']}/move", headers=auth_headers, params={"new_status": "done"})
+    completed_at = done.json()["task"]["completed_at"]
+    client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"status": "in-review"})
+
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.json()["task"]["status"] == "done"
+    assert response.json()["task"]["completed_at"] == completed_at
+
+
+def test_undo_delete_restores_completed_at(client, auth_headers):
+    task = create_task(client, auth_headers)
+    done = client.post(f"/api/v1/tasks/{task['id']}/move", headers=auth_headers, params={"new_status": "done"})
+    completed_at = done.json()["task"]["completed_at"]
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+
+    response = client.post(f"/api/v1/tasks/{task['id']}/undo", headers=auth_headers)
+    assert response.json()["task"]["completed_at"] == completed_at
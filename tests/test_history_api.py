@@ -0,0 +1,73 @@
+"""
+Task history API: keyset pagination and filters
+"""
+
+import pytest
+
+
+def create_task(client, headers, **fields):
+    fields.setdefault("client_name", "Paged Client")
+    fields.setdefault("task_type", "BDL")
+    response = client.post("/api/v1/tasks/", headers=headers, json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def history(client, headers, **params):
+    response = client.get("/api/v1/history/", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def edited_task(client, auth_headers):
+    task = create_task(client, auth_headers)
+    for n in range(6):
+        client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"description": f"Edit {n}"})
+    return task
+
+
+def test_cursor_walks_every_entry_once(client, auth_headers, edited_task):
+    everything = history(client, auth_headers, task_id=edited_task["id"], limit=100)["items"]
+    assert len(everything) == 7
+
+    seen, cursor = [], None
+    while True:
+        params = {"task_id": edited_task["id"], "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = history(client, auth_headers, **params)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [item["id"] for item in everything]
+    timestamps = [item["timestamp"] for item in everything]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def test_last_page_has_no_cursor(client, auth_headers, edited_task):
+    page = history(client, auth_headers, task_id=edited_task["id"], limit=7)
+    assert len(page["items"]) == 7
+    assert page["next_cursor"] is None
+
+
+def test_custom_id_lookup(client, auth_headers, edited_task):
+    page = history(client, auth_headers, custom_id=f"re-{edited_task['custom_id']}", limit=100)
+    assert {item["task_id"] for item in page["items"]} == {edited_task["id"]}
+
+
+def test_field_transition_filter(client, auth_headers):
+    task = create_task(client, auth_headers)
+    client.post(f"/api/v1/tasks/{task['id']}/move", headers=auth_headers, params={"new_status": "in-review"})
+    client.post(f"/api/v1/tasks/{task['id']}/move", headers=auth_headers, params={"new_status": "done"})
+
+    page = history(client, auth_headers, task_id=task["id"], field="status", to_value="done")
+    assert [item["action"] for item in page["items"]] == ["moved"]
+    assert page["items"][0]["new_values"]["status"] == "done"
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers):
+    response = client.get("/api/v1/history/", headers=auth_headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
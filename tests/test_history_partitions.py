@@ -0,0 +1,97 @@
+"""
+Monthly rollover, query routing and retention of task history on SQLite
+"""
+
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.history_partitions import (
+    add_months, apply_history_retention, ensure_history_partitions, history_sources, month_start
+)
+from backend.models import Base, TaskHistory
+
+CURRENT = month_start(datetime.utcnow())
+TWO_MONTHS_AGO = add_months(CURRENT, -2)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/history.db")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([
+        TaskHistory(task_id=1, user_id=1, action="created", timestamp=TWO_MONTHS_AGO + timedelta(days=3)),
+        TaskHistory(task_id=1, user_id=1, action="updated", timestamp=TWO_MONTHS_AGO + timedelta(days=4)),
+        TaskHistory(task_id=1, user_id=1, action="moved", timestamp=datetime.utcnow()),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def source_names(db, **bounds):
+    return [table.name for table in history_sources(db, **bounds)]
+
+
+def test_rollover_moves_closed_months(db):
+    assert ensure_history_partitions(db) == 2
+
+    name = f"task_history_{TWO_MONTHS_AGO:%Y%m}"
+    assert name in inspect(db.get_bind()).get_table_names()
+    assert [row.action for row in db.execute(select(TaskHistory.action))] == ["moved"]
+    assert ensure_history_partitions(db) == 0
+
+
+def test_sources_cover_only_overlapping_months(db):
+    ensure_history_partitions(db)
+    old = f"task_history_{TWO_MONTHS_AGO:%Y%m}"
+
+    assert source_names(db) == ["task_history", old]
+    assert source_names(db, since=CURRENT) == ["task_history"]
+    assert source_names(db, since=TWO_MONTHS_AGO, until=TWO_MONTHS_AGO + timedelta(days=5)) == ["task_history", old]
+
+
+def test_aware_bounds_are_compared_in_utc(db):
+    ensure_history_partitions(db)
+    old = f"task_history_{TWO_MONTHS_AGO:%Y%m}"
+    month_after = add_months(TWO_MONTHS_AGO, 1)
+
+    # 00:30 at UTC+01:00 on the 1st is still the previous month in UTC
+    since = (month_after + timedelta(minutes=30)).replace(tzinfo=timezone(timedelta(hours=1)))
+    assert old in source_names(db, since=since)
+
+    # 00:30 at UTC+01:00 on the 1st of the old month is still the month before
+    until = (TWO_MONTHS_AGO + timedelta(minutes=30)).replace(tzinfo=timezone(timedelta(hours=1)))
+    assert old not in source_names(db, until=until)
+
+
+def test_retention_exports_then_drops_months(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "history_retention_months", 1)
+    monkeypatch.setattr(settings, "history_archive_dir", str(tmp_path / "archive"))
+    ensure_history_partitions(db)
+    name = f"task_history_{TWO_MONTHS_AGO:%Y%m}"
+
+    assert apply_history_retention(db) == 2
+    assert name not in inspect(db.get_bind()).get_table_names()
+    with gzip.open(tmp_path / "archive" / f"{name}.jsonl.gz", "rt") as archive:
+        assert len(archive.readlines()) == 2
+    assert source_names(db) == ["task_history"]
+
+
+def test_deleted_task_ids_are_not_reused(client, auth_headers):
+    # History outlives its task, so a reused id would inherit it
+    def create():
+        fields = {"client_name": "Id Client", "task_type": "BDL"}
+        response = client.post("/api/v1/tasks/", headers=auth_headers, json=fields)
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    deleted = create()
+    client.delete(f"/api/v1/tasks/{deleted}", headers=auth_headers)
+    assert create() > deleted
@@ -0,0 +1,71 @@
+"""
+Prometheus /metrics endpoint
+"""
+
+import threading
+
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from backend.config import Settings
+from backend.metrics import Metrics, QueryTally, current_tally
+
+
+def test_metrics_render_requested_routes(client, auth_headers):
+    client.get("/api/v1/tasks/counts", headers=auth_headers)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'route="/api/v1/tasks/counts"' in response.text
+    assert "teg_tms_db_queries_total" in response.text
+
+
+def test_metrics_need_a_token_in_production():
+    assert not Settings(environment="production", metrics_token=None).metrics_enabled
+    assert Settings(environment="production", metrics_token="secret").metrics_enabled
+    assert Settings(environment="development", metrics_token=None).metrics_enabled
+
+
+def test_statements_from_threads_are_all_counted(tmp_path):
+    registry = Metrics()
+    engine = create_engine(f"sqlite:///{tmp_path}/metrics.db")
+    registry.instrument_engine(engine)
+
+    def run_queries():
+        with engine.connect() as conn:
+            for _ in range(200):
+                conn.execute(text("SELECT 1"))
+
+    threads = [threading.Thread(target=run_queries) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    assert registry.db_queries == 800
+    assert sum(registry.db_query_seconds.counts) == 800
+
+
+def test_requests_tally_statements_only_with_an_instrumented_engine():
+    seen = []
+
+    async def endpoint(request):
+        seen.append(current_tally.get())
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/", endpoint)])
+    registry = Metrics()
+    registry.instrument_app(app)
+    with TestClient(app) as test_client:
+        test_client.get("/")
+        registry.tracks_queries = True
+        test_client.get("/")
+
+    assert seen[0] is None and isinstance(seen[1], QueryTally)
+    assert sum(registry.routes[0].db_queries.counts) == 1
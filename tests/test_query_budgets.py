@@ -0,0 +1,171 @@
+"""
+Task endpoints stay within their SQL query budgets
+
+ENVIRONMENT=test audits every request: the X-Query-Count header carries
+the statements it ran and a request over its endpoint's @query_budget fails
+with a 500. Each test drives one endpoint and compares the count with the
+budget; writes run with AUDIT_DURABLE, so they include the history insert.
+"""
+
+import pytest
+from sqlalchemy import select
+
+from backend.database import SessionLocal
+from backend.main import app
+from backend.models import Task
+from backend.query_audit import QueryBudgetExceeded, count_queries
+
+# Endpoints exercised so far, checked against every budgeted endpoint last
+covered = set()
+
+
+def endpoint_for(method: str, path: str):
+    for route in app.routes:
+        match, _ = route.matches({"type": "http", "path": path, "method": method})
+        if match.name == "FULL":
+            return getattr(route, "endpoint", None)
+    return None
+
+
+def call(client, method: str, url: str, headers=None, **kwargs):
+    """Make a request and assert it ran no more statements than its budget"""
+    response = client.request(method, url, headers=headers, **kwargs)
+    endpoint = endpoint_for(method, response.request.url.path)
+    budget = getattr(endpoint, "query_budget", None)
+    assert budget is not None, f"{method} {url} has no @query_budget"
+    covered.add(endpoint)
+
+    body = response.json()
+    if isinstance(body, dict):
+        assert body.get("detail") != "Query budget exceeded", body.get("error")
+    assert int(response.headers["X-Query-Count"]) <= budget
+    return response
+
+
+def create_task(client, headers, **fields):
+    fields.setdefault("client_name", "Budget Client")
+    fields.setdefault("task_type", "BDL")
+    response = call(client, "POST", "/api/v1/tasks/", headers, json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_create_task(client, auth_headers):
+    create_task(client, auth_headers)
+
+
+def test_list_tasks(client, auth_headers):
+    create_task(client, auth_headers)
+    response = call(client, "GET", "/api/v1/tasks/", auth_headers)
+    assert response.status_code == 200
+    assert response.json()
+
+
+def test_get_task(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "GET", f"/api/v1/tasks/{task['id']}", auth_headers)
+    assert response.status_code == 200
+    assert response.json()["custom_id"] == task["custom_id"]
+
+
+def test_search_tasks(client, auth_headers):
+    create_task(client, auth_headers, client_name="Searchable Holdings")
+    response = call(client, "GET", "/api/v1/tasks/search", auth_headers, params={"q": "Searchable"})
+    assert response.status_code == 200
+    assert response.json()
+
+
+def test_client_name_suggestions(client, auth_headers):
+    create_task(client, auth_headers, client_name="Suggested Ltd")
+    response = call(client, "GET", "/api/v1/tasks/client-names", auth_headers, params={"q": "Sugg"})
+    assert response.status_code == 200
+
+
+def test_task_counts(client, auth_headers):
+    response = call(client, "GET", "/api/v1/tasks/counts", auth_headers)
+    assert response.status_code == 200
+
+
+def test_update_task(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "PUT", f"/api/v1/tasks/{task['id']}", auth_headers, json={"description": "Checked"})
+    assert response.status_code == 200
+    assert response.json()["description"] == "Checked"
+
+
+def test_move_and_undo(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "POST", f"/api/v1/tasks/{task['id']}/move", auth_headers, params={"new_status": "in-review"})
+    assert response.status_code == 200
+
+    response = call(client, "POST", f"/api/v1/tasks/{task['id']}/undo", auth_headers)
+    assert response.status_code == 200
+
+
+def test_undo_delete(client, auth_headers):
+    task = create_task(client, auth_headers)
+    call(client, "DELETE", f"/api/v1/tasks/{task['id']}", auth_headers)
+
+    response = call(client, "POST", f"/api/v1/tasks/{task['id']}/undo", auth_headers)
+    assert response.status_code == 200
+    assert response.json()["task"]["custom_id"] == task["custom_id"]
+
+
+def test_undo_create(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "POST", f"/api/v1/tasks/{task['id']}/undo", auth_headers)
+    assert response.status_code == 200
+
+
+def test_delete_task(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "DELETE", f"/api/v1/tasks/{task['id']}", auth_headers)
+    assert response.status_code == 200
+
+
+def test_clear_done_is_batched(client, auth_headers):
+    # Per-task statements would push several tasks over the budget
+    for _ in range(5):
+        task = create_task(client, auth_headers)
+        call(client, "POST", f"/api/v1/tasks/{task['id']}/move", auth_headers, params={"new_status": "done"})
+
+    response = call(client, "DELETE", "/api/v1/tasks/clear-done", auth_headers)
+    assert response.status_code == 200
+
+
+def test_guest_task_status(client, auth_headers):
+    task = create_task(client, auth_headers)
+    response = call(client, "GET", f"/api/v1/guest/task-status/RE-{task['custom_id']}")
+    assert response.status_code == 200
+
+
+def test_count_queries_enforces_budget():
+    db = SessionLocal()
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            with count_queries(max_queries=1, label="two selects"):
+                db.execute(select(Task.id)).all()
+                db.execute(select(Task.id)).all()
+    finally:
+        db.close()
+
+
+def test_count_queries_reports_repeated_statements():
+    db = SessionLocal()
+    try:
+        with count_queries() as log:
+            for task_id in range(5):
+                db.execute(select(Task).where(Task.id == task_id)).first()
+    finally:
+        db.close()
+
+    (shape, count), = log.repeated(threshold=5)
+    assert count == 5 and "FROM tasks" in shape
+
+
+def test_every_budgeted_endpoint_is_covered():
+    budgeted = {
+        route.endpoint for route in app.routes
+        if getattr(getattr(route, "endpoint", None), "query_budget", None) is not None
+    }
+    assert budgeted - covered == set()
@@ -0,0 +1,99 @@
+"""
+Token-bucket rate limiting of the public endpoints
+"""
+
+import pytest
+import yaml
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from backend import rate_limit
+from backend.config import settings
+from backend.rate_limit import RateLimiter, guest_limiter
+from backend.server import build_config
+
+KEY = ("/api/v1/guest/task-status/{custom_id}", "203.0.113.9")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_retry_after(clock):
+    limiter = RateLimiter(per_minute=60, burst=3)
+    assert [limiter.acquire(KEY) for _ in range(3)] == [None, None, None]
+    assert limiter.acquire(KEY) == 1
+
+
+def test_buckets_refill(clock):
+    limiter = RateLimiter(per_minute=30, burst=1)
+    assert limiter.acquire(KEY) is None
+    assert limiter.acquire(KEY) == 2
+
+    clock[0] += 2
+    assert limiter.acquire(KEY) is None
+
+
+def test_clients_have_separate_buckets(clock):
+    limiter = RateLimiter(per_minute=60, burst=1)
+    assert limiter.acquire(KEY) is None
+    assert limiter.acquire((KEY[0], "198.51.100.7")) is None
+    assert limiter.acquire(KEY) is not None
+
+
+def test_least_recently_used_bucket_is_evicted(clock):
+    limiter = RateLimiter(per_minute=60, burst=1, max_buckets=2)
+    for client in ("a", "b", "c"):
+        limiter.acquire((KEY[0], client))
+    assert len(limiter) == 2
+    # "a" was evicted, so it starts again with a full bucket
+    assert limiter.acquire((KEY[0], "a")) is None
+
+
+def test_guest_lookup_returns_429(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    guest_limiter.reset()
+    try:
+        statuses = [
+            client.get("/api/v1/guest/task-status/RE-ZZZZZZ").status_code
+            for _ in range(settings.guest_rate_limit_burst + 1)
+        ]
+    finally:
+        guest_limiter.reset()
+
+    assert 429 not in statuses[:-1]
+    assert statuses[-1] == 429
+
+
+async def forwarded_client(trusted: str, peer: str) -> str:
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["client"] = scope["client"][0]
+
+    scope = {
+        "type": "http",
+        "client": (peer, 50000),
+        "headers": [(b"x-forwarded-for", b"203.0.113.9")],
+    }
+    await ProxyHeadersMiddleware(app, trusted_hosts=trusted)(scope, None, None)
+    return seen["client"]
+
+
+@pytest.mark.asyncio
+async def test_render_trusts_only_its_private_network():
+    with open("render.yaml") as f:
+        service = yaml.safe_load(f)["services"][0]
+    trusted = next(var["value"] for var in service["envVars"] if var["key"] == "TRUSTED_PROXY_IPS")
+
+    assert "*" not in trusted
+    assert await forwarded_client(trusted, "10.12.0.5") == "203.0.113.9"
+    assert await forwarded_client(trusted, "198.51.100.7") == "198.51.100.7"
+
+
+def test_every_launcher_reads_proxy_headers():
+    config = build_config("127.0.0.1", 8000)
+    assert config.proxy_headers
+    assert config.forwarded_allow_ips == settings.trusted_proxy_ips
@@ -0,0 +1,91 @@
+"""
+Read-replica routing and read-your-writes pinning
+"""
+
+import time
+
+import pytest
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from starlette.requests import Request
+
+from backend.auth import create_access_token
+from backend.database import engine as primary_engine
+from backend.models import Base
+from backend.read_replica import READ_PRIMARY_COOKIE, ReplicaRouter, get_current_read_user
+
+
+def request(token=None, cookie=False):
+    headers = []
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    if cookie:
+        headers.append((b"cookie", f"{READ_PRIMARY_COOKIE}=1".encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def bind_of(router, incoming):
+    db = router.session(incoming)
+    try:
+        return db.get_bind()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def token(admin):
+    return create_access_token({"sub": admin.username, "user_id": admin.id})
+
+
+def test_without_replica_reads_use_the_primary():
+    router = ReplicaRouter(None, max_lag=5, check_interval=5, pin_seconds=5)
+    assert bind_of(router, request()) is primary_engine
+
+
+def test_caught_up_replica_serves_reads(replica, token):
+    router = ReplicaRouter(replica, max_lag=5, check_interval=5, pin_seconds=5)
+    assert bind_of(router, request(token)) is replica
+    assert router.stats()["replica_reads"] == 1
+
+
+def test_lagging_or_unreachable_replica_falls_back(replica, tmp_path):
+    lagging = ReplicaRouter(replica, max_lag=-1, check_interval=5, pin_seconds=5)
+    assert bind_of(lagging, request()) is primary_engine
+    assert lagging.primary_reads["lagging"] == 1
+
+    missing = create_engine(f"sqlite:///{tmp_path}/missing/replica.db")
+    unreachable = ReplicaRouter(missing, max_lag=5, check_interval=5, pin_seconds=5)
+    assert bind_of(unreachable, request()) is primary_engine
+    assert unreachable.primary_reads["unavailable"] == 1
+
+
+def test_writers_are_pinned_to_the_primary(replica, token):
+    router = ReplicaRouter(replica, max_lag=5, check_interval=5, pin_seconds=0.2)
+    response = Response()
+    router.pin_writer(request(token), response)
+
+    assert READ_PRIMARY_COOKIE in response.headers["set-cookie"]
+    assert bind_of(router, request(token)) is primary_engine
+    assert bind_of(router, request(cookie=True)) is primary_engine
+    assert bind_of(router, request()) is replica
+
+    time.sleep(0.25)
+    assert bind_of(router, request(token)) is replica
+
+
+def test_user_missing_on_replica_is_loaded_from_primary(replica, admin, token):
+    db = ReplicaRouter(replica, max_lag=5, check_interval=5, pin_seconds=5).session(request(token))
+    try:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        assert get_current_read_user(credentials, db).id == admin.id
+    finally:
+        db.close()
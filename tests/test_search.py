@@ -0,0 +1,56 @@
+"""
+Full-text task search
+"""
+
+from backend.search import MAX_TERMS, search_terms
+
+
+def create_task(client, headers, **fields):
+    fields.setdefault("task_type", "BDL")
+    response = client.post("/api/v1/tasks/", headers=headers, json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def search(client, headers, q, **params):
+    response = client.get("/api/v1/tasks/search", headers=headers, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [task["id"] for task in response.json()]
+
+
+def test_search_terms():
+    assert search_terms("Smith, REALTY!") == ["smith", "realty"]
+    assert len(search_terms(" ".join(f"w{i}" for i in range(20)))) == MAX_TERMS
+
+
+def test_every_term_is_a_prefix(client, auth_headers):
+    task = create_task(client, auth_headers, client_name="Quillfeather Realty")
+    create_task(client, auth_headers, client_name="Quillfeather Holdings")
+
+    assert search(client, auth_headers, "quill rea") == [task["id"]]
+
+
+def test_client_name_matches_rank_first(client, auth_headers):
+    described = create_task(client, auth_headers, client_name="Other", description="for Marrowind")
+    named = create_task(client, auth_headers, client_name="Marrowind Trust")
+
+    assert search(client, auth_headers, "marrowind") == [named["id"], described["id"]]
+
+
+def test_status_filter(client, auth_headers):
+    todo = create_task(client, auth_headers, client_name="Thistlewood")
+    done = create_task(client, auth_headers, client_name="Thistlewood")
+    client.post(f"/api/v1/tasks/{done['id']}/move", headers=auth_headers, params={"new_status": "done"})
+
+    assert search(client, auth_headers, "thistlewood", status="todo") == [todo["id"]]
+
+
+def test_index_follows_updates_and_deletes(client, auth_headers):
+    task = create_task(client, auth_headers, client_name="Brackenfold")
+    client.put(f"/api/v1/tasks/{task['id']}", headers=auth_headers, json={"client_name": "Gorsemere"})
+
+    assert search(client, auth_headers, "brackenfold") == []
+    assert search(client, auth_headers, "gorsemere") == [task["id"]]
+
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    assert search(client, auth_headers, "gorsemere") == []
@@ -0,0 +1,67 @@
+"""
+Batched cleanup of expired sessions
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from backend.auth import cleanup_expired_sessions
+from backend.database import SessionLocal, engine
+from backend.models import UserSession
+from backend.session_store import new_token_id
+
+
+@pytest.fixture
+def db(admin):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def add_sessions(db, user_id, count, expires_at, is_active=True):
+    db.add_all(
+        UserSession(user_id=user_id, token_id=new_token_id(), expires_at=expires_at, is_active=is_active)
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def expired_count(db):
+    return db.query(UserSession).filter(UserSession.expires_at < datetime.utcnow()).count()
+
+
+def test_expired_sessions_are_deleted_in_batches(db, admin):
+    past = datetime.utcnow() - timedelta(hours=1)
+    future = datetime.utcnow() + timedelta(hours=1)
+    add_sessions(db, admin.id, 7, past)
+    add_sessions(db, admin.id, 3, past, is_active=False)
+    add_sessions(db, admin.id, 2, future)
+    live = db.query(UserSession).filter(UserSession.expires_at > datetime.utcnow()).count()
+
+    deletes = []
+
+    def count_deletes(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM user_sessions"):
+            deletes.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_deletes)
+    try:
+        deleted = cleanup_expired_sessions(db, batch_size=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_deletes)
+
+    assert deleted == 10
+    assert expired_count(db) == 0
+    assert db.query(UserSession).count() == live
+    # Active sessions in batches of 3, 3 and 1, then the 3 inactive ones
+    assert len(deletes) == 4
+
+
+def test_max_batches_bounds_one_run(db, admin):
+    add_sessions(db, admin.id, 5, datetime.utcnow() - timedelta(hours=1))
+
+    assert cleanup_expired_sessions(db, batch_size=2, max_batches=2) == 4
+    assert expired_count(db) == 1
+    assert cleanup_expired_sessions(db, batch_size=2) == 1
@@ -0,0 +1,102 @@
+"""
+SQLite single-writer queue
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.config import settings
+from backend.sqlite_tuning import WriterQueue, install_sqlite_profile, writer_queue
+
+
+def test_writers_are_served_in_order():
+    queue = WriterQueue()
+    assert queue.acquire(1)
+    order = []
+
+    def writer(name):
+        assert queue.acquire(5)
+        order.append(name)
+        queue.release()
+
+    threads = []
+    for name in ("first", "second", "third"):
+        thread = threading.Thread(target=writer, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while queue.stats()["waiting"] < len(threads):
+            time.sleep(0.001)
+
+    queue.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["first", "second", "third"]
+
+
+def test_acquire_times_out():
+    queue = WriterQueue()
+    assert queue.acquire(1)
+    assert not queue.acquire(0.01)
+    assert queue.stats()["timeouts"] == 1
+
+
+@pytest.fixture
+def queued_engine(tmp_path, monkeypatch):
+    # Only the queue: switching a busy database to WAL on connect can fail
+    monkeypatch.setattr(settings, "sqlite_pragmas_enabled", False)
+    monkeypatch.setattr(settings, "sqlite_single_writer", True)
+    engine = create_engine(f"sqlite:///{tmp_path}/writer.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+def test_lock_is_held_until_commit_finishes(queued_engine):
+    held_during_commit = []
+    do_commit = queued_engine.dialect.do_commit
+
+    def commit(connection):
+        held_during_commit.append(writer_queue._held)
+        do_commit(connection)
+
+    queued_engine.dialect.do_commit = commit
+    install_sqlite_profile(queued_engine)
+
+    with queued_engine.begin() as conn:
+        conn.execute(text("INSERT INTO items (name) VALUES ('a')"))
+    assert held_during_commit == [True]
+    assert not writer_queue._held
+
+
+def test_lock_is_released_on_rollback(queued_engine):
+    install_sqlite_profile(queued_engine)
+    with queued_engine.connect() as conn:
+        conn.execute(text("INSERT INTO items (name) VALUES ('a')"))
+        assert writer_queue._held
+        conn.rollback()
+        assert not writer_queue._held
+
+
+def test_concurrent_writers_are_serialized(queued_engine):
+    install_sqlite_profile(queued_engine)
+    queued_before = writer_queue.stats()["queued"]
+
+    def writer(n):
+        with queued_engine.begin() as conn:
+            conn.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": str(n)})
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with queued_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 5
+    assert writer_queue.stats()["queued"] > queued_before
+    assert not writer_queue._held
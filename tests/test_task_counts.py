@@ -0,0 +1,86 @@
+"""
+Live board counters
+"""
+
+from collections import Counter
+
+from sqlalchemy import func
+
+from backend.database import SessionLocal
+from backend.models import Task
+from backend.task_counts import TaskCounters, task_counters
+
+
+def create_task(client, headers, **fields):
+    fields.setdefault("client_name", "Counted Client")
+    fields.setdefault("task_type", "BDL")
+    response = client.post("/api/v1/tasks/", headers=headers, json=fields)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def counts(client, headers):
+    response = client.get("/api/v1/tasks/counts", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def table_counts():
+    db = SessionLocal()
+    try:
+        rows = db.query(Task.status, func.count(Task.id)).group_by(Task.status).all()
+    finally:
+        db.close()
+    return {status: count for status, count in rows}
+
+
+def test_counts_follow_every_write(client, auth_headers):
+    counts(client, auth_headers)  # Loads the counters
+    first = create_task(client, auth_headers)
+    second = create_task(client, auth_headers, task_type="SDL")
+    client.post(f"/api/v1/tasks/{first['id']}/move", headers=auth_headers, params={"new_status": "done"})
+    client.put(f"/api/v1/tasks/{second['id']}", headers=auth_headers, json={"status": "in-review"})
+    create_task(client, auth_headers)
+    client.delete(f"/api/v1/tasks/{second['id']}", headers=auth_headers)
+    client.delete("/api/v1/tasks/clear-done", headers=auth_headers)
+
+    body = counts(client, auth_headers)
+    assert {status: n for status, n in body["status"].items() if n} == table_counts()
+    assert body["total"] == sum(table_counts().values())
+
+
+def test_rolled_back_changes_are_not_counted(client, auth_headers, admin):
+    before = counts(client, auth_headers)["total"]
+    db = SessionLocal()
+    try:
+        db.add(Task(custom_id="ROLLBK", client_name="Gone", task_type="BDL", owner_id=admin.id))
+        db.flush()
+        db.rollback()
+    finally:
+        db.close()
+
+    assert counts(client, auth_headers)["total"] == before
+
+
+def test_reload_matches_the_live_counters(client, auth_headers):
+    create_task(client, auth_headers, task_type="KDL")
+    live = counts(client, auth_headers)
+
+    reloaded = TaskCounters()
+    db = SessionLocal()
+    try:
+        reloaded.load(db)
+    finally:
+        db.close()
+
+    assert reloaded.snapshot() == task_counters.snapshot() == live
+
+
+def test_count_filters_by_any_field():
+    counters = TaskCounters()
+    counters.apply([(None, ("todo", "BDL", "normal")), (None, ("todo", "SDL", "urgent")), (None, ("done", "BDL", "normal"))])
+
+    assert counters.count(status="todo") == 2
+    assert counters.count(task_type="BDL", processing="normal") == 2
+    counters.apply([(("todo", "SDL", "urgent"), ("done", "SDL", "urgent"))])
+    assert counters.snapshot()["status"] == Counter({"done": 2, "todo": 1})
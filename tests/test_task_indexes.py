@@ -0,0 +1,78 @@
+"""
+Task list filters are served by indexes
+
+Captures the SQL GET /api/v1/tasks/ runs for each common filter combination
+and checks that EXPLAIN QUERY PLAN searches the expected index instead of
+scanning the tasks table.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from backend.database import SessionLocal, engine
+from backend.routers.tasks import task_type_filter
+from backend.utils import create_sample_tasks
+
+# (filters, index expected in the plan)
+CASES = [
+    ({"status": "todo"}, "ix_tasks_status_priority"),
+    ({"task_type": "BDL"}, "ix_tasks_type_status"),
+    ({"task_type": "Misc - *"}, "ix_tasks_type_status"),
+    ({"task_type": "BDL", "status": "done"}, "ix_tasks_type_status"),
+    ({"owner_id": 1}, "ix_tasks_owner_status"),
+    ({"owner_id": 1, "status": "in-review"}, "ix_tasks_owner_status"),
+    ({"created_after": "2024-01-01T00:00:00", "created_before": "2024-02-01T00:00:00"}, "ix_tasks_created_at"),
+    ({"completed_after": "2024-01-01T00:00:00"}, "ix_tasks_completed_at"),
+]
+
+
+@pytest.fixture(scope="module")
+def sample_tasks(admin):
+    db = SessionLocal()
+    try:
+        create_sample_tasks(db, admin.id)
+    finally:
+        db.close()
+
+
+def task_list_statement(client, auth_headers, filters):
+    """The last SELECT on tasks run while listing tasks with `filters`"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM tasks" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/api/v1/tasks/", params=filters, headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, response.text
+    return captured[-1]
+
+
+@pytest.mark.parametrize("filters, expected", CASES, ids=[str(filters) for filters, _ in CASES])
+def test_filter_uses_index(client, auth_headers, sample_tasks, filters, expected):
+    statement, parameters = task_list_statement(client, auth_headers, filters)
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = [row[-1] for row in plan]
+
+    assert any(expected in detail for detail in details), details
+    assert not any(detail.startswith("SCAN tasks") for detail in details), details
+
+
+def test_task_type_prefix_matches_only_the_prefix(client, auth_headers, sample_tasks):
+    response = client.get("/api/v1/tasks/", params={"task_type": "Misc - *"}, headers=auth_headers)
+    assert response.status_code == 200
+    types = {task["task_type"] for task in response.json()}
+    assert types and all(task_type.startswith("Misc - ") for task_type in types)
+
+
+def test_task_type_prefix_on_postgresql_uses_like():
+    compiled = task_type_filter("Misc - 5%*", "postgresql").compile(dialect=postgresql.dialect())
+
+    assert "LIKE" in str(compiled) and "ESCAPE" in str(compiled)
+    assert compiled.params["task_type_1"] == "Misc - 5/%"
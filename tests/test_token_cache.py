@@ -0,0 +1,54 @@
+"""
+Verified JWT cache
+"""
+
+import time
+
+from backend.auth import create_access_token, verify_token
+from backend.token_cache import TokenCache, token_cache
+
+
+def test_hits_until_the_token_expires():
+    cache = TokenCache(max_size=4)
+    cache.put("live", "claims", time.time() + 60)
+    cache.put("stale", "claims", time.time() - 1)
+
+    assert cache.get("live") == "claims"
+    assert cache.get("stale") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(max_size=2)
+    expires = time.time() + 60
+    cache.put("a", 1, expires)
+    cache.put("b", 2, expires)
+    cache.get("a")
+    cache.put("c", 3, expires)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_discard_token_id_purges_the_entry():
+    cache = TokenCache(max_size=4)
+    cache.put("token", "claims", time.time() + 60, token_id="jti-1")
+    cache.discard_token_id("jti-1")
+    assert cache.get("token") is None
+
+
+def test_size_zero_disables_the_cache():
+    cache = TokenCache(max_size=0)
+    cache.put("token", "claims", time.time() + 60)
+    assert cache.get("token") is None
+
+
+def test_verify_token_is_served_from_the_cache(admin):
+    token = create_access_token({"sub": admin.username, "user_id": admin.id})
+    hits = token_cache.hits
+
+    first = verify_token(token)
+    second = verify_token(token)
+
+    assert first.user_id == admin.id and second == first
+    assert token_cache.hits == hits + 1